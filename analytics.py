@@ -0,0 +1,302 @@
+"""Gameplay analytics: events queued in-process, batch-written, aggregated offline.
+
+AnalyticsQueue is a GameEngine listener. It packs every event into a
+fixed-size record and puts it on a bounded queue without ever blocking
+the game; a background thread writes the records to files in batches.
+An event file is little-endian:
+
+    header   '<4sHH'      magic b'BTBA', version, reserved
+    record   '<dBBIIff'   wall-clock time (Unix s), kind, flag, question
+                          number, bank index (0xFFFFFFFF if unknown),
+                          answer latency (ms), fuse percentage
+      ANSWER              flag 1 if correct; the fuse before the answer
+                          changed it
+      PAUSE
+      EXPLOSION           the bomb ran out of time on that question
+      END                 flag 1 if won
+
+aggregate() reads any number of event files in one streaming pass: per
+question, accuracy, explosions and a log-bucketed latency histogram, so
+memory grows with the number of distinct questions, never with the
+number of events.
+
+Usage: python analytics.py [EVENT_DIR] [--top N] [--min-answers N] [--json PATH]
+"""
+import math
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+from array import array
+
+MAGIC = b'BTBA'
+VERSION = 2
+HEADER = struct.Struct('<4sHH')
+EVENT = struct.Struct('<dBBIIff')
+NO_QUESTION = 0xFFFFFFFF
+
+KIND_ANSWER, KIND_PAUSE, KIND_EXPLOSION, KIND_END = range(1, 5)
+
+DEFAULT_ANALYTICS_DIR = os.path.join(os.path.expanduser('~'), '.local', 'share', 'beat_the_bomb', 'analytics')
+MAX_FILE_BYTES = 16 * 1024 * 1024
+READ_RECORDS = 8192  # records per read while aggregating
+
+# Latency buckets grow by 10% from 50 ms; the last one holds everything above ~30 s
+LATENCY_MIN_MS = 50.0
+LATENCY_RATIO = 1.1
+LATENCY_BUCKETS = 68
+
+_STOP = object()
+
+
+class AnalyticsQueue:
+    """Non-blocking event sink with a background batch writer.
+
+    The game thread only packs a record and calls put_nowait: when the
+    queue is full the event is counted in `dropped` instead of stalling
+    a frame. The writer thread waits for an event, gathers up to
+    `batch_size` more for at most `flush_interval` seconds and appends
+    them with one write. Each process writes its own files, starting a
+    new one after `max_file_bytes`. close() drains the queue.
+    """
+    def __init__(self, directory=DEFAULT_ANALYTICS_DIR, max_events=10000, batch_size=512,
+                 flush_interval=1.0, max_file_bytes=MAX_FILE_BYTES):
+        self.directory = directory
+        self.queue = queue.Queue(max_events)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_file_bytes = max_file_bytes
+        self.dropped = 0
+        self.written = 0
+        self.file = None
+        self.files = 0
+        self.failed = False
+        self.thread = threading.Thread(target=self.run, name="analytics-writer", daemon=True)
+        self.thread.start()
+
+    def __call__(self, engine, event, *args):
+        now = time.time()
+        number = engine.current_question
+        if number < len(engine.question_ids):
+            question_id = engine.question_ids[number]
+        else:
+            question_id = NO_QUESTION
+
+        if event == 'answer':
+            _, is_correct = args
+            record = EVENT.pack(now, KIND_ANSWER, bool(is_correct), number, question_id,
+                                engine.answer_latency, engine.answer_fuse)
+        elif event == 'pause':
+            record = EVENT.pack(now, KIND_PAUSE, 0, number, question_id, 0.0, engine.fuse_percentage())
+        elif event == 'end':
+            record = EVENT.pack(now, KIND_END, engine.won_game, number, question_id, 0.0, engine.fuse_percentage())
+            if engine.bomb.bomb_exploded:
+                record = EVENT.pack(now, KIND_EXPLOSION, 0, number, question_id, 0.0, 0.0) + record
+        else:
+            return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def run(self):
+        while True:
+            item = self.queue.get()
+            batch = []
+            deadline = time.monotonic() + self.flush_interval
+            while item is not _STOP:
+                batch.append(item)
+                timeout = deadline - time.monotonic()
+                if len(batch) >= self.batch_size or timeout <= 0:
+                    break
+                try:
+                    item = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+            if batch:
+                self.write(b"".join(batch))
+            if item is _STOP:
+                return
+
+    def write(self, data):
+        if self.failed:
+            return
+        try:
+            if self.file is None or self.file.tell() >= self.max_file_bytes:
+                self.open()
+            self.file.write(data)
+            self.file.flush()
+            self.written += len(data) // EVENT.size
+        except OSError:
+            self.failed = True
+
+    def open(self):
+        if self.file is not None:
+            self.file.close()
+        os.makedirs(self.directory, exist_ok=True)
+        self.files += 1
+        name = f"events-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self.files}.log"
+        self.file = open(os.path.join(self.directory, name), 'wb')
+        self.file.write(HEADER.pack(MAGIC, VERSION, 0))
+
+    def close(self):
+        """Write everything queued so far and stop the writer"""
+        if self.thread.is_alive():
+            self.queue.put(_STOP)
+            self.thread.join()
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def latency_bucket(ms):
+    if ms <= LATENCY_MIN_MS:
+        return 0
+    return min(int(math.log(ms / LATENCY_MIN_MS) / math.log(LATENCY_RATIO)) + 1, LATENCY_BUCKETS - 1)
+
+
+def bucket_upper_ms(bucket):
+    return LATENCY_MIN_MS * LATENCY_RATIO ** bucket
+
+
+def histogram_percentile(histogram, fraction):
+    """Upper bound (ms) of the bucket holding the `fraction` percentile; within 10% of the true value"""
+    total = sum(histogram)
+    if not total:
+        return 0.0
+    rank = fraction * total
+    seen = 0
+    for bucket, count in enumerate(histogram):
+        seen += count
+        if seen >= rank:
+            return bucket_upper_ms(bucket)
+    return bucket_upper_ms(len(histogram) - 1)
+
+
+class QuestionSummary:
+    """Running totals for one question"""
+    __slots__ = ('answers', 'correct', 'explosions', 'fuse_total', 'latency')
+
+    def __init__(self):
+        self.answers = 0
+        self.correct = 0
+        self.explosions = 0
+        self.fuse_total = 0.0
+        self.latency = array('I', bytes(4 * LATENCY_BUCKETS))
+
+    def accuracy(self):
+        return self.correct / self.answers if self.answers else 0.0
+
+    def as_dict(self):
+        return {
+            "answers": self.answers,
+            "accuracy": self.accuracy(),
+            "explosions": self.explosions,
+            "mean_fuse_at_answer": self.fuse_total / self.answers if self.answers else 0.0,
+            "latency_p50_ms": histogram_percentile(self.latency, 0.5),
+            "latency_p90_ms": histogram_percentile(self.latency, 0.9),
+            "latency_p99_ms": histogram_percentile(self.latency, 0.99),
+        }
+
+
+def event_files(path):
+    """Event files under a directory (oldest name first), or the file itself"""
+    if os.path.isdir(path):
+        return [os.path.join(path, name) for name in sorted(os.listdir(path)) if name.endswith('.log')]
+    return [path]
+
+
+def aggregate(paths):
+    """One streaming pass over event files; returns the totals as a dict"""
+    questions = {}  # bank index -> QuestionSummary
+    explosions_at = {}  # question number in the game -> explosions
+    totals = {"events": 0, "answers": 0, "pauses": 0, "games": 0, "wins": 0, "explosions": 0}
+    chunk_size = EVENT.size * READ_RECORDS
+
+    for path in paths:
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size or HEADER.unpack(header)[:2] != (MAGIC, VERSION):
+                continue
+            while True:
+                chunk = f.read(chunk_size)
+                # A record cut short by a crash ends the file
+                chunk = chunk[:len(chunk) - len(chunk) % EVENT.size]
+                if not chunk:
+                    break
+                for _, kind, flag, number, question_id, latency, fuse in EVENT.iter_unpack(chunk):
+                    totals["events"] += 1
+                    if kind == KIND_ANSWER:
+                        totals["answers"] += 1
+                        if question_id == NO_QUESTION:
+                            continue
+                        summary = questions.get(question_id)
+                        if summary is None:
+                            summary = questions[question_id] = QuestionSummary()
+                        summary.answers += 1
+                        summary.correct += flag
+                        summary.fuse_total += fuse
+                        summary.latency[latency_bucket(latency)] += 1
+                    elif kind == KIND_EXPLOSION:
+                        totals["explosions"] += 1
+                        explosions_at[number] = explosions_at.get(number, 0) + 1
+                        if question_id != NO_QUESTION:
+                            summary = questions.get(question_id)
+                            if summary is None:
+                                summary = questions[question_id] = QuestionSummary()
+                            summary.explosions += 1
+                    elif kind == KIND_END:
+                        totals["games"] += 1
+                        totals["wins"] += flag
+                    elif kind == KIND_PAUSE:
+                        totals["pauses"] += 1
+
+    return {
+        "totals": totals,
+        "explosions_by_question_number": dict(sorted(explosions_at.items())),
+        "questions": {question_id: summary.as_dict() for question_id, summary in sorted(questions.items())},
+    }
+
+
+def main(argv):
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="Aggregate Beat the Bomb gameplay analytics")
+    parser.add_argument("events", nargs="?", default=DEFAULT_ANALYTICS_DIR, help="event file or directory")
+    parser.add_argument("--top", type=int, default=10, help="how many of the hardest questions to list")
+    parser.add_argument("--min-answers", type=int, default=5, help="ignore questions answered fewer times")
+    parser.add_argument("--json", metavar="PATH", help="write the full aggregate as JSON")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    report = aggregate(event_files(args.events))
+    elapsed = time.perf_counter() - start
+    totals = report["totals"]
+    print(f"{totals['events']:,} events in {elapsed:.2f}s ({totals['events'] / elapsed if elapsed else 0:,.0f}/s): "
+          f"{totals['games']:,} games, {totals['wins']:,} won, {totals['explosions']:,} explosions, "
+          f"{totals['pauses']:,} pauses")
+
+    hardest = sorted(((stats["accuracy"], question_id, stats) for question_id, stats in report["questions"].items()
+                      if stats["answers"] >= args.min_answers), key=lambda item: item[:2])
+    if hardest:
+        print("Hardest questions:")
+    for accuracy, question_id, stats in hardest[:args.top]:
+        print(f"  #{question_id:<7} {accuracy:6.1%} of {stats['answers']:,}  "
+              f"latency p50 {stats['latency_p50_ms']:,.0f} ms  p90 {stats['latency_p90_ms']:,.0f} ms  "
+              f"explosions {stats['explosions']:,}")
+    if report["explosions_by_question_number"]:
+        print("Explosions by question number: " + ", ".join(
+            f"Q{number + 1}: {count:,}" for number, count in report["explosions_by_question_number"].items()))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
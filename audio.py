@@ -0,0 +1,128 @@
+import io
+import os
+import threading
+
+import pygame
+
+# One mono 16-bit channel at 22 kHz is plenty for game effects and a
+# quarter of the memory of CD-quality stereo
+MIXER_FREQUENCY = 22050
+MIXER_SIZE = -16
+MIXER_CHANNELS = 1
+MIXER_BUFFER = 512
+
+STREAM_THRESHOLD = 2 * 1024 * 1024  # files larger than this stream through mixer.music
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'beat_the_bomb')
+
+
+def start_mixer(frequency=MIXER_FREQUENCY, size=MIXER_SIZE, channels=MIXER_CHANNELS, buffer=MIXER_BUFFER):
+    """Start the mixer if needed; returns its (frequency, size, channels) or None without audio"""
+    if not pygame.mixer.get_init():
+        try:
+            pygame.mixer.init(frequency, size, channels, buffer)
+        except pygame.error:
+            return None
+    return pygame.mixer.get_init()
+
+
+class SoundBank:
+    """Named sounds, decoded once into the mixer's format and cached on disk.
+
+    The first load of a sound decodes and resamples the file, then saves
+    the raw samples in `cache_dir` keyed by the mixer format; later loads
+    (and later runs) only read those samples back. Large files are not
+    decoded at all but streamed with pygame.mixer.music. Every play can
+    name the event that caused it so one event never plays a sound twice.
+
+    read() needs no mixer, so files can be read on a loader thread before
+    the mixer starts; load() then only turns those bytes into sounds.
+    """
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.paths = {}
+        self.streamed = set()
+        self.sounds = {}
+        self.data = {}  # name -> (mixer format of raw samples, or None for the file itself; bytes)
+        self.last_event = {}
+        self.lock = threading.Lock()  # load() may run on a loader thread while the game plays
+
+    def add(self, name, path, stream=None):
+        """Register a sound; `stream` defaults to True for files over STREAM_THRESHOLD"""
+        self.paths[name] = path
+        if stream is None:
+            stream = os.path.getsize(path) > STREAM_THRESHOLD
+        if stream:
+            self.streamed.add(name)
+
+    def cache_path(self, name, mixer_format):
+        frequency, size, channels = mixer_format
+        return os.path.join(self.cache_dir, f"{name}-{frequency}-{abs(size)}-{channels}.pcm")
+
+    def read(self, mixer_format=(MIXER_FREQUENCY, MIXER_SIZE, MIXER_CHANNELS)):
+        """Read every decoded sound's bytes ahead of the mixer: the cached samples for `mixer_format`, else the file"""
+        for name, path in self.paths.items():
+            if name in self.streamed:
+                continue
+            cache = self.cache_path(name, mixer_format)
+            try:
+                if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+                    with open(cache, 'rb') as f:
+                        self.data[name] = (mixer_format, f.read())
+                else:
+                    with open(path, 'rb') as f:
+                        self.data[name] = (None, f.read())
+            except OSError:
+                pass  # load() tries again
+
+    def load(self, name):
+        """Decode (or read from the cache) one sound; needs a running mixer"""
+        with self.lock:
+            if name in self.sounds or name in self.streamed:
+                return
+            self._load(name)
+
+    def _load(self, name):
+        path = self.paths[name]
+        mixer_format = pygame.mixer.get_init()
+        cache = self.cache_path(name, mixer_format)
+        samples_format, data = self.data.pop(name, (None, None))
+
+        if data is not None and samples_format == mixer_format:
+            self.sounds[name] = pygame.mixer.Sound(buffer=data)
+            return
+        if os.path.exists(cache) and os.path.getmtime(cache) >= os.path.getmtime(path):
+            with open(cache, 'rb') as f:
+                self.sounds[name] = pygame.mixer.Sound(buffer=f.read())
+            return
+
+        sound = pygame.mixer.Sound(io.BytesIO(data) if data is not None and samples_format is None else path)
+        self.sounds[name] = sound
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(cache, 'wb') as f:
+                f.write(sound.get_raw())
+        except OSError:
+            pass  # Read-only home: decode again next run
+
+    def preload(self):
+        """Load every registered sound so nothing decodes at play time"""
+        if not pygame.mixer.get_init():
+            return
+        for name in self.paths:
+            self.load(name)
+
+    def play(self, name, event=None):
+        """Play a sound once per `event` (any hashable); silent without a mixer"""
+        if not pygame.mixer.get_init():
+            return
+        if event is not None:
+            if self.last_event.get(name) == event:
+                return
+            self.last_event[name] = event
+
+        if name in self.streamed:
+            pygame.mixer.music.load(self.paths[name])
+            pygame.mixer.music.play()
+            return
+        self.load(name)
+        self.sounds[name].play()
@@ -0,0 +1,256 @@
+"""Headless benchmarks for the C core, rendering and question loading.
+
+Results are written as JSON; pass a previous result file with --compare
+to exit non-zero when any benchmark got worse by more than --tolerance.
+
+Usage: python benchmarks.py [--output results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+# Rendering benchmarks run without a window or sound card
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import bomb_game
+
+BANK_SIZES = (100, 1000, 10000)
+
+
+def best_time(func, repeat=5):
+    """Fastest of `repeat` runs of func(), in seconds"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def rate(calls, seconds, unit="calls/s"):
+    return {"value": calls / seconds, "unit": unit, "higher_is_better": True}
+
+
+def duration_ms(seconds):
+    return {"value": seconds * 1000.0, "unit": "ms", "higher_is_better": False}
+
+
+def bench_core(results, calls=200000):
+    """Throughput of the bomb_game module functions and Game methods"""
+    bomb_game.init_game(10, 0.0)
+
+    def update_timer():
+        update = bomb_game.update_timer
+        for i in range(calls):
+            update(i * 1e-7)
+
+    def answer_question():
+        answer = bomb_game.answer_question
+        for i in range(calls):
+            answer(i & 1)
+
+    def init_game():
+        init = bomb_game.init_game
+        for _ in range(calls // 10):
+            init(10, 0.0)
+
+    results["core.update_timer"] = rate(calls, best_time(update_timer))
+    results["core.answer_question"] = rate(calls, best_time(answer_question))
+    results["core.init_game"] = rate(calls // 10, best_time(init_game))
+    bomb_game.free_game()
+
+    game = bomb_game.Game(10)
+
+    def game_update_timer():
+        update = game.update_timer
+        for i in range(calls):
+            update(i * 1e-7)
+
+    results["core.Game.update_timer"] = rate(calls, best_time(game_update_timer))
+
+    batch = bomb_game.GameBatch(10000)
+    for _ in range(10000):
+        batch.add(10)
+    exploded, fuse = bytearray(10000), bytearray(80000)
+    results["core.GameBatch.update_timers"] = rate(
+        10000 * 100, best_time(lambda: [batch.update_timers(t * 0.001, exploded, fuse) for t in range(100)]),
+        "sessions/s")
+
+
+def bench_engine(results, games=2000):
+    """Headless simulated games per second through the rules engine"""
+    from game_engine import GameEngine, ManualClock, random_player, simulate_game
+    from question_graph import QuestionGraph
+    from question_pack import load_question_bank
+
+    bank = load_question_bank('questions.json', 'questions.pack')
+    questions = QuestionGraph.from_file(bank, 'question_graph.json').get_questions('set1_a')
+    engine = GameEngine(clock=ManualClock())
+    policy = random_player(rng=random.Random(1))
+
+    def play():
+        for _ in range(games):
+            simulate_game(engine, questions, policy)
+
+    results["engine.simulated_games"] = rate(games, best_time(play, repeat=3), "games/s")
+
+
+def bench_render(results, frames=50):
+    """Full-frame cost of every screen: repaint everything, then flip"""
+    import pygame
+    import main
+
+    game = main.BeatTheBombGame(session_log=None, schedule=None, analytics_dir=None)
+    game.wait_for_assets()
+
+    def frame_cost(draw):
+        def run():
+            for _ in range(frames):
+                game.dirty.invalidate()
+                draw()
+                pygame.display.flip()
+        return best_time(run) / frames
+
+    results["render.welcome"] = duration_ms(frame_cost(game.draw_welcome_screen))
+    game.show_welcome = False
+    results["render.menu"] = duration_ms(frame_cost(game.draw_menu))
+
+    game.questions = game.question_graph.get_questions('set1_a')
+    game.reset_game_state()
+    game.in_menu = False
+    results["render.question"] = duration_ms(frame_cost(game.draw_game_screen))
+
+    game.pause()
+    results["render.paused"] = duration_ms(frame_cost(game.draw_game_screen))
+    game.resume()
+
+    game.won_game, game.game_over = False, True
+    results["render.game_over"] = duration_ms(frame_cost(game.draw_game_screen))
+    pygame.quit()
+
+
+def synthetic_bank(size, rng):
+    words = ["bomb", "fuse", "license", "copyright", "agreement", "software", "term", "party", "use", "right"]
+
+    def sentence(n):
+        return " ".join(rng.choice(words) for _ in range(n)).capitalize()
+
+    return [{"question": sentence(12) + "?",
+             "answers": [{"text": sentence(6), "correct": i == 0} for i in range(4)]}
+            for _ in range(size)]
+
+
+def bench_loading(results):
+    """Question bank load time versus bank size, JSON and compiled pack"""
+    from question_pack import QuestionPack, compile_pack
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in BANK_SIZES:
+            bank = synthetic_bank(size, rng)
+            json_path = os.path.join(tmp, f"bank{size}.json")
+            pack_path = os.path.join(tmp, f"bank{size}.pack")
+            with open(json_path, 'w') as f:
+                json.dump(bank, f)
+            compile_pack(bank, pack_path)
+
+            def load_json():
+                with open(json_path) as f:
+                    json.load(f)[:10]
+
+            def load_pack():
+                with QuestionPack(pack_path) as pack:
+                    pack[:10]
+
+            results[f"load.json.{size}"] = duration_ms(best_time(load_json))
+            results[f"load.pack.{size}"] = duration_ms(best_time(load_pack))
+
+
+def bench_startup(results, repeat=3):
+    """Wall time from launching Python to the first welcome frame on screen"""
+    code = ("import main, pygame; game = main.BeatTheBombGame(session_log=None, schedule=None, analytics_dir=None); "
+            "game.draw_welcome_screen(); pygame.display.flip()")
+
+    def launch():
+        subprocess.run([sys.executable, "-c", code], check=True, env=os.environ.copy(),
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    results["startup.first_frame"] = duration_ms(best_time(launch, repeat))
+
+
+BENCHMARKS = {
+    "core": bench_core,
+    "engine": bench_engine,
+    "render": bench_render,
+    "loading": bench_loading,
+    "startup": bench_startup,
+}
+
+
+def compare(results, baseline, tolerance):
+    """(name, before, after, unit) of every benchmark that got worse by more than `tolerance` (a fraction)"""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or not base["value"]:
+            continue
+        change = result["value"] / base["value"] - 1.0
+        if (-change if result["higher_is_better"] else change) > tolerance:
+            regressions.append((name, base["value"], result["value"], result["unit"]))
+    return regressions
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Run the Beat the Bomb benchmarks headlessly")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", metavar="BASELINE", help="previous result file to check against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown, as a fraction")
+    parser.add_argument("--only", nargs="+", choices=sorted(BENCHMARKS), help="run only these groups")
+    args = parser.parse_args(argv)
+
+    # Benchmarks load the bundled assets by relative path
+    args.output = os.path.abspath(args.output)
+    if args.compare:
+        args.compare = os.path.abspath(args.compare)
+    os.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+    results = {}
+    for group in args.only or BENCHMARKS:
+        BENCHMARKS[group](results)
+    for name, result in results.items():
+        print(f"{name:32} {result['value']:14,.3f} {result['unit']}")
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+        },
+        "results": results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for name, before, after, unit in regressions:
+            print(f"REGRESSION {name}: {before:,.3f} -> {after:,.3f} {unit}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,122 +1,283 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
+#include <structmember.h>
 #include <stdlib.h>
 #include <time.h>
+#ifdef _WIN32
+#define WIN32_LEAN_AND_MEAN
+#include <windows.h>
+#endif
 
+// All times are seconds on one clock: monotonic_now() unless the caller
+// passes its own timestamps consistently (simulations, replays).
+//
+// This layout is public: Game and GameBatch export it through the buffer
+// protocol as STATE_FORMAT records (64 bytes, native byte order, no
+// padding) with the fields named in STATE_FIELDS. Keep STATE_FORMAT and
+// STATE_FIELDS in sync with any change.
 typedef struct {
+    double time_remaining;
+    double last_update_time;
+    double start_time;
+    double pause_started;
+    double paused_total;
     int score;
     int questions_answered;
     int total_questions;
-    double time_remaining;
-    double last_update_time;
     int bomb_exploded;
     int is_paused;
+    int timer_started;  // last_update_time is a real timestamp on the caller's clock
 } GameState;
 
+#define STATE_FORMAT "5d6i"
+static const char *STATE_FIELDS[] = {
+    "time_remaining", "last_update_time", "start_time", "pause_started", "paused_total",
+    "score", "questions_answered", "total_questions", "bomb_exploded", "is_paused", "timer_started",
+    NULL
+};
+
 // Constants
 #define MAX_GAME_TIME 20.0
 #define CORRECT_ANSWER_POINTS 10
 #define TIME_FOR_CORRECT_ANSWER 5.0
 #define TIME_PENALTY_FOR_WRONG 3.0
 
-// Global game state
-static GameState *game = NULL;
+// Per-module state: every interpreter that imports bomb_game gets its own
+typedef struct {
+    PyObject *game_type;
+    PyObject *batch_type;
+    GameState *game;               // default game used by the module-level functions
+    PyThread_type_lock game_lock;  // guards `game`
+} BombModuleState;
+
+static inline BombModuleState* get_module_state(PyObject *module) {
+    return (BombModuleState*)PyModule_GetState(module);
+}
 
 // Function declarations
-static void free_game_internal(void);
-static GameState* init_game_internal(int total_questions);
-static void answer_question_internal(int is_correct);
-static int update_timer_internal(double current_time);
-static double get_fuse_percentage_internal(void);
-static void set_paused_internal(int pause_state);
-static int is_paused_internal(void);
-
-static GameState* init_game_internal(int total_questions) {
-    // Free existing game state if it exists
-    if (game != NULL) {
-        free_game_internal();
+static double monotonic_now(void);
+static void free_game_internal(BombModuleState *st);
+static GameState* init_game_internal(BombModuleState *st, int total_questions, double now, int stamped);
+static void reset_state(GameState *state, int total_questions, double now, int stamped);
+static void answer_question_internal(GameState *state, int is_correct);
+static int update_timer_internal(GameState *state, double current_time);
+static double get_fuse_percentage_internal(GameState *state);
+static void set_paused_internal(GameState *state, int pause_state, double now);
+static int is_paused_internal(GameState *state);
+static double elapsed_internal(GameState *state, double now);
+static double paused_time_internal(GameState *state, double now);
+
+// High-resolution monotonic clock in seconds
+static double monotonic_now(void) {
+#ifdef _WIN32
+    static LARGE_INTEGER frequency;
+    LARGE_INTEGER counter;
+    if (frequency.QuadPart == 0) {
+        QueryPerformanceFrequency(&frequency);
     }
+    QueryPerformanceCounter(&counter);
+    return (double)counter.QuadPart / (double)frequency.QuadPart;
+#else
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (double)ts.tv_sec + (double)ts.tv_nsec / 1e9;
+#endif
+}
 
-    game = (GameState*)malloc(sizeof(GameState));
-    if (!game) return NULL;
+// With `stamped` the fuse starts burning at `now`, so the first update
+// already counts. Unstamped (the legacy init_game() without a timestamp,
+// whose caller may use any clock), the first update only sets the time.
+static void reset_state(GameState *state, int total_questions, double now, int stamped) {
+    state->score = 0;
+    state->questions_answered = 0;
+    state->total_questions = total_questions;
+    state->time_remaining = MAX_GAME_TIME;
+    state->last_update_time = stamped ? now : 0.0;
+    state->start_time = stamped ? now : 0.0;
+    state->pause_started = 0.0;
+    state->paused_total = 0.0;
+    state->bomb_exploded = 0;
+    state->is_paused = 0;
+    state->timer_started = stamped ? 1 : 0;
+}
 
-    game->score = 0;
-    game->questions_answered = 0;
-    game->total_questions = total_questions;
-    game->time_remaining = MAX_GAME_TIME;
-    game->last_update_time = 0.0;
-    game->bomb_exploded = 0;
-    game->is_paused = 0;
+static GameState* init_game_internal(BombModuleState *st, int total_questions, double now, int stamped) {
+    // Free existing game state if it exists
+    if (st->game != NULL) {
+        free_game_internal(st);
+    }
+
+    st->game = (GameState*)malloc(sizeof(GameState));
+    if (!st->game) return NULL;
 
-    return game;
+    reset_state(st->game, total_questions, now, stamped);
+    return st->game;
 }
 
-static void answer_question_internal(int is_correct) {
-    if (!game) return;
+static void answer_question_internal(GameState *state, int is_correct) {
+    if (!state) return;
 
-    game->questions_answered++;
+    state->questions_answered++;
 
     if (is_correct) {
-        game->score += CORRECT_ANSWER_POINTS;
-        game->time_remaining += TIME_FOR_CORRECT_ANSWER;
-        if (game->time_remaining > MAX_GAME_TIME)
-            game->time_remaining = MAX_GAME_TIME;
+        state->score += CORRECT_ANSWER_POINTS;
+        state->time_remaining += TIME_FOR_CORRECT_ANSWER;
+        if (state->time_remaining > MAX_GAME_TIME)
+            state->time_remaining = MAX_GAME_TIME;
     } else {
-        game->time_remaining -= TIME_PENALTY_FOR_WRONG;
+        state->time_remaining -= TIME_PENALTY_FOR_WRONG;
     }
 }
 
-static int update_timer_internal(double current_time) {
-    if (!game) return 0;
+static int update_timer_internal(GameState *state, double current_time) {
+    if (!state) return 0;
 
     // Only update if not paused
-    if (!game->is_paused) {
-        if (game->last_update_time > 0) {
-            double delta_time = current_time - game->last_update_time;
-            game->time_remaining -= delta_time;
+    if (!state->is_paused) {
+        if (state->timer_started) {
+            state->time_remaining -= current_time - state->last_update_time;
+        } else {
+            state->start_time = current_time;
+            state->timer_started = 1;
         }
-        game->last_update_time = current_time;
+        state->last_update_time = current_time;
     }
 
-    if (game->time_remaining <= 0) {
-        game->bomb_exploded = 1;
+    if (state->time_remaining <= 0) {
+        state->bomb_exploded = 1;
         return 1;
     }
     return 0;
 }
 
-static double get_fuse_percentage_internal(void) {
-    if (!game) return 0.0;
-    double percentage = (game->time_remaining / MAX_GAME_TIME) * 100.0;
-    return (percentage < 0) ? 0 : percentage;
+static double get_fuse_percentage_internal(GameState *state) {
+    if (!state) return 0.0;
+    double percentage = (state->time_remaining / MAX_GAME_TIME) * 100.0;
+    if (percentage < 0.0) return 0.0;
+    return (percentage > 100.0) ? 100.0 : percentage;
 }
 
-static void set_paused_internal(int pause_state) {
-    if (!game) return;
-    game->is_paused = pause_state;
+static void set_paused_internal(GameState *state, int pause_state, double now) {
+    if (!state) return;
+
+    if (pause_state && !state->is_paused) {
+        state->pause_started = now;
+    } else if (!pause_state && state->is_paused) {
+        // Skip the paused interval so the fuse resumes where it stopped
+        double paused_for = now - state->pause_started;
+        state->paused_total += paused_for;
+        state->last_update_time += paused_for;
+    }
+    state->is_paused = pause_state ? 1 : 0;
 }
 
-static int is_paused_internal(void) {
-    if (!game) return 0;
-    return game->is_paused;
+// Active (unpaused) seconds since the last reset
+static double elapsed_internal(GameState *state, double now) {
+    if (!state) return 0.0;
+    double end = state->is_paused ? state->pause_started : now;
+    return end - state->start_time - state->paused_total;
+}
+
+static double paused_time_internal(GameState *state, double now) {
+    if (!state) return 0.0;
+    double current_pause = state->is_paused ? now - state->pause_started : 0.0;
+    return state->paused_total + current_pause;
+}
+
+static int is_paused_internal(GameState *state) {
+    if (!state) return 0;
+    return state->is_paused;
+}
+
+static void free_game_internal(BombModuleState *st) {
+    if (st->game) {
+        free(st->game);
+        st->game = NULL;
+    }
+}
+
+// Optional timestamp argument: None or missing means the monotonic clock
+static int parse_time(PyObject *obj, double *out) {
+    if (obj == NULL || obj == Py_None) {
+        *out = monotonic_now();
+        return 0;
+    }
+    *out = PyFloat_AsDouble(obj);
+    if (*out == -1.0 && PyErr_Occurred()) {
+        return -1;
+    }
+    return 0;
+}
+
+// Export shape[0] GameState records read-only; shape[1] is their size in
+// bytes. `shape` is only read, and must stay valid until the buffer is
+// released.
+static int fill_state_buffer(PyObject *exporter, Py_buffer *view, GameState *states,
+                             Py_ssize_t *shape, int flags) {
+    if (flags & PyBUF_WRITABLE) {
+        PyErr_SetString(PyExc_BufferError, "Game state buffers are read-only");
+        view->obj = NULL;
+        return -1;
+    }
+
+    view->buf = states;
+    view->obj = exporter;
+    Py_INCREF(exporter);
+    view->len = shape[1];
+    view->readonly = 1;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+    view->ndim = 1;
+
+    if (flags & PyBUF_FORMAT) {
+        view->format = STATE_FORMAT;
+        view->itemsize = sizeof(GameState);
+    } else {
+        // Plain bytes for consumers that did not ask for the record format
+        view->format = NULL;
+        view->itemsize = 1;
+    }
+    view->shape = (flags & PyBUF_ND) ? shape + ((flags & PyBUF_FORMAT) ? 0 : 1) : NULL;
+    view->strides = (flags & PyBUF_STRIDES) ? &view->itemsize : NULL;
+    return 0;
 }
 
-static void free_game_internal(void) {
-    if (game) {
-        free(game);
-        game = NULL;
+// Take a session lock. If another thread holds it (possibly with the GIL
+// released, as GameBatch.update_timers does), wait without the GIL.
+static void lock_session(PyThread_type_lock lock) {
+    if (!PyThread_acquire_lock(lock, NOWAIT_LOCK)) {
+        Py_BEGIN_ALLOW_THREADS
+        PyThread_acquire_lock(lock, WAIT_LOCK);
+        Py_END_ALLOW_THREADS
     }
 }
 
+static void unlock_session(PyThread_type_lock lock) {
+    PyThread_release_lock(lock);
+}
+
 // Python interface functions
+static PyObject* py_monotonic(PyObject* self, PyObject* Py_UNUSED(ignored)) {
+    return PyFloat_FromDouble(monotonic_now());
+}
+
 static PyObject* py_init_game(PyObject* self, PyObject* args) {
+    BombModuleState *st = get_module_state(self);
     int total_questions;
-    if (!PyArg_ParseTuple(args, "i", &total_questions)) {
+    PyObject *time_obj = NULL;
+    double now;
+    if (!PyArg_ParseTuple(args, "i|O", &total_questions, &time_obj)) {
         PyErr_SetString(PyExc_TypeError, "Expected an integer argument");
         return NULL;
     }
+    if (parse_time(time_obj, &now) < 0) {
+        return NULL;
+    }
 
-    if (!init_game_internal(total_questions)) {
+    lock_session(st->game_lock);
+    GameState *state = init_game_internal(st, total_questions, now, time_obj != NULL && time_obj != Py_None);
+    unlock_session(st->game_lock);
+    if (!state) {
         PyErr_SetString(PyExc_RuntimeError, "Failed to initialize game");
         return NULL;
     }
@@ -124,67 +285,687 @@ static PyObject* py_init_game(PyObject* self, PyObject* args) {
 }
 
 static PyObject* py_answer_question(PyObject* self, PyObject* args) {
+    BombModuleState *st = get_module_state(self);
     int is_correct;
     if (!PyArg_ParseTuple(args, "i", &is_correct)) {
         PyErr_SetString(PyExc_TypeError, "Expected an integer argument");
         return NULL;
     }
 
-    answer_question_internal(is_correct);
+    lock_session(st->game_lock);
+    answer_question_internal(st->game, is_correct);
+    unlock_session(st->game_lock);
     Py_RETURN_NONE;
 }
 
 static PyObject* py_update_timer(PyObject* self, PyObject* args) {
+    BombModuleState *st = get_module_state(self);
+    PyObject *time_obj = NULL;
     double current_time;
-    if (!PyArg_ParseTuple(args, "d", &current_time)) {
+    if (!PyArg_ParseTuple(args, "|O", &time_obj) || parse_time(time_obj, &current_time) < 0) {
         PyErr_SetString(PyExc_TypeError, "Expected a float argument");
         return NULL;
     }
 
-    int exploded = update_timer_internal(current_time);
+    lock_session(st->game_lock);
+    int exploded = update_timer_internal(st->game, current_time);
+    unlock_session(st->game_lock);
     return PyLong_FromLong(exploded);
 }
 
 static PyObject* py_get_fuse_percentage(PyObject* self, PyObject* args) {
+    BombModuleState *st = get_module_state(self);
     if (!PyArg_ParseTuple(args, "")) {
         return NULL;
     }
-    double percentage = get_fuse_percentage_internal();
+    lock_session(st->game_lock);
+    double percentage = get_fuse_percentage_internal(st->game);
+    unlock_session(st->game_lock);
     return PyFloat_FromDouble(percentage);
 }
 
 static PyObject* py_set_paused(PyObject* self, PyObject* args) {
+    BombModuleState *st = get_module_state(self);
     int pause_state;
-    if (!PyArg_ParseTuple(args, "i", &pause_state)) {
+    PyObject *time_obj = NULL;
+    double now;
+    if (!PyArg_ParseTuple(args, "i|O", &pause_state, &time_obj)) {
         PyErr_SetString(PyExc_TypeError, "Expected an integer argument");
         return NULL;
     }
+    if (parse_time(time_obj, &now) < 0) {
+        return NULL;
+    }
 
-    set_paused_internal(pause_state);
+    lock_session(st->game_lock);
+    set_paused_internal(st->game, pause_state, now);
+    unlock_session(st->game_lock);
     Py_RETURN_NONE;
 }
 
 static PyObject* py_is_paused(PyObject* self, PyObject* args) {
+    BombModuleState *st = get_module_state(self);
     if (!PyArg_ParseTuple(args, "")) {
         return NULL;
     }
-    int paused = is_paused_internal();
+    lock_session(st->game_lock);
+    int paused = is_paused_internal(st->game);
+    unlock_session(st->game_lock);
     return PyBool_FromLong(paused);
 }
 
 static PyObject* py_free_game(PyObject* self, PyObject* args) {
+    BombModuleState *st = get_module_state(self);
     if (!PyArg_ParseTuple(args, "")) {
         return NULL;
     }
-    free_game_internal();
+    lock_session(st->game_lock);
+    free_game_internal(st);
+    unlock_session(st->game_lock);
     Py_RETURN_NONE;
 }
 
+// Game extension type: one independent GameState per instance, guarded by
+// its own lock so one session can be shared between threads
+typedef struct {
+    PyObject_HEAD
+    PyThread_type_lock lock;
+    GameState state;
+} GameObject;
+
+// Every Game exports one record, so all its views share these constant shapes
+static Py_ssize_t game_shape[2] = {1, sizeof(GameState)};
+
+static PyObject* Game_new(PyTypeObject *type, PyObject *args, PyObject *kwds) {
+    GameObject *self = (GameObject*)type->tp_alloc(type, 0);
+    if (!self) {
+        return NULL;
+    }
+    self->lock = PyThread_allocate_lock();
+    if (!self->lock) {
+        Py_DECREF(self);
+        return PyErr_NoMemory();
+    }
+    // A full fuse that starts at the first update, should __init__ be skipped
+    reset_state(&self->state, 0, 0.0, 0);
+    return (PyObject*)self;
+}
+
+static void Game_dealloc(GameObject *self) {
+    PyTypeObject *type = Py_TYPE(self);
+    if (self->lock) {
+        PyThread_free_lock(self->lock);
+    }
+    type->tp_free((PyObject*)self);
+    Py_DECREF(type);
+}
+
+static int Game_init(GameObject *self, PyObject *args, PyObject *kwds) {
+    static char *kwlist[] = {"total_questions", "time", NULL};
+    int total_questions = 0;
+    PyObject *time_obj = NULL;
+    double now;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|iO", kwlist, &total_questions, &time_obj)
+        || parse_time(time_obj, &now) < 0) {
+        return -1;
+    }
+
+    lock_session(self->lock);
+    reset_state(&self->state, total_questions, now, 1);
+    unlock_session(self->lock);
+    return 0;
+}
+
+static PyObject* Game_reset(GameObject *self, PyObject *args) {
+    int total_questions = -1;
+    PyObject *time_obj = NULL;
+    double now;
+    if (!PyArg_ParseTuple(args, "|iO", &total_questions, &time_obj) || parse_time(time_obj, &now) < 0) {
+        return NULL;
+    }
+
+    lock_session(self->lock);
+    reset_state(&self->state, total_questions < 0 ? self->state.total_questions : total_questions, now, 1);
+    unlock_session(self->lock);
+    Py_RETURN_NONE;
+}
+
+static PyObject* Game_answer_question(GameObject *self, PyObject *args) {
+    int is_correct;
+    if (!PyArg_ParseTuple(args, "i", &is_correct)) {
+        return NULL;
+    }
+
+    lock_session(self->lock);
+    answer_question_internal(&self->state, is_correct);
+    unlock_session(self->lock);
+    Py_RETURN_NONE;
+}
+
+static PyObject* Game_update_timer(GameObject *self, PyObject *args) {
+    PyObject *time_obj = NULL;
+    double current_time;
+    if (!PyArg_ParseTuple(args, "|O", &time_obj) || parse_time(time_obj, &current_time) < 0) {
+        return NULL;
+    }
+
+    lock_session(self->lock);
+    int exploded = update_timer_internal(&self->state, current_time);
+    unlock_session(self->lock);
+    return PyLong_FromLong(exploded);
+}
+
+static PyObject* Game_get_fuse_percentage(GameObject *self, PyObject *Py_UNUSED(ignored)) {
+    lock_session(self->lock);
+    double percentage = get_fuse_percentage_internal(&self->state);
+    unlock_session(self->lock);
+    return PyFloat_FromDouble(percentage);
+}
+
+static PyObject* Game_set_paused(GameObject *self, PyObject *args) {
+    int pause_state;
+    PyObject *time_obj = NULL;
+    double now;
+    if (!PyArg_ParseTuple(args, "i|O", &pause_state, &time_obj) || parse_time(time_obj, &now) < 0) {
+        return NULL;
+    }
+
+    lock_session(self->lock);
+    set_paused_internal(&self->state, pause_state, now);
+    unlock_session(self->lock);
+    Py_RETURN_NONE;
+}
+
+static PyObject* Game_elapsed(GameObject *self, PyObject *args) {
+    PyObject *time_obj = NULL;
+    double now;
+    if (!PyArg_ParseTuple(args, "|O", &time_obj) || parse_time(time_obj, &now) < 0) {
+        return NULL;
+    }
+
+    lock_session(self->lock);
+    double elapsed = elapsed_internal(&self->state, now);
+    unlock_session(self->lock);
+    return PyFloat_FromDouble(elapsed);
+}
+
+static PyObject* Game_paused_time(GameObject *self, PyObject *args) {
+    PyObject *time_obj = NULL;
+    double now;
+    if (!PyArg_ParseTuple(args, "|O", &time_obj) || parse_time(time_obj, &now) < 0) {
+        return NULL;
+    }
+
+    lock_session(self->lock);
+    double paused = paused_time_internal(&self->state, now);
+    unlock_session(self->lock);
+    return PyFloat_FromDouble(paused);
+}
+
+static PyObject* Game_is_paused(GameObject *self, PyObject *Py_UNUSED(ignored)) {
+    lock_session(self->lock);
+    int paused = is_paused_internal(&self->state);
+    unlock_session(self->lock);
+    return PyBool_FromLong(paused);
+}
+
+static PyMethodDef Game_methods[] = {
+    {"reset", (PyCFunction)Game_reset, METH_VARARGS, "Restart the bomb (optionally with a new total questions count and start time)"},
+    {"answer_question", (PyCFunction)Game_answer_question, METH_VARARGS, "Answer a question (1=correct, 0=wrong)"},
+    {"update_timer", (PyCFunction)Game_update_timer, METH_VARARGS, "Update the bomb timer (current_time in seconds, default: monotonic clock)"},
+    {"get_fuse_percentage", (PyCFunction)Game_get_fuse_percentage, METH_NOARGS, "Get remaining fuse percentage"},
+    {"set_paused", (PyCFunction)Game_set_paused, METH_VARARGS, "Set pause state (1=pause, 0=unpause), optionally at current_time"},
+    {"is_paused", (PyCFunction)Game_is_paused, METH_NOARGS, "Check if game is paused"},
+    {"elapsed", (PyCFunction)Game_elapsed, METH_VARARGS, "Unpaused seconds since the last reset"},
+    {"paused_time", (PyCFunction)Game_paused_time, METH_VARARGS, "Seconds spent paused since the last reset"},
+    {NULL, NULL, 0, NULL}  // Sentinel
+};
+
+// Single aligned fields: reading one needs no lock, but several reads are
+// not one snapshot (use the buffer or the methods for that)
+static PyMemberDef Game_members[] = {
+    {"score", T_INT, offsetof(GameObject, state.score), READONLY, "Points scored so far"},
+    {"questions_answered", T_INT, offsetof(GameObject, state.questions_answered), READONLY, "Number of answered questions"},
+    {"total_questions", T_INT, offsetof(GameObject, state.total_questions), READONLY, "Number of questions in the game"},
+    {"time_remaining", T_DOUBLE, offsetof(GameObject, state.time_remaining), READONLY, "Seconds left on the fuse"},
+    {"bomb_exploded", T_INT, offsetof(GameObject, state.bomb_exploded), READONLY, "1 if the bomb has exploded, else 0"},
+    {NULL}  // Sentinel
+};
+
+static int Game_getbuffer(GameObject *self, Py_buffer *view, int flags) {
+    return fill_state_buffer((PyObject*)self, view, &self->state, game_shape, flags);
+}
+
+static PyType_Slot Game_slots[] = {
+    {Py_tp_doc, "Game(total_questions=0, time=None)\n\nAn independent bomb game session whose fuse starts burning at\n"
+                "`time` (default: monotonic clock). Supports the buffer protocol:\n"
+                "memoryview(game) is one read-only STATE_FORMAT record."},
+    {Py_tp_new, Game_new},
+    {Py_tp_init, Game_init},
+    {Py_tp_dealloc, Game_dealloc},
+    {Py_tp_methods, Game_methods},
+    {Py_tp_members, Game_members},
+    {Py_bf_getbuffer, Game_getbuffer},
+    {0, NULL}
+};
+
+#ifdef Py_TPFLAGS_IMMUTABLETYPE
+#define BOMB_TYPE_FLAGS (Py_TPFLAGS_DEFAULT | Py_TPFLAGS_IMMUTABLETYPE)
+#else
+#define BOMB_TYPE_FLAGS Py_TPFLAGS_DEFAULT
+#endif
+
+static PyType_Spec Game_spec = {
+    .name = "bomb_game.Game",
+    .basicsize = sizeof(GameObject),
+    .itemsize = 0,
+    .flags = BOMB_TYPE_FLAGS | Py_TPFLAGS_BASETYPE,
+    .slots = Game_slots,
+};
+
+// GameBatch extension type: many GameState records in one contiguous
+// array. One lock guards the array; update_timers holds it with the GIL
+// released, so batches on different threads advance in parallel.
+typedef struct {
+    PyObject_HEAD
+    PyThread_type_lock lock;
+    GameState *states;
+    Py_ssize_t count;
+    Py_ssize_t capacity;
+    Py_ssize_t exports;  // live buffer views; the array must not move while > 0
+} GameBatchObject;
+
+#define GAME_BATCH_MIN_CAPACITY 8
+
+static int is_format(const Py_buffer *view, char code) {
+    const char *format = view->format ? view->format : "B";
+    if (format[0] == '@' || format[0] == '=' || format[0] == '<') {
+        format++;
+    }
+    return format[0] == code && format[1] == '\0';
+}
+
+// Acquire a C-contiguous buffer of `count` items of the given struct code
+// A fresh writable memoryview of `count` doubles (format 'd'), backed by a bytearray
+static PyObject* new_double_buffer(Py_ssize_t count) {
+    PyObject *bytes = PyByteArray_FromStringAndSize(NULL, count * (Py_ssize_t)sizeof(double));
+    if (!bytes) {
+        return NULL;
+    }
+    PyObject *raw = PyMemoryView_FromObject(bytes);
+    Py_DECREF(bytes);
+    if (!raw) {
+        return NULL;
+    }
+    PyObject *doubles = PyObject_CallMethod(raw, "cast", "s", "d");
+    Py_DECREF(raw);
+    return doubles;
+}
+
+static int get_batch_buffer(PyObject *obj, Py_buffer *view, char code,
+                            Py_ssize_t itemsize, Py_ssize_t count, int writable) {
+    int flags = PyBUF_FORMAT | PyBUF_C_CONTIGUOUS | (writable ? PyBUF_WRITABLE : 0);
+    if (PyObject_GetBuffer(obj, view, flags) < 0) {
+        return -1;
+    }
+
+    // Untyped byte buffers (bytearray, array('B')) are accepted as raw storage
+    int raw = is_format(view, 'B') && code != 'B';
+    if (!raw && (!is_format(view, code) || view->itemsize != itemsize)) {
+        PyErr_Format(PyExc_TypeError, "Expected a buffer of '%c' items", code);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    if (view->len != count * itemsize) {
+        PyErr_Format(PyExc_ValueError, "Expected a buffer of %zd items, got %zd bytes",
+                     count, view->len);
+        PyBuffer_Release(view);
+        return -1;
+    }
+    return 0;
+}
+
+static int GameBatch_check_index(GameBatchObject *self, Py_ssize_t index) {
+    if (index < 0 || index >= self->count) {
+        PyErr_SetString(PyExc_IndexError, "Session index out of range");
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject* GameBatch_new(PyTypeObject *type, PyObject *args, PyObject *kwds) {
+    GameBatchObject *self = (GameBatchObject*)type->tp_alloc(type, 0);
+    if (!self) {
+        return NULL;
+    }
+    self->lock = PyThread_allocate_lock();
+    /* Usable even if __init__ is never called */
+    self->states = (GameState*)PyMem_Malloc(GAME_BATCH_MIN_CAPACITY * sizeof(GameState));
+    if (!self->lock || !self->states) {
+        Py_DECREF(self);
+        return PyErr_NoMemory();
+    }
+    self->capacity = GAME_BATCH_MIN_CAPACITY;
+    return (PyObject*)self;
+}
+
+static int GameBatch_init(GameBatchObject *self, PyObject *args, PyObject *kwds) {
+    static char *kwlist[] = {"capacity", NULL};
+    Py_ssize_t capacity = 64;
+    int result = -1;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|n", kwlist, &capacity)) {
+        return -1;
+    }
+    if (capacity < 1) {
+        capacity = 1;
+    }
+
+    lock_session(self->lock);
+    if (self->exports > 0) {
+        PyErr_SetString(PyExc_BufferError, "Cannot reinitialize a GameBatch while its buffer is exported");
+        goto done;
+    }
+
+    GameState *states = (GameState*)PyMem_Realloc(self->states, capacity * sizeof(GameState));
+    if (!states) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    self->states = states;
+    self->count = 0;
+    self->capacity = capacity;
+    result = 0;
+
+done:
+    unlock_session(self->lock);
+    return result;
+}
+
+static void GameBatch_dealloc(GameBatchObject *self) {
+    PyTypeObject *type = Py_TYPE(self);
+    PyMem_Free(self->states);
+    if (self->lock) {
+        PyThread_free_lock(self->lock);
+    }
+    type->tp_free((PyObject*)self);
+    Py_DECREF(type);
+}
+
+static PyObject* GameBatch_add(GameBatchObject *self, PyObject *args) {
+    int total_questions = 0;
+    PyObject *time_obj = NULL;
+    PyObject *result = NULL;
+    double now;
+    if (!PyArg_ParseTuple(args, "|iO", &total_questions, &time_obj) || parse_time(time_obj, &now) < 0) {
+        return NULL;
+    }
+
+    lock_session(self->lock);
+    if (self->count == self->capacity) {
+        if (self->exports > 0) {
+            PyErr_SetString(PyExc_BufferError, "Cannot grow a GameBatch while its buffer is exported");
+            goto done;
+        }
+        Py_ssize_t capacity = self->capacity ? self->capacity * 2 : GAME_BATCH_MIN_CAPACITY;
+        GameState *states = (GameState*)PyMem_Realloc(self->states, capacity * sizeof(GameState));
+        if (!states) {
+            PyErr_NoMemory();
+            goto done;
+        }
+        self->states = states;
+        self->capacity = capacity;
+    }
+
+    reset_state(&self->states[self->count], total_questions, now, 1);
+    result = PyLong_FromSsize_t(self->count++);
+
+done:
+    unlock_session(self->lock);
+    return result;
+}
+
+static PyObject* GameBatch_reset(GameBatchObject *self, PyObject *args) {
+    Py_ssize_t index;
+    int total_questions = -1;
+    PyObject *time_obj = NULL;
+    double now;
+    if (!PyArg_ParseTuple(args, "n|iO", &index, &total_questions, &time_obj) || parse_time(time_obj, &now) < 0) {
+        return NULL;
+    }
+
+    lock_session(self->lock);
+    if (GameBatch_check_index(self, index) < 0) {
+        unlock_session(self->lock);
+        return NULL;
+    }
+    GameState *state = &self->states[index];
+    reset_state(state, total_questions < 0 ? state->total_questions : total_questions, now, 1);
+    unlock_session(self->lock);
+    Py_RETURN_NONE;
+}
+
+static PyObject* GameBatch_answer_question(GameBatchObject *self, PyObject *args) {
+    Py_ssize_t index;
+    int is_correct;
+    if (!PyArg_ParseTuple(args, "ni", &index, &is_correct)) {
+        return NULL;
+    }
+
+    lock_session(self->lock);
+    if (GameBatch_check_index(self, index) < 0) {
+        unlock_session(self->lock);
+        return NULL;
+    }
+    answer_question_internal(&self->states[index], is_correct);
+    unlock_session(self->lock);
+    Py_RETURN_NONE;
+}
+
+static PyObject* GameBatch_set_paused(GameBatchObject *self, PyObject *args) {
+    Py_ssize_t index;
+    int pause_state;
+    PyObject *time_obj = NULL;
+    double now;
+    if (!PyArg_ParseTuple(args, "ni|O", &index, &pause_state, &time_obj) || parse_time(time_obj, &now) < 0) {
+        return NULL;
+    }
+
+    lock_session(self->lock);
+    if (GameBatch_check_index(self, index) < 0) {
+        unlock_session(self->lock);
+        return NULL;
+    }
+    set_paused_internal(&self->states[index], pause_state, now);
+    unlock_session(self->lock);
+    Py_RETURN_NONE;
+}
+
+static PyObject* GameBatch_get_fuse_percentage(GameBatchObject *self, PyObject *args) {
+    Py_ssize_t index;
+    if (!PyArg_ParseTuple(args, "n", &index)) {
+        return NULL;
+    }
+
+    lock_session(self->lock);
+    if (GameBatch_check_index(self, index) < 0) {
+        unlock_session(self->lock);
+        return NULL;
+    }
+    double percentage = get_fuse_percentage_internal(&self->states[index]);
+    unlock_session(self->lock);
+    return PyFloat_FromDouble(percentage);
+}
+
+static PyObject* GameBatch_update_timers(GameBatchObject *self, PyObject *args, PyObject *kwds) {
+    static char *kwlist[] = {"current_time", "exploded", "fuse", NULL};
+    PyObject *times_obj = Py_None;
+    PyObject *exploded_obj = Py_None;
+    PyObject *fuse_obj = Py_None;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|OOO", kwlist,
+                                     &times_obj, &exploded_obj, &fuse_obj)) {
+        return NULL;
+    }
+
+    // Buffers are acquired before taking the lock: exporters may run Python code
+    lock_session(self->lock);
+    Py_ssize_t count = self->count;
+    unlock_session(self->lock);
+
+    Py_buffer times_view = {NULL}, exploded_view = {NULL}, fuse_view = {NULL};
+    const double *times = NULL;
+    double scalar_time = 0.0;
+    PyObject *result = NULL;
+
+    // None or a single float advances every session to the same timestamp
+    if (times_obj == Py_None || PyFloat_Check(times_obj) || PyLong_Check(times_obj)) {
+        if (parse_time(times_obj, &scalar_time) < 0) {
+            return NULL;
+        }
+    } else {
+        if (get_batch_buffer(times_obj, &times_view, 'd', sizeof(double), count, 0) < 0) {
+            return NULL;
+        }
+        times = (const double*)times_view.buf;
+    }
+
+    if (exploded_obj == Py_None) {
+        exploded_obj = PyByteArray_FromStringAndSize(NULL, count);
+    } else {
+        Py_INCREF(exploded_obj);
+    }
+    if (fuse_obj == Py_None) {
+        fuse_obj = new_double_buffer(count);
+    } else {
+        Py_INCREF(fuse_obj);
+    }
+    if (!exploded_obj || !fuse_obj) {
+        goto done;
+    }
+    if (get_batch_buffer(exploded_obj, &exploded_view, 'B', 1, count, 1) < 0) {
+        goto done;
+    }
+    if (get_batch_buffer(fuse_obj, &fuse_view, 'd', sizeof(double), count, 1) < 0) {
+        goto done;
+    }
+
+    unsigned char *exploded = (unsigned char*)exploded_view.buf;
+    double *fuse = (double*)fuse_view.buf;
+    int resized = 0;
+
+    lock_session(self->lock);
+    if (self->count != count) {
+        resized = 1;
+    } else {
+        GameState *states = self->states;
+        Py_BEGIN_ALLOW_THREADS
+        for (Py_ssize_t i = 0; i < count; i++) {
+            GameState *state = &states[i];
+            exploded[i] = (unsigned char)update_timer_internal(state, times ? times[i] : scalar_time);
+            fuse[i] = get_fuse_percentage_internal(state);
+        }
+        Py_END_ALLOW_THREADS
+    }
+    unlock_session(self->lock);
+
+    if (resized) {
+        PyErr_SetString(PyExc_RuntimeError, "GameBatch changed size during update_timers");
+        goto done;
+    }
+    result = PyTuple_Pack(2, exploded_obj, fuse_obj);
+
+done:
+    if (times_view.obj) PyBuffer_Release(&times_view);
+    if (exploded_view.obj) PyBuffer_Release(&exploded_view);
+    if (fuse_view.obj) PyBuffer_Release(&fuse_view);
+    Py_XDECREF(exploded_obj);
+    Py_XDECREF(fuse_obj);
+    return result;
+}
+
+static int GameBatch_getbuffer(GameBatchObject *self, Py_buffer *view, int flags) {
+    // Each view keeps its own shape, so adding sessions cannot change it
+    Py_ssize_t *shape = (Py_ssize_t*)PyMem_Malloc(2 * sizeof(Py_ssize_t));
+    if (!shape) {
+        PyErr_NoMemory();
+        view->obj = NULL;
+        return -1;
+    }
+
+    lock_session(self->lock);
+    shape[0] = self->count;
+    shape[1] = self->count * (Py_ssize_t)sizeof(GameState);
+    int result = fill_state_buffer((PyObject*)self, view, self->states, shape, flags);
+    if (result == 0) {
+        view->internal = shape;
+        self->exports++;
+    }
+    unlock_session(self->lock);
+
+    if (result < 0) {
+        PyMem_Free(shape);
+    }
+    return result;
+}
+
+static void GameBatch_releasebuffer(GameBatchObject *self, Py_buffer *view) {
+    PyMem_Free(view->internal);
+    lock_session(self->lock);
+    self->exports--;
+    unlock_session(self->lock);
+}
+
+static Py_ssize_t GameBatch_len(GameBatchObject *self) {
+    lock_session(self->lock);
+    Py_ssize_t count = self->count;
+    unlock_session(self->lock);
+    return count;
+}
+
+static PyMethodDef GameBatch_methods[] = {
+    {"add", (PyCFunction)GameBatch_add, METH_VARARGS, "Add a session whose fuse starts burning at an optional start time, and return its index"},
+    {"reset", (PyCFunction)GameBatch_reset, METH_VARARGS, "Restart the bomb of one session"},
+    {"answer_question", (PyCFunction)GameBatch_answer_question, METH_VARARGS, "Answer a question for one session (1=correct, 0=wrong)"},
+    {"set_paused", (PyCFunction)GameBatch_set_paused, METH_VARARGS, "Set pause state of one session (1=pause, 0=unpause), optionally at current_time"},
+    {"get_fuse_percentage", (PyCFunction)GameBatch_get_fuse_percentage, METH_VARARGS, "Get remaining fuse percentage of one session"},
+    {"update_timers", (PyCFunction)(void(*)(void))GameBatch_update_timers, METH_VARARGS | METH_KEYWORDS,
+     "update_timers(current_time=None, exploded=None, fuse=None)\n\n"
+     "Advance every session in one call. current_time is None (monotonic\n"
+     "clock), a float or a buffer of doubles (one per session). Returns\n"
+     "(exploded, fuse): a bytearray with one byte per session set to 1 if its\n"
+     "bomb exploded, and a memoryview of one double per session with the fuse\n"
+     "percentage. Pass writable buffers (such as array('d') for fuse) to reuse\n"
+     "them between ticks. The GIL is released while the sessions are advanced."},
+    {NULL, NULL, 0, NULL}  // Sentinel
+};
+
+static PyType_Slot GameBatch_slots[] = {
+    {Py_tp_doc, "GameBatch(capacity=64)\n\nMany bomb game sessions stored in one contiguous array. Supports the\n"
+                "buffer protocol: memoryview(batch) is len(batch) read-only STATE_FORMAT\n"
+                "records. The batch cannot grow while a view is alive."},
+    {Py_tp_new, GameBatch_new},
+    {Py_tp_init, GameBatch_init},
+    {Py_tp_dealloc, GameBatch_dealloc},
+    {Py_tp_methods, GameBatch_methods},
+    {Py_sq_length, GameBatch_len},
+    {Py_bf_getbuffer, GameBatch_getbuffer},
+    {Py_bf_releasebuffer, GameBatch_releasebuffer},
+    {0, NULL}
+};
+
+static PyType_Spec GameBatch_spec = {
+    .name = "bomb_game.GameBatch",
+    .basicsize = sizeof(GameBatchObject),
+    .itemsize = 0,
+    .flags = BOMB_TYPE_FLAGS,
+    .slots = GameBatch_slots,
+};
+
 // Method definitions
 static PyMethodDef BombMethods[] = {
-    {"init_game", py_init_game, METH_VARARGS, "Initialize the game with total questions count"},
+    {"monotonic", py_monotonic, METH_NOARGS, "Seconds on the monotonic clock used by the bomb timers"},
+    {"init_game", py_init_game, METH_VARARGS, "Initialize the game with total questions count; the fuse starts at the optional start time, else at the first update"},
     {"answer_question", py_answer_question, METH_VARARGS, "Answer a question (1=correct, 0=wrong)"},
-    {"update_timer", py_update_timer, METH_VARARGS, "Update the bomb timer (current_time in seconds)"},
+    {"update_timer", py_update_timer, METH_VARARGS, "Update the bomb timer (current_time in seconds, default: monotonic clock)"},
     {"get_fuse_percentage", py_get_fuse_percentage, METH_VARARGS, "Get remaining fuse percentage"},
     {"set_paused", py_set_paused, METH_VARARGS, "Set pause state (1=pause, 0=unpause)"},
     {"is_paused", py_is_paused, METH_VARARGS, "Check if game is paused"},
@@ -192,14 +973,111 @@ static PyMethodDef BombMethods[] = {
     {NULL, NULL, 0, NULL}  // Sentinel
 };
 
+static int add_state_layout(PyObject *module) {
+    // Record layout of the exported game state buffers
+    Py_ssize_t count = 0;
+    while (STATE_FIELDS[count]) {
+        count++;
+    }
+    PyObject *fields = PyTuple_New(count);
+    if (!fields) {
+        return -1;
+    }
+    for (Py_ssize_t i = 0; i < count; i++) {
+        PyObject *name = PyUnicode_FromString(STATE_FIELDS[i]);
+        if (!name) {
+            Py_DECREF(fields);
+            return -1;
+        }
+        PyTuple_SET_ITEM(fields, i, name);
+    }
+    if (PyModule_AddObject(module, "STATE_FIELDS", fields) < 0) {
+        Py_DECREF(fields);
+        return -1;
+    }
+
+    PyObject *max_time = PyFloat_FromDouble(MAX_GAME_TIME);
+    if (!max_time || PyModule_AddObject(module, "MAX_GAME_TIME", max_time) < 0) {
+        Py_XDECREF(max_time);
+        return -1;
+    }
+    if (PyModule_AddStringConstant(module, "STATE_FORMAT", STATE_FORMAT) < 0
+        || PyModule_AddIntConstant(module, "STATE_SIZE", sizeof(GameState)) < 0) {
+        return -1;
+    }
+    return 0;
+}
+
+static int bomb_exec(PyObject *module) {
+    BombModuleState *st = get_module_state(module);
+
+    st->game_lock = PyThread_allocate_lock();
+    if (!st->game_lock) {
+        PyErr_NoMemory();
+        return -1;
+    }
+
+    st->game_type = PyType_FromModuleAndSpec(module, &Game_spec, NULL);
+    if (!st->game_type || PyModule_AddType(module, (PyTypeObject*)st->game_type) < 0) {
+        return -1;
+    }
+    st->batch_type = PyType_FromModuleAndSpec(module, &GameBatch_spec, NULL);
+    if (!st->batch_type || PyModule_AddType(module, (PyTypeObject*)st->batch_type) < 0) {
+        return -1;
+    }
+    return add_state_layout(module);
+}
+
+static int bomb_traverse(PyObject *module, visitproc visit, void *arg) {
+    BombModuleState *st = get_module_state(module);
+    Py_VISIT(st->game_type);
+    Py_VISIT(st->batch_type);
+    return 0;
+}
+
+static int bomb_clear(PyObject *module) {
+    BombModuleState *st = get_module_state(module);
+    Py_CLEAR(st->game_type);
+    Py_CLEAR(st->batch_type);
+    return 0;
+}
+
+static void bomb_free(void *module) {
+    BombModuleState *st = get_module_state((PyObject*)module);
+    bomb_clear((PyObject*)module);
+    free_game_internal(st);
+    if (st->game_lock) {
+        PyThread_free_lock(st->game_lock);
+        st->game_lock = NULL;
+    }
+}
+
+static PyModuleDef_Slot bomb_slots[] = {
+    {Py_mod_exec, bomb_exec},
+#if PY_VERSION_HEX >= 0x030C0000
+    // No process-global state: safe under a per-interpreter GIL
+    {Py_mod_multiple_interpreters, Py_MOD_PER_INTERPRETER_GIL_SUPPORTED},
+#endif
+#if PY_VERSION_HEX >= 0x030D0000
+    // Every session is guarded by its own lock, so free-threaded builds
+    // can run without re-enabling the GIL
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, NULL}
+};
+
 static struct PyModuleDef bombmodule = {
     PyModuleDef_HEAD_INIT,
-    "bomb_game",
-    "A bomb defusal game module",
-    -1,
-    BombMethods
+    .m_name = "bomb_game",
+    .m_doc = "A bomb defusal game module",
+    .m_size = sizeof(BombModuleState),
+    .m_methods = BombMethods,
+    .m_slots = bomb_slots,
+    .m_traverse = bomb_traverse,
+    .m_clear = bomb_clear,
+    .m_free = bomb_free,
 };
 
 PyMODINIT_FUNC PyInit_bomb_game(void) {
-    return PyModule_Create(&bombmodule);
-}
\ No newline at end of file
+    return PyModuleDef_Init(&bombmodule);
+}
@@ -0,0 +1,262 @@
+import random
+import sys
+import time
+
+import bomb_game
+
+# Rules shared by the interactive game and headless simulations
+CORRECT_ANSWER_POINTS = 10
+FEEDBACK_DELAY = 1000  # ms the answer feedback stays on screen
+
+
+def monotonic_ms():
+    """Default engine clock: the bomb_game monotonic clock, in milliseconds"""
+    return bomb_game.monotonic() * 1000.0
+
+
+class ManualClock:
+    """Clock that only moves when told to, for simulations and replays"""
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, ms):
+        self.now += ms
+
+
+class GameEngine:
+    """Beat the Bomb rules with no display, mixer or pygame clock.
+
+    The bomb itself is a bomb_game.Game, so outcomes match the interactive
+    game exactly. By default the C core owns the clock, including pause
+    accounting; an injected clock (any callable returning milliseconds)
+    is passed to it explicitly instead.
+
+    Listeners are called as listener(engine, event, *args) for 'start',
+    'answer' (index, is_correct), 'pause', 'resume', 'advance' and 'end'.
+    On 'answer', `answer_latency` holds the ms the question was on screen
+    and `answer_fuse` the fuse percentage just before the answer.
+    """
+    def __init__(self, questions=None, clock=None):
+        self.clock_ms = clock or monotonic_ms
+        # With the default clock the bomb reads time itself: no arguments needed
+        self.explicit_time = clock is not None
+        self.bomb = bomb_game.Game(0, *self.bomb_time())
+        self.listeners = []
+        self.questions = questions or []
+        # Where the questions came from: question graph node and bank indices
+        self.question_set = None
+        self.question_ids = ()
+        self.reset_game_state()
+
+    def start(self, questions, question_set=None, question_ids=()):
+        """Start a new game with the given question set"""
+        self.questions = questions
+        self.question_set = question_set
+        self.question_ids = question_ids
+        self.reset_game_state()
+
+    def emit(self, event, *args):
+        for listener in self.listeners:
+            listener(self, event, *args)
+
+    def reset_game_state(self):
+        """Reset all rule state variables"""
+        if self.questions:
+            self.bomb.reset(len(self.questions), *self.bomb_time())
+
+        self.current_question = 0
+        self.selected_answer = -1
+        self.score = 0
+        self.game_over = False
+        self.won_game = False
+        self.paused = False
+        self.show_feedback = False
+        self.feedback_time = 0
+        self.show_correct_answer = False
+        # Answer latency: time the current question has been on screen, pauses excluded
+        self.question_shown_at = self.paused_at = self.clock_ms()
+        self.answer_latency = 0.0
+        self.answer_fuse = 0.0
+        if self.questions:
+            self.emit('start')
+
+    def bomb_time(self):
+        """Extra timestamp argument for bomb calls: none when the C clock is used"""
+        return (self.clock_ms() / 1000.0,) if self.explicit_time else ()
+
+    def pause(self):
+        if self.paused or self.game_over:
+            return
+        self.paused = True
+        self.paused_at = self.clock_ms()
+        self.bomb.set_paused(1, *self.bomb_time())
+        self.emit('pause')
+
+    def resume(self):
+        if not self.paused:
+            return
+        self.paused = False
+        self.question_shown_at += self.clock_ms() - self.paused_at
+        self.bomb.set_paused(0, *self.bomb_time())
+        self.emit('resume')
+
+    def toggle_pause(self):
+        if self.paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def fuse_percentage(self):
+        return self.bomb.get_fuse_percentage()
+
+    def required_score(self):
+        """Score needed to defuse the bomb: half of the questions right"""
+        return (len(self.questions) * CORRECT_ANSWER_POINTS) // 2
+
+    def answer(self, index):
+        """Select an answer and submit it"""
+        self.selected_answer = index
+        self.submit_answer()
+
+    def submit_answer(self):
+        if self.selected_answer == -1 or self.game_over or self.show_feedback or self.paused:
+            return
+
+        question = self.questions[self.current_question]
+        is_correct = question["answers"][self.selected_answer]["correct"]
+        self.show_correct_answer = not is_correct
+
+        # Update bomb fuse based on correctness
+        self.answer_fuse = self.bomb.get_fuse_percentage()
+        self.bomb.answer_question(1 if is_correct else 0)
+
+        if is_correct:
+            self.score += CORRECT_ANSWER_POINTS
+
+        self.show_feedback = True
+        self.feedback_time = self.clock_ms()
+        self.answer_latency = self.feedback_time - self.question_shown_at
+        self.emit('answer', self.selected_answer, is_correct)
+
+    def update(self):
+        if self.game_over:
+            return
+
+        # The bomb skips paused time on its own
+        if self.bomb.update_timer(*self.bomb_time()):
+            self.finish_game()
+            return
+
+        # Handle question feedback
+        if self.show_feedback and (self.clock_ms() - self.feedback_time) > FEEDBACK_DELAY:
+            self.show_feedback = False
+            self.show_correct_answer = False
+            self.selected_answer = -1
+            self.current_question += 1
+            # A question that comes up during a pause starts its clock on resume
+            self.question_shown_at = self.paused_at = self.clock_ms()
+
+            if self.current_question >= len(self.questions):
+                self.finish_game()
+            else:
+                self.bomb.reset(len(self.questions), *self.bomb_time())
+                if self.paused:
+                    self.bomb.set_paused(1, *self.bomb_time())
+                self.emit('advance')
+
+    def finish_game(self):
+        self.won_game = self.score >= self.required_score()
+        self.game_over = True
+        self.emit('end')
+        self.on_game_over()
+
+    def on_game_over(self):
+        """Hook called exactly once when a game ends"""
+
+
+def random_player(accuracy=0.7, mean_delay=4000.0, rng=None):
+    """Answer policy: right with probability `accuracy`, after an exponential delay (ms)"""
+    rng = rng or random.Random()
+
+    def choose(engine, question):
+        answers = question["answers"]
+        correct = [i for i, ans in enumerate(answers) if ans["correct"]]
+        wrong = [i for i, ans in enumerate(answers) if not ans["correct"]]
+        if correct and (not wrong or rng.random() < accuracy):
+            index = rng.choice(correct)
+        else:
+            index = rng.choice(wrong)
+        return index, rng.expovariate(1.0 / mean_delay)
+
+    return choose
+
+
+def simulate_game(engine, questions, choose_answer):
+    """Play one full game headlessly, jumping the clock from event to event.
+
+    `engine` must use a ManualClock. `choose_answer(engine, question)` returns
+    (answer_index, delay_ms). Returns the finished engine.
+    """
+    clock = engine.clock_ms
+    engine.start(questions)
+    engine.update()
+
+    while not engine.game_over:
+        question = engine.questions[engine.current_question]
+        index, delay = choose_answer(engine, question)
+        clock.advance(delay)
+        engine.update()
+        if engine.game_over:
+            break
+        engine.answer(index)
+        clock.advance(FEEDBACK_DELAY + 1)
+        engine.update()
+
+    return engine
+
+
+def main(argv):
+    import argparse
+
+    from question_graph import QuestionGraph
+    from question_pack import load_question_bank
+
+    parser = argparse.ArgumentParser(description="Simulate Beat the Bomb games headlessly")
+    parser.add_argument("--questions", default="questions.json")
+    parser.add_argument("--pack", default="questions.pack")
+    parser.add_argument("--graph", default="question_graph.json")
+    parser.add_argument("--set", default="set1_a", help="question set node id")
+    parser.add_argument("--games", type=int, default=10000)
+    parser.add_argument("--accuracy", type=float, default=0.7)
+    parser.add_argument("--mean-delay", type=float, default=4000.0, help="ms")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    bank = load_question_bank(args.questions, args.pack)
+    questions = QuestionGraph.from_file(bank, args.graph).get_questions(args.set)
+    if not questions:
+        parser.error(f"{args.set!r} is not a question set")
+
+    rng = random.Random(args.seed)
+    policy = random_player(args.accuracy, args.mean_delay, rng)
+    engine = GameEngine(clock=ManualClock())
+    wins = exploded = total_score = 0
+
+    start = time.perf_counter()
+    for _ in range(args.games):
+        simulate_game(engine, questions, policy)
+        wins += engine.won_game
+        exploded += engine.bomb.bomb_exploded
+        total_score += engine.score
+    elapsed = time.perf_counter() - start
+
+    print(f"games: {args.games}  wins: {wins / args.games:.1%}  "
+          f"timed out: {exploded / args.games:.1%}  mean score: {total_score / args.games:.1f}")
+    print(f"{args.games / elapsed:,.0f} games/s")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
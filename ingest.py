@@ -0,0 +1,251 @@
+"""Streaming ingestion of question banks.
+
+Reads a bank incrementally, either a JSON array (questions.json format)
+or JSON Lines with one question per line, validates and normalizes every
+question, drops duplicates and writes a compiled pack (plus, optionally,
+the normalized bank as JSON). Memory stays bounded by the largest single
+question and the pack's fixed-size index, whatever the size of the bank.
+
+A question is accepted when it has non-empty text, 2 to MAX_ANSWERS
+answers with non-empty texts, and exactly one correct answer. Repeated
+wrong answers are dropped (and counted as fixed); a wrong answer that
+repeats the correct one rejects the question.
+
+Questions whose text (ignoring case and spacing) was already seen are
+dropped as duplicates, so indices in question_graph.json may need
+updating after a bank is ingested.
+
+Usage: python ingest.py BANK --pack questions.pack [--json questions.json]
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+from question_pack import PackWriter
+
+MAX_ANSWERS = 4            # rows on the game screen
+MAX_TEXT_LENGTH = 1000     # characters per question or answer
+MAX_RECORD_BYTES = 1 << 20  # a single question larger than this is a parse error
+CHUNK_SIZE = 1 << 16
+INVALID_JSON = object()  # stands in for a JSON Lines line that does not parse
+SCALAR_END = re.compile(r'[\s,\]]')  # what may follow a top-level number or literal
+
+
+def iter_json_array(f, chunk_size=CHUNK_SIZE, max_record=MAX_RECORD_BYTES):
+    """Yield the elements of a top-level JSON array from a text file, one at a time"""
+    decoder = json.JSONDecoder()
+    buffer = f.read(chunk_size).lstrip()
+    if not buffer.startswith('['):
+        raise ValueError("expected a JSON array")
+    pos = 1
+    eof = False
+
+    while True:
+        # Skip separators, refilling the buffer as needed
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n,':
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            buffer, pos = f.read(chunk_size), 0
+            eof = not buffer
+        if pos >= len(buffer):
+            raise ValueError("unterminated JSON array")
+        if buffer[pos] == ']':
+            return
+        # A number or literal cut at the chunk boundary would still decode
+        # ('2.' as 2): wait until a delimiter shows where it ends
+        if buffer[pos] not in '{["' and not eof and not SCALAR_END.search(buffer, pos):
+            if len(buffer) - pos > max_record:
+                raise ValueError("JSON value too long")
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof or len(buffer) - pos > max_record:
+                raise
+            chunk = f.read(chunk_size)
+            eof = not chunk
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            continue
+        yield value
+        pos = end
+        if pos > chunk_size:
+            buffer, pos = buffer[pos:], 0
+
+
+def iter_json_lines(f):
+    """Yield the object on every non-blank line; INVALID_JSON for a line that does not parse"""
+    for line in f:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                yield INVALID_JSON
+
+
+def iter_bank(f):
+    """JSON array or JSON Lines, whichever the file starts with"""
+    start = f.read(1)
+    while start and start.isspace():
+        start = f.read(1)
+    f.seek(0)
+    return iter_json_array(f) if start == '[' else iter_json_lines(f)
+
+
+def clean_text(value):
+    """Collapse whitespace; None unless a non-empty string of sane length"""
+    if not isinstance(value, str):
+        return None
+    text = ' '.join(value.split())
+    return text if 0 < len(text) <= MAX_TEXT_LENGTH else None
+
+
+def normalize_question(item):
+    """(question, note) with normalized fields, or (None, rejection reason).
+
+    The note is None unless the question had to be fixed.
+    """
+    if item is INVALID_JSON:
+        return None, "invalid JSON"
+    if not isinstance(item, dict):
+        return None, "not an object"
+    text = clean_text(item.get("question"))
+    if text is None:
+        return None, "missing question text"
+    answers = item.get("answers")
+    if not isinstance(answers, list) or not 2 <= len(answers) <= MAX_ANSWERS:
+        return None, f"needs 2-{MAX_ANSWERS} answers"
+
+    normalized = []
+    for answer in answers:
+        answer_text = clean_text(answer.get("text")) if isinstance(answer, dict) else None
+        if answer_text is None or not isinstance(answer.get("correct"), bool):
+            return None, "malformed answer"
+        normalized.append({"text": answer_text, "correct": answer["correct"]})
+
+    if sum(ans["correct"] for ans in normalized) != 1:
+        return None, "needs exactly one correct answer"
+
+    note = None
+    by_text = {}
+    for ans in normalized:
+        by_text.setdefault(ans["text"].casefold(), []).append(ans)
+    if len(by_text) != len(normalized):
+        if any(len(group) > 1 and any(ans["correct"] for ans in group) for group in by_text.values()):
+            return None, "wrong answer repeats the correct one"
+        normalized = [group[0] for group in by_text.values()]
+        if len(normalized) < 2:
+            return None, f"needs 2-{MAX_ANSWERS} answers"
+        note = "repeated wrong answers dropped"
+    return {"question": text, "answers": normalized}, note
+
+
+class JsonBankWriter:
+    """Stream questions out as a questions.json-style array, replacing `path` on close"""
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path + '.partial', 'w', encoding='utf-8')
+        self.file.write('[')
+        self.count = 0
+
+    def add(self, question):
+        self.file.write(',\n' if self.count else '\n')
+        self.file.write(json.dumps(question, ensure_ascii=False))
+        self.count += 1
+
+    def close(self):
+        self.file.write('\n]\n')
+        self.file.close()
+        os.replace(self.path + '.partial', self.path)
+
+
+def ingest(source, pack_path, json_path=None, report_every=0, log=print):
+    """Ingest the bank at `source`; returns a stats dict"""
+    stats = Counter()
+    rejections = Counter()
+    fixes = Counter()
+    seen = set()  # 16-byte digests of accepted question texts
+    start = time.perf_counter()
+
+    pack = PackWriter(pack_path)
+    bank = JsonBankWriter(json_path) if json_path else None
+    try:
+        # utf-8-sig: a byte order mark from an editor would hide the opening '['
+        with open(source, encoding='utf-8-sig') as f:
+            for item in iter_bank(f):
+                stats["read"] += 1
+                question, reason = normalize_question(item)
+                if question is not None:
+                    digest = hashlib.blake2b(question["question"].casefold().encode('utf-8'), digest_size=16).digest()
+                    if digest in seen:
+                        question, reason = None, "duplicate question"
+                    else:
+                        seen.add(digest)
+
+                if question is None:
+                    rejections[reason] += 1
+                else:
+                    if reason:
+                        fixes[reason] += 1
+                    pack.add(question)
+                    if bank:
+                        bank.add(question)
+                    stats["accepted"] += 1
+
+                if report_every and stats["read"] % report_every == 0:
+                    log(f"{stats['read']:,} read, {stats['accepted']:,} accepted "
+                        f"({stats['read'] / (time.perf_counter() - start):,.0f} questions/s)")
+    except BaseException:
+        pack.strings.close()
+        if bank:
+            bank.file.close()
+            os.remove(bank.path + '.partial')
+        raise
+
+    pack.close()
+    if bank:
+        bank.close()
+    elapsed = time.perf_counter() - start
+    return {
+        "read": stats["read"],
+        "accepted": stats["accepted"],
+        "rejected": dict(rejections),
+        "fixed": dict(fixes),
+        "seconds": elapsed,
+        "questions_per_second": stats["read"] / elapsed if elapsed else 0.0,
+        "mb_per_second": os.path.getsize(source) / 1e6 / elapsed if elapsed else 0.0,
+    }
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Validate, deduplicate and compile a question bank")
+    parser.add_argument("source", help="JSON array or JSON Lines bank")
+    parser.add_argument("--pack", default="questions.pack")
+    parser.add_argument("--json", help="also write the normalized bank as JSON")
+    parser.add_argument("--progress", type=int, default=100000, metavar="N", help="report every N questions")
+    args = parser.parse_args(argv)
+
+    stats = ingest(args.source, args.pack, args.json, args.progress)
+    print(f"{stats['read']:,} questions read, {stats['accepted']:,} accepted in {stats['seconds']:.2f}s "
+          f"({stats['questions_per_second']:,.0f} questions/s, {stats['mb_per_second']:.1f} MB/s)")
+    for reason, count in sorted(stats["rejected"].items(), key=lambda item: -item[1]):
+        print(f"  rejected {count:,}: {reason}")
+    for note, count in sorted(stats["fixed"].items(), key=lambda item: -item[1]):
+        print(f"  fixed {count:,}: {note}")
+    return 0 if stats["accepted"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
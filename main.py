@@ -1,9 +1,18 @@
 import sys
-import bomb_game
+import threading
 import pygame
-import json
-import random
 import os
+import bomb_game
+from analytics import DEFAULT_ANALYTICS_DIR, AnalyticsQueue
+from audio import SoundBank, start_mixer
+from game_engine import GameEngine
+from profiler import FrameProfiler, ProfilerOverlay
+from question_graph import QuestionGraph, QuestionSelection
+from question_index import load_question_index, question_tags
+from question_pack import load_question_bank
+from replay import DEFAULT_LOG_PATH, SessionRecorder
+from scheduler import SCHEDULES, AdaptiveScheduler, PlayerStats, stats_path
+from rendering import BombSprites, DirtyRegions, FontRegistry, Layout, TextCache, blit_centered
 def resource_path(relative_path):
     """ Get absolute path to resource, works for dev and for PyInstaller """
     try:
@@ -13,11 +22,6 @@ def resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 from datetime import datetime
 
-# Initialize pygame
-pygame.init()
-pygame.font.init()
-pygame.mixer.init()
-
 # Colors
 WHITE = (255, 255, 255)
 BLACK = (0, 0, 0)
@@ -31,165 +35,160 @@ GRAY = (200, 200, 200)
 LIGHT_BLUE = (173, 216, 230)
 DARK_GRAY = (100, 100, 100)
 
-class QuestionGraph:
-    def __init__(self, all_questions):
-        # Split questions into main sets and subsets
-        self.graph = {
-            'nodes': {
-                'root': {
-                    'type': 'choice',
-                    'children': ['set1', 'set2'],
-                    'title': "Main Menu"
-                },
-                'set1': {
-                    'type': 'choice',
-                    'children': ['set1_a', 'set1_b', 'set1_c'],
-                    'questions': None,
-                    'title': "Licenses"
-                },
-                'set2': {
-                    'type': 'choice',
-                    'children': ['set2_a', 'set2_b', 'set2_c'],
-                    'questions': None,
-                    'title': "Classical programming"
-                },
-                # Subsets for set1
-                'set1_a': {
-                    'type': 'question_set',
-                    'children': [],
-                    'questions': all_questions[:10],
-                    'title': "License - definition and types"
-                },
-                'set1_b': {
-                    'type': 'question_set',
-                    'children': [],
-                    'questions': all_questions[10:20],
-                    'title': "Use of licences – advantages and disadvantages"
-                },
-                'set1_c': {
-                    'type': 'question_set',
-                    'children': [],
-                    'questions': all_questions[20:30],
-                    'title': "Emerging trends in licensing"
-                },
-                # Subsets for set2
-                'set2_a': {
-                    'type': 'question_set',
-                    'children': [],
-                    'questions': all_questions[30:40],
-                    'title': "Classical Programming - an introduction"
-                },
-                'set2_b': {
-                    'type': 'question_set',
-                    'children': [],
-                    'questions': all_questions[40:50],
-                    'title': "Classical Programming - Key Programming Concepts"
-                },
-                'set2_c': {
-                    'type': 'question_set',
-                    'children': [],
-                    'questions': all_questions[50:60],
-                    'title': "Classical Programming - Web Programming"
-                }
-            },
-            'edges': [
-                ('root', 'set1'), ('root', 'set2'),
-                ('set1', 'set1_a'), ('set1', 'set1_b'), ('set1', 'set1_c'),
-                ('set2', 'set2_a'), ('set2', 'set2_b'), ('set2', 'set2_c')
-            ]
-        }
-        
-    def get_questions(self, node_id):
-        """Get questions for a chosen node"""
-        if node_id in self.graph['nodes']:
-            node = self.graph['nodes'][node_id]
-            if node['type'] == 'question_set':
-                return node['questions']
-        return []
-    
-    def get_children(self, node_id):
-        """Get child nodes for navigation"""
-        if node_id in self.graph['nodes']:
-            return self.graph['nodes'][node_id]['children']
-        return []
-    
-    def get_node_title(self, node_id):
-        """Get the title for a node"""
-        if node_id in self.graph['nodes']:
-            return self.graph['nodes'][node_id]['title']
-        return ""
-
-class BeatTheBombGame:
-    def __init__(self, screen_width=1500, screen_height=700):
+class BeatTheBombGame(GameEngine):
+    def __init__(self, screen_width=1500, screen_height=700, frame_cap=60, idle_refresh_ms=500,
+                 profile_overlay=False, trace_path=None, session_log=None,
+                 player='player', schedule=None, analytics_dir=None):
+        # Only what the welcome screen needs; the mixer starts with the first game
+        pygame.display.init()
+        pygame.font.init()
         pygame.display.set_caption("Beat the Bomb Game")
         self.fullscreen = False
         self.screen = pygame.display.set_mode((screen_width, screen_height), pygame.RESIZABLE)
-        self.screen_width, self.screen_height = self.screen.get_size()
+        self.apply_screen_size()
 
         self.show_welcome = True
         self.welcome_next_button = None
 
-        self.paused_duration = 0
-        self.pause_start_time = 0
+        # Frame cap for the game screen; static screens redraw only on change
+        self.frame_cap = frame_cap
+        self.idle_refresh_ms = idle_refresh_ms
+        self.needs_redraw = True
+        self.hover_state = -1
 
         # Initialize fonts
-        self.question_font = pygame.font.SysFont('Helvetica', 30)
-        self.answer_font = pygame.font.SysFont('Helvetica', 26)
-        self.score_font = pygame.font.SysFont('Helvetica', 32)
-        self.timer_font = pygame.font.SysFont('Helvetica', 48)
-        self.button_font = pygame.font.SysFont('Helvetica', 30)
-        self.menu_font = pygame.font.SysFont('Helvetica', 40)
-        self.subtitle_font = pygame.font.SysFont('Helvetica', 30)
+        self.fonts = FontRegistry()
+        self.question_font = self.fonts.get('Helvetica', 30)
+        self.answer_font = self.fonts.get('Helvetica', 26)
+        self.score_font = self.fonts.get('Helvetica', 32)
+        self.timer_font = self.fonts.get('Helvetica', 48)
+        self.button_font = self.fonts.get('Helvetica', 30)
+        self.menu_font = self.fonts.get('Helvetica', 40)
+        self.subtitle_font = self.fonts.get('Helvetica', 30)
+        self.text_cache = TextCache()
+        self.bomb_sprites = BombSprites(BLACK, ORANGE, YELLOW)
+        self.frame_count = 0
+
+        # Frame-time instrumentation: F3 toggles the overlay, F4 dumps a trace
+        self.profiler = FrameProfiler()
+        self.profiler.instrument(self, [name for name in dir(type(self)) if name.startswith('draw_')])
+        self.overlay = None
+        self.overlay_rect = None
+        self.trace_path = trace_path
+        if profile_overlay:
+            self.toggle_overlay()
     
-        with open(resource_path('questions.json')) as f:
-            all_questions = json.load(f)
+        # Sounds are decoded into the mixer's format once the mixer starts
+        self.sounds = SoundBank()
+        self.sounds.add('explosion', resource_path('explosion.wav'))
+        self.audio_started = False
+        self.games_started = 0
+
+        # The question bank loads in the background while the welcome screen is up
+        self.question_graph = None
+        self.question_index = None
+        self.current_node = None
+        self.asset_error = None
+        self.assets_ready = threading.Event()  # bank and graph: the menu can open
+        self.index_ready = threading.Event()   # search index built, or given up on
+        self.search_drawn = False
+        threading.Thread(target=self.load_assets, name="asset-loader", daemon=True).start()
 
-        # Initialize question graph
-        self.question_graph = QuestionGraph(all_questions)
-        self.current_node = 'root'
         self.previous_nodes = []
         self.questions = []
         self.menu_buttons = []
         self.in_menu = True  # Track if we're in menu mode
-
-        self.explosion_sound = pygame.mixer.Sound(resource_path('explosion.wav'))
-        self.reset_game_state()
+        self.searching = False
+        self.search_query = ""
+        self.search_ids = []
+
+        super().__init__(self.questions)
+
+        # With a log path, every played session is appended to the replay log
+        self.recorder = SessionRecorder(session_log) if session_log else None
+        if self.recorder:
+            self.listeners.append(self.recorder)
+
+        # With a schedule, question order adapts to the player's answers; None keeps file order
+        self.scheduler = AdaptiveScheduler(PlayerStats(stats_path(player)), schedule) if schedule else None
+        if self.scheduler:
+            self.listeners.append(self.scheduler)
+
+        # With a directory, answers, pauses and explosions are batch-written for analytics.py
+        self.analytics = AnalyticsQueue(analytics_dir) if analytics_dir else None
+        if self.analytics:
+            self.listeners.append(self.analytics)
+
+    def load_assets(self):
+        """Background thread: question bank, menu graph, sound files and search index"""
+        try:
+            all_questions = load_question_bank(resource_path('questions.json'), resource_path('questions.pack'))
+            self.question_graph = QuestionGraph.from_file(all_questions, resource_path('question_graph.json'))
+            self.current_node = self.question_graph.root
+            self.sounds.read()
+        except Exception as error:
+            self.asset_error = error
+            self.index_ready.set()
+            return
+        finally:
+            self.assets_ready.set()
+
+        # Search is optional: without an index the menu just has no Search button;
+        # the button appears once a large bank has been indexed
+        try:
+            sources = [resource_path(name) for name in ('questions.json', 'questions.pack', 'question_graph.json')]
+            self.question_index = load_question_index(all_questions, resource_path('questions.index'), sources,
+                                                      question_tags(self.question_graph))
+        except Exception as error:
+            print(f"Question search disabled: {error!r}", file=sys.stderr)
+        finally:
+            self.index_ready.set()
+
+    def wait_for_assets(self):
+        """Block until the background loader is done; re-raises its error"""
+        self.assets_ready.wait()
+        if self.asset_error is not None:
+            raise self.asset_error
+
+    def start_audio(self):
+        """Start the mixer, once, when the first game begins; sounds are decoded off the main thread"""
+        if self.audio_started:
+            return
+        self.audio_started = True
+        # Without an audio device the bank stays silent
+        if start_mixer():
+            threading.Thread(target=self.sounds.preload, name="sound-loader", daemon=True).start()
 
     def reset_game_state(self):
         """Reset all game state variables"""
-        if self.questions:
-            bomb_game.init_game(len(self.questions))
-            
-        self.current_question = 0
-        self.selected_answer = -1
-        self.score = 0
-        self.game_over = False
-        self.won_game = False
+        super().reset_game_state()
+
+        self.games_started += 1
+        self.prefetch = None
         self.clock = pygame.time.Clock()
-        self.start_time = pygame.time.get_ticks() / 1000.0
-        self.paused_duration = 0
-        self.pause_start_time = 0
-        self.show_feedback = False
-        self.feedback_time = 0
         self.correct_answer_index = -1
-        self.show_correct_answer = False
         self.play_again_button = None
         self.pause_button = None
         self.reset_button = None
-        self.paused = False
         self.pause_menu_buttons = []
         self.resume_button = None
         self.pause_reset_button = None
         self.back_button = None
 
+    def draw_button(self, rect, label, border=BLACK):
+        color = LIGHT_BLUE if self.hovered(rect) else GRAY
+        pygame.draw.rect(self.screen, color, rect)
+        pygame.draw.rect(self.screen, border, rect, 2)
+        blit_centered(self.screen, self.text_cache.render(self.button_font, label, BLACK), rect.center)
+
     def draw_welcome_screen(self):
         """Draw the welcome screen with game instructions"""
         self.screen.fill(WHITE)
+        layout = self.layout
         
         # Title
-        title = self.menu_font.render("Welcome to Beat the Bomb Game!", True, BLACK)
-        title_rect = title.get_rect(center=(self.screen_width//2, self.screen_height//2 - 200))
-        self.screen.blit(title, title_rect)
+        title = self.text_cache.render(self.menu_font, "Welcome to Beat the Bomb Game!", BLACK)
+        blit_centered(self.screen, title, layout.welcome_title)
         
         # Instructions
         instructions = [
@@ -206,284 +205,245 @@ class BeatTheBombGame:
             "Select a question set from the next screen to begin!"
         ]
         
+        x, y = layout.welcome_lines
         for i, line in enumerate(instructions):
-            text = self.subtitle_font.render(line, True, BLACK)
-            self.screen.blit(text, (self.screen_width//2 - 300, self.screen_height//2 - 100 + i * 40))
+            text = self.text_cache.render(self.subtitle_font, line, BLACK)
+            self.screen.blit(text, (x, y + i * 40))
         
         # Next button
-        button_width, button_height = 200, 50
-        button_x = self.screen_width - button_width - 40
-        button_y = self.screen_height - button_height - 40
-        
-        self.welcome_next_button = pygame.Rect(button_x, button_y, button_width, button_height)
-        mouse_pos = pygame.mouse.get_pos()
-        button_color = LIGHT_BLUE if self.welcome_next_button.collidepoint(mouse_pos) else GRAY
-        
-        pygame.draw.rect(self.screen, button_color, self.welcome_next_button)
-        pygame.draw.rect(self.screen, BLACK, self.welcome_next_button, 2)
-        
-        text = self.button_font.render("Continue", True, BLACK)
-        text_rect = text.get_rect(center=self.welcome_next_button.center)
-        self.screen.blit(text, text_rect)
+        self.welcome_next_button = layout.welcome_next_button
+        self.draw_button(self.welcome_next_button, "Continue")
 
     def handle_welcome_click(self, pos):
         """Handle clicks on the welcome screen"""
         if self.welcome_next_button and self.welcome_next_button.collidepoint(pos):
+            # The menu is built from the question graph
+            self.wait_for_assets()
             self.show_welcome = False
             return True
         return False
 
     def draw_bomb(self, fuse_percent):
-        center = (self.screen_width // 2, 150)
-        pygame.draw.circle(self.screen, BLACK, center, 80)
-        fuse_len = 150 * (fuse_percent / 100)
-        fuse_start = (center[0], center[1] - 80)
-        fuse_end = (center[0] + 50, center[1] - 80 - fuse_len)
-        pygame.draw.line(self.screen, ORANGE, fuse_start, fuse_end, 8)
-        if fuse_percent > 0:
-            for _ in range(5):
-                sx = fuse_end[0] + random.randint(-10, 10)
-                sy = fuse_end[1] + random.randint(-20, 0)
-                pygame.draw.circle(self.screen, YELLOW, (sx, sy), random.randint(2, 5))
+        self.bomb_sprites.draw(self.screen, self.layout.bomb_center, fuse_percent, self.frame_count)
+
+    def question_boxes(self, number=None):
+        """Wrapped text and answer rows of question `number` (default: the current one), cached by the layout"""
+        if number is None:
+            number = self.current_question
+        question = self.questions[number]
+        return self.layout.question_boxes(f"Q{number + 1}: {question['question']}",
+                                          tuple(ans["text"] for ans in question["answers"]),
+                                          self.question_font, self.answer_font)
 
     def draw_question(self):
         if self.current_question >= len(self.questions):
             return
 
+        layout = self.layout
         question = self.questions[self.current_question]
         self.correct_answer_index = next((i for i, ans in enumerate(question["answers"]) if ans["correct"]), -1)
-        question_text = f"Q{self.current_question + 1}: {question['question']}"
-        q_surface = self.question_font.render(question_text, True, BLACK)
-        self.screen.blit(q_surface, (50, 250))
+        question_block, rows = self.question_boxes()
+        layout.text.blit(self.screen, self.text_cache, self.question_font, question_block, BLACK, layout.question_pos)
         
-        for i, ans in enumerate(question["answers"]):
+        for i, (ans, row) in enumerate(zip(question["answers"], rows)):
             bg_color = LIGHT_GREEN if (self.show_feedback and ans["correct"] and self.show_correct_answer) else WHITE
-            answer_bg = pygame.Rect(45, 295 + i * 40, self.screen_width - 90, 32)
-            pygame.draw.rect(self.screen, bg_color, answer_bg)
-            checkbox_rect = pygame.Rect(50, 305 + i * 40, 20, 20)
+            pygame.draw.rect(self.screen, bg_color, row.rect)
+            checkbox_rect = row.checkbox
             pygame.draw.rect(self.screen, BLACK, checkbox_rect, 2)
             
             if self.show_feedback and i == self.selected_answer:
                 color = GREEN if ans["correct"] else RED
-                pygame.draw.line(self.screen, color, (52, 310 + i * 40), (68, 318 + i * 40), 2)
-                pygame.draw.line(self.screen, color, (68, 310 + i * 40), (52, 318 + i * 40), 2)
+                left, top = checkbox_rect.left + 2, checkbox_rect.top + 5
+                pygame.draw.line(self.screen, color, (left, top), (left + 16, top + 8), 2)
+                pygame.draw.line(self.screen, color, (left + 16, top), (left, top + 8), 2)
             
             text_color = BLUE if i == self.selected_answer else BLACK
-            txt = self.answer_font.render(ans["text"], True, text_color)
-            self.screen.blit(txt, (80, 300 + i * 40))
+            layout.text.blit(self.screen, self.text_cache, self.answer_font, row.block, text_color, row.text_pos)
 
     def draw_score(self):
         score_text = f"Score: {self.score}"
-        score_surface = self.score_font.render(score_text, True, BLACK)
-        self.screen.blit(score_surface, (50, 50))
-
-    def draw_timer(self):
-        fuse = bomb_game.get_fuse_percentage()
-        time_rem = int((fuse / 100) * 20)
+        score_surface = self.text_cache.render(self.score_font, score_text, BLACK)
+        self.screen.blit(score_surface, self.layout.score_pos)
+
+    @staticmethod
+    def timer_seconds(fuse):
+        """Whole seconds shown for a fuse percentage"""
+        return int(fuse / 100 * bomb_game.MAX_GAME_TIME)
+
+    def draw_timer(self, fuse=None):
+        if fuse is None:
+            fuse = self.bomb.get_fuse_percentage()
+        time_rem = self.timer_seconds(fuse)
         timer_text = f"Time: {max(0, time_rem)}s"
         color = RED if time_rem < 5 else BLACK
-        timer_surface = self.timer_font.render(timer_text, True, color)
-        self.screen.blit(timer_surface, (self.screen_width - 200, 50))
+        timer_surface = self.text_cache.render(self.timer_font, timer_text, color)
+        self.screen.blit(timer_surface, self.layout.timer_pos)
 
     def draw_control_buttons(self):
-        # Pause button (top right)
-        pause_width, pause_height = 100, 40
-        pause_x = self.screen_width - pause_width - 20
-        pause_y = 150
-        
-        self.pause_button = pygame.Rect(pause_x, pause_y, pause_width, pause_height)
-        mouse_pos = pygame.mouse.get_pos()
-        pause_color = LIGHT_BLUE if self.pause_button.collidepoint(mouse_pos) else GRAY
-        pygame.draw.rect(self.screen, pause_color, self.pause_button)
-        pygame.draw.rect(self.screen, BLACK, self.pause_button, 2)
-        
-        pause_text = self.button_font.render("Pause", True, BLACK)
-        pause_text_rect = pause_text.get_rect(center=self.pause_button.center)
-        self.screen.blit(pause_text, pause_text_rect)
-
-        # Reset button (next to pause)
-        reset_width, reset_height = 100, 40
-        reset_x = pause_x - reset_width - 10
-        reset_y = 150
-        
-        self.reset_button = pygame.Rect(reset_x, reset_y, reset_width, reset_height)
-        reset_color = LIGHT_BLUE if self.reset_button.collidepoint(mouse_pos) else GRAY
-        pygame.draw.rect(self.screen, reset_color, self.reset_button)
-        pygame.draw.rect(self.screen, BLACK, self.reset_button, 2)
-        
-        reset_text = self.button_font.render("Reset", True, BLACK)
-        reset_text_rect = reset_text.get_rect(center=self.reset_button.center)
-        self.screen.blit(reset_text, reset_text_rect)
+        # Pause button (top right) and reset button next to it
+        self.pause_button = self.layout.pause_button
+        self.draw_button(self.pause_button, "Pause")
+        self.reset_button = self.layout.reset_button
+        self.draw_button(self.reset_button, "Reset")
 
         # Back button (top left)
         if len(self.previous_nodes) > 0:
-            back_width, back_height = 100, 40
-            back_x = 20
-            back_y = 150
-            
-            self.back_button = pygame.Rect(back_x, back_y, back_width, back_height)
-            back_color = LIGHT_BLUE if self.back_button and self.back_button.collidepoint(mouse_pos) else GRAY
-            pygame.draw.rect(self.screen, back_color, self.back_button)
-            pygame.draw.rect(self.screen, BLACK, self.back_button, 2)
-            
-            back_text = self.button_font.render("Back", True, BLACK)
-            back_text_rect = back_text.get_rect(center=self.back_button.center)
-            self.screen.blit(back_text, back_text_rect)
+            self.back_button = self.layout.game_back_button
+            self.draw_button(self.back_button, "Back")
 
     def draw_pause_menu(self):
-        # Semi-transparent overlay
-        overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))
-        self.screen.blit(overlay, (0, 0))
+        # Semi-transparent overlay, built once per screen size
+        if self.pause_overlay is None:
+            self.pause_overlay = pygame.Surface((self.screen_width, self.screen_height), pygame.SRCALPHA)
+            self.pause_overlay.fill((0, 0, 0, 128))
+        self.screen.blit(self.pause_overlay, (0, 0))
         
         # Pause title
-        title = self.menu_font.render("GAME PAUSED", True, WHITE)
-        title_rect = title.get_rect(center=(self.screen_width//2, self.screen_height//2 - 100))
-        self.screen.blit(title, title_rect)
-        
-        # Resume button
-        resume_width, resume_height = 200, 50
-        resume_x = self.screen_width//2 - resume_width//2
-        resume_y = self.screen_height//2 - 20
+        title = self.text_cache.render(self.menu_font, "GAME PAUSED", WHITE)
+        blit_centered(self.screen, title, self.layout.pause_title)
         
-        self.resume_button = pygame.Rect(resume_x, resume_y, resume_width, resume_height)
-        mouse_pos = pygame.mouse.get_pos()
-        resume_color = LIGHT_BLUE if self.resume_button.collidepoint(mouse_pos) else GRAY
-        pygame.draw.rect(self.screen, resume_color, self.resume_button)
-        pygame.draw.rect(self.screen, WHITE, self.resume_button, 2)
-        
-        resume_text = self.button_font.render("Resume", True, BLACK)
-        resume_text_rect = resume_text.get_rect(center=self.resume_button.center)
-        self.screen.blit(resume_text, resume_text_rect)
-        
-        # Reset button in pause menu
-        pause_reset_width, pause_reset_height = 200, 50
-        pause_reset_x = self.screen_width//2 - pause_reset_width//2
-        pause_reset_y = self.screen_height//2 + 50
-        
-        self.pause_reset_button = pygame.Rect(pause_reset_x, pause_reset_y, pause_reset_width, pause_reset_height)
-        pause_reset_color = LIGHT_BLUE if self.pause_reset_button.collidepoint(mouse_pos) else GRAY
-        pygame.draw.rect(self.screen, pause_reset_color, self.pause_reset_button)
-        pygame.draw.rect(self.screen, WHITE, self.pause_reset_button, 2)
-        
-        pause_reset_text = self.button_font.render("Reset Game", True, BLACK)
-        pause_reset_text_rect = pause_reset_text.get_rect(center=self.pause_reset_button.center)
-        self.screen.blit(pause_reset_text, pause_reset_text_rect)
+        # Resume and reset buttons
+        self.resume_button = self.layout.resume_button
+        self.draw_button(self.resume_button, "Resume", border=WHITE)
+        self.pause_reset_button = self.layout.pause_reset_button
+        self.draw_button(self.pause_reset_button, "Reset Game", border=WHITE)
 
     def draw_play_again_button(self):
-        button_width, button_height = 200, 50
-        button_x = self.screen_width // 2 - button_width // 2
-        button_y = self.screen_height // 2 + 100
-        
-        self.play_again_button = pygame.Rect(button_x, button_y, button_width, button_height)
-        mouse_pos = pygame.mouse.get_pos()
-        button_color = LIGHT_BLUE if self.play_again_button.collidepoint(mouse_pos) else GRAY
-        
-        pygame.draw.rect(self.screen, button_color, self.play_again_button)
-        pygame.draw.rect(self.screen, BLACK, self.play_again_button, 2)
-        
-        text = self.button_font.render("Play Again", True, BLACK)
-        text_rect = text.get_rect(center=self.play_again_button.center)
-        self.screen.blit(text, text_rect)
+        self.play_again_button = self.layout.play_again_button
+        self.draw_button(self.play_again_button, "Play Again")
 
     def draw_game_over(self):
         msg = "You defused the bomb!" if self.won_game else "Boom! The bomb exploded!"
         color = GREEN if self.won_game else RED
-        surface = self.score_font.render(msg, True, color)
-        rect = surface.get_rect(center=(self.screen_width // 2, self.screen_height // 2 - 100))
-        self.screen.blit(surface, rect)
+        surface = self.text_cache.render(self.score_font, msg, color)
+        blit_centered(self.screen, surface, self.layout.game_over_title)
         
-        score_txt = self.score_font.render(f"Final Score: {self.score}", True, BLACK)
-        score_rect = score_txt.get_rect(center=(self.screen_width // 2, self.screen_height // 2 - 50))
-        self.screen.blit(score_txt, score_rect)
+        score_txt = self.text_cache.render(self.score_font, f"Final Score: {self.score}", BLACK)
+        blit_centered(self.screen, score_txt, self.layout.final_score)
         
         self.draw_play_again_button()
 
     def draw_menu(self):
         """Draw the appropriate menu based on current node"""
         self.screen.fill(WHITE)
-        self.menu_buttons = []
+        layout = self.layout
         
         # Draw title
-        title = self.menu_font.render(self.question_graph.get_node_title(self.current_node), True, BLACK)
-        title_rect = title.get_rect(center=(self.screen_width//2, 100))
-        self.screen.blit(title, title_rect)
+        title = self.text_cache.render(self.menu_font, self.question_graph.get_node_title(self.current_node), BLACK)
+        blit_centered(self.screen, title, layout.menu_title)
         
         # Draw back button 
-        back_width, back_height = 100, 40
-        back_x = 20
-        back_y = 20
-            
-        self.back_button = pygame.Rect(back_x, back_y, back_width, back_height)
-        mouse_pos = pygame.mouse.get_pos()
-        back_color = LIGHT_BLUE if self.back_button.collidepoint(mouse_pos) else GRAY
-        pygame.draw.rect(self.screen, back_color, self.back_button)
-        pygame.draw.rect(self.screen, BLACK, self.back_button, 2)
-            
-        back_text = self.button_font.render("Back", True, BLACK)
-        back_text_rect = back_text.get_rect(center=self.back_button.center)
-        self.screen.blit(back_text, back_text_rect)
+        self.back_button = layout.menu_back_button
+        self.draw_button(self.back_button, "Back")
         
         # Draw menu buttons for children
         children = self.question_graph.get_children(self.current_node)
-        button_width, button_height = 800, 80
-        start_y = 180  
-    
-        for i, child in enumerate(children):
-            button_x = self.screen_width // 2 - button_width // 2
-            button_y = start_y + i * (button_height + 20)
-            
-            button_rect = pygame.Rect(button_x, button_y, button_width, button_height)
-            mouse_pos = pygame.mouse.get_pos()
-            button_color = LIGHT_BLUE if button_rect.collidepoint(mouse_pos) else GRAY
-            
-            pygame.draw.rect(self.screen, button_color, button_rect)
-            pygame.draw.rect(self.screen, BLACK, button_rect, 2)
-            
-            button_text = self.button_font.render(self.question_graph.get_node_title(child), True, BLACK)
-            button_text_rect = button_text.get_rect(center=button_rect.center)
-            self.screen.blit(button_text, button_text_rect)
-            
-            self.menu_buttons.append((child, button_rect))
-        
-        pygame.display.flip()
+        self.menu_buttons = list(zip(children, layout.menu_buttons(len(children))))
+        for child, button_rect in self.menu_buttons:
+            self.draw_button(button_rect, self.question_graph.get_node_title(child))
+
+        self.search_drawn = self.question_index is not None
+        if self.search_drawn:
+            self.draw_button(layout.menu_search_button, "Search")
+
+    def draw_search(self):
+        """Search screen: a query box, how many questions match and a Play button"""
+        self.screen.fill(WHITE)
+        layout = self.layout
+
+        title = self.text_cache.render(self.menu_font, "Search questions", BLACK)
+        blit_centered(self.screen, title, layout.search_title)
+        self.back_button = layout.menu_back_button
+        self.draw_button(self.back_button, "Back")
+
+        pygame.draw.rect(self.screen, BLACK, layout.search_box, 2)
+        box = layout.search_box
+        query = self.text_cache.render(self.question_font, self.search_query + "|", BLACK)
+        # Keep the end of a long query visible
+        self.screen.blit(query, (box.x + 10, box.centery - query.get_height() // 2),
+                         pygame.Rect(max(0, query.get_width() - (box.width - 20)), 0, box.width - 20, query.get_height()))
+        hint = self.text_cache.render(self.answer_font, "Words, prefix*, #tag, then e.g. ', 15 random'", DARK_GRAY)
+        self.screen.blit(hint, layout.search_hint)
+
+        count = len(self.search_ids)
+        status = f"{count} question{'s' if count != 1 else ''} match" if self.search_query.strip() else "Type to search"
+        blit_centered(self.screen, self.text_cache.render(self.subtitle_font, status, BLACK), layout.search_status)
+        if count:
+            self.draw_button(layout.search_play_button, "Play")
+
+    def set_search_query(self, query):
+        self.search_query = query
+        self.search_ids = self.question_index.query(query) if query.strip() else []
+
+    def play_search_results(self):
+        """Start a game with the current search results as the question set"""
+        if not self.search_ids:
+            return
+        self.start_set(f"search:{self.search_query.strip()}", self.search_ids)
+        self.searching = False
+
+    def start_set(self, question_set, question_ids):
+        """Start a game on the bank indices `question_ids`, in the order the scheduler picks"""
+        bank = self.question_graph.all_questions
+        # Ingesting can shorten a bank (duplicates are dropped) below the ids of a stale graph or index
+        question_ids = [i for i in question_ids if i < len(bank)]
+        if not question_ids:
+            return
+        if self.scheduler:
+            question_ids = self.scheduler.plan(question_ids)
+        self.start_audio()
+        self.start(QuestionSelection(bank, question_ids), question_set, question_ids)
+        self.in_menu = False
+
+    def handle_search_click(self, pos):
+        if self.back_button and self.back_button.collidepoint(pos):
+            self.searching = False
+        elif self.search_ids and self.layout.search_play_button.collidepoint(pos):
+            self.play_search_results()
+
+    def handle_search_key(self, event):
+        """Editing keys on the search screen; typed text arrives as TEXTINPUT events"""
+        if event.key == pygame.K_BACKSPACE:
+            self.set_search_query(self.search_query[:-1])
+        elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            self.play_search_results()
+        elif event.key == pygame.K_ESCAPE:
+            self.searching = False
 
     def handle_menu_click(self, pos):
         """Handle clicks on the menu screen"""
+        if self.question_index and self.layout.menu_search_button.collidepoint(pos):
+            self.searching = True
+            self.set_search_query(self.search_query)
+            return
+
         # Check menu buttons first
         for node_id, button in self.menu_buttons:
             if button.collidepoint(pos):
-                if node_id not in self.question_graph.graph['nodes']:
-                    continue  # Skip invalid nodes
-                
-                node = self.question_graph.graph['nodes'][node_id]
-                if node['type'] == 'question_set':
+                if self.question_graph.is_question_set(node_id):
                     # Start the game with these questions
-                    self.questions = self.question_graph.get_questions(node_id)
-                    if self.questions:  # Only proceed if we got questions
-                        self.reset_game_state()
-                        self.in_menu = False
+                    question_ids = self.question_graph.question_ids(node_id)
+                    if question_ids:  # Only proceed if we got questions
+                        self.start_set(node_id, question_ids)
                         return
                 else:
                     # Navigate to next menu
                     self.previous_nodes.append(self.current_node)
                     self.current_node = node_id
-                    self.draw_menu()
                     return
         
         # Then check back button
         if hasattr(self, 'back_button') and self.back_button and self.back_button.collidepoint(pos):
-            if self.current_node == 'root':
+            if self.current_node == self.question_graph.root:
                 # If at root, go back to welcome screen
                 self.show_welcome = True
             elif self.previous_nodes:
                 # Otherwise navigate back in the menu hierarchy
                 self.current_node = self.previous_nodes.pop()
-                self.draw_menu()
 
     def handle_click(self, pos):
         if self.game_over and self.play_again_button and self.play_again_button.collidepoint(pos):
-            self.current_node = 'root'
+            self.current_node = self.question_graph.root
             self.previous_nodes = []
             self.in_menu = True
             self.game_over = False
@@ -491,30 +451,22 @@ class BeatTheBombGame:
             
         if self.paused:
             if self.resume_button and self.resume_button.collidepoint(pos):
-                self.paused = False
-                bomb_game.set_paused(0)
-                self.paused_duration += pygame.time.get_ticks() - self.pause_start_time
+                self.resume()
                 return
             elif self.pause_reset_button and self.pause_reset_button.collidepoint(pos):
-                 if self.questions:
-                   self.reset_game_state()
-                   bomb_game.init_game(len(self.questions))
-                   self.paused = False
-                   bomb_game.set_paused(0)
-                 return
+                if self.questions:
+                    self.reset_game_state()
+                return
             return
             
         if self.pause_button and self.pause_button.collidepoint(pos) and not self.game_over:
-            self.paused = True
-            bomb_game.set_paused(1)
-            self.pause_start_time = pygame.time.get_ticks()
+            self.pause()
             return
             
         if self.reset_button and self.reset_button.collidepoint(pos):
-           if self.questions:  # Only reset if we have questions loaded
-             self.reset_game_state()
-             bomb_game.init_game(len(self.questions))  # Reinitialize with same questions
-           return
+            if self.questions:  # Only reset if we have questions loaded
+                self.reset_game_state()
+            return
             
         if hasattr(self, 'back_button') and self.back_button and self.back_button.collidepoint(pos):
             if self.previous_nodes:
@@ -525,96 +477,227 @@ class BeatTheBombGame:
         if self.show_feedback or self.game_over or self.paused or self.in_menu:
             return
             
-        for i in range(4):
-            area = pygame.Rect(50, 300 + i * 40, self.screen_width - 100, 30)
-            if area.collidepoint(pos):
-                self.selected_answer = i
-                self.submit_answer()
-                break
+        _, rows = self.question_boxes()
+        index = self.layout.answer_at(rows, pos)
+        if index >= 0:
+            self.answer(index)
 
     def submit_answer(self):
-        if self.selected_answer == -1 or self.game_over or self.show_feedback or self.paused or self.in_menu:
+        if self.in_menu:
             return
-            
-        question = self.questions[self.current_question]
-        is_correct = question["answers"][self.selected_answer]["correct"]
-        self.show_correct_answer = not is_correct
-        
-        # Update bomb fuse based on correctness
-        bomb_game.answer_question(1 if is_correct else 0)
-        
-        if is_correct:
-            self.score += 10
-            
-        self.show_feedback = True
-        self.feedback_time = pygame.time.get_ticks()
+        super().submit_answer()
+        if self.show_feedback and self.current_question + 1 < len(self.questions):
+            self.prefetch = self.prefetch_steps(self.current_question + 1)
+
+    def prefetch_steps(self, number):
+        """Lay out and rasterize question `number`, one piece per step.
+
+        Stepped once per frame during the answer feedback delay, so when
+        the game advances the new question is drawn from cached boxes and
+        surfaces only. Answers are rendered in the unselected color, which
+        is how a new question first appears.
+        """
+        question_block, rows = self.question_boxes(number)
+        yield
+        for line in question_block.lines:
+            self.text_cache.render(self.question_font, line, BLACK)
+            yield
+        for row in rows:
+            for line in row.block.lines:
+                self.text_cache.render(self.answer_font, line, BLACK)
+                yield
+
+    def prefetch_step(self):
+        if self.prefetch is not None and next(self.prefetch, StopIteration) is StopIteration:
+            self.prefetch = None
 
     def update(self):
-        if self.in_menu or self.game_over:
+        if self.in_menu:
             return
-            
-        current_time = pygame.time.get_ticks() / 1000.0  # Current time in seconds
-        
-        # Calculate time accounting for pauses
-        if self.paused:
-            current_time = (self.pause_start_time - self.paused_duration) / 1000.0
+        super().update()
+
+    def on_game_over(self):
+        if not self.won_game:
+            self.sounds.play('explosion', event=self.games_started)
+
+    @staticmethod
+    def hovered(button):
+        return bool(button and button.collidepoint(pygame.mouse.get_pos()))
+
+    def redraw_region(self, name, rect, signature, draw):
+        """Repaint one game-screen region if its signature changed since it was last drawn"""
+        if not self.dirty.changed(name, rect, signature):
+            return
+        self.screen.set_clip(rect)
+        self.screen.fill(WHITE, rect)
+        draw()
+        self.screen.set_clip(None)
+
+    def draw_game_screen(self):
+        """Draw the game screen, repainting only the regions that changed"""
+        fuse = self.bomb.get_fuse_percentage()
+        self.frame_count += 1
+
+        mode = 'game_over' if self.game_over else 'paused' if self.paused else 'playing'
+        screen_state = (mode, len(self.previous_nodes) > 0)
+        if mode == 'paused':
+            # Nothing moves under the overlay, only the button highlights
+            screen_state += (self.hovered(self.layout.resume_button), self.hovered(self.layout.pause_reset_button))
+        if screen_state != self.dirty.screen_state:
+            self.dirty.invalidate(screen_state)
+
+        if self.dirty.full:
+            self.screen.fill(WHITE)
+        if mode == 'paused':
+            if self.dirty.full:
+                self.draw_bomb(fuse)
+                self.draw_score()
+                self.draw_timer(fuse)
+                self.draw_question()
+                self.draw_control_buttons()
+                self.draw_pause_menu()
+            return
+
+        layout = self.layout
+        # Sparks flicker every frame while the fuse burns
+        bomb_signature = self.bomb_sprites.signature(fuse, self.frame_count)
+        self.redraw_region('bomb', layout.bomb_region, bomb_signature, lambda: self.draw_bomb(fuse))
+        self.redraw_region('score', layout.score_region, self.score, self.draw_score)
+        self.redraw_region('timer', layout.timer_region, self.timer_seconds(fuse), lambda: self.draw_timer(fuse))
+
+        if mode == 'game_over':
+            signature = (self.won_game, self.score, self.hovered(layout.play_again_button))
+            self.redraw_region('game_over', layout.lower_region, signature, self.draw_game_over)
+            return
+
+        signature = (self.current_question, self.selected_answer, self.show_feedback, self.show_correct_answer)
+        self.redraw_region('question', layout.question_region, signature, self.draw_question)
+        self.redraw_region('controls', layout.controls_region,
+                           (self.hovered(layout.pause_button), self.hovered(layout.reset_button)),
+                           self.draw_control_buttons)
+        self.redraw_region('back', layout.game_back_button, self.hovered(layout.game_back_button),
+                           self.draw_control_buttons)
+
+    def toggle_overlay(self):
+        if self.overlay:
+            self.overlay = None
         else:
-            current_time = (pygame.time.get_ticks() - self.paused_duration) / 1000.0
-
-        # Update timer with current time
-        if bomb_game.update_timer(current_time):
-            self.game_over = True
-            required_score = (len(self.questions) * 10) // 2
-            self.won_game = self.score >= required_score
-            if not self.won_game:
-                self.explosion_sound.play()
-
-            required_score = (len(self.questions) * 10) // 2
-            self.won_game = self.score >= required_score
-            if not self.won_game:
-                self.explosion_sound.play()
-        
-        # Handle question feedback
-        if self.show_feedback and (pygame.time.get_ticks() - self.feedback_time) > 1000:
-            self.show_feedback = False
-            self.show_correct_answer = False
-            self.selected_answer = -1
-            self.current_question += 1
-            
-            if self.current_question >= len(self.questions):
-                required_score = (len(self.questions) * 10) // 2
-                self.won_game = self.score >= required_score
-                self.game_over = True
-                if not self.won_game:
-                    self.explosion_sound.play()
+            self.overlay = ProfilerOverlay(self.fonts.get('Helvetica', 16), BLACK, GRAY)
+        self.dirty.invalidate()
+
+    def draw_overlay(self):
+        rect = self.overlay.draw(self.screen, self.profiler)
+        if rect != self.overlay_rect:
+            # The readout changed size: repaint whatever it used to cover
+            self.overlay_rect = rect
+            self.dirty.invalidate(self.dirty.screen_state)
+        self.dirty.add(rect)
+
+    def dump_trace(self):
+        path = self.trace_path or 'frame_trace.json'
+        count = self.profiler.dump_trace(path)
+        print(f"Wrote {count} trace events to {path}")
+
+    def apply_screen_size(self):
+        """Rebuild the layout for the current window size and repaint everything"""
+        self.screen_width, self.screen_height = self.screen.get_size()
+        self.layout = Layout(self.screen_width, self.screen_height)
+        self.pause_overlay = None
+        self.dirty = DirtyRegions()
+        self.needs_redraw = True
+
+    def toggle_fullscreen(self):
+        self.fullscreen = not self.fullscreen
+        if self.fullscreen:
+            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            self.screen = pygame.display.set_mode((1500, 700), pygame.RESIZABLE)
+        self.apply_screen_size()
+
+    def resize(self, width, height):
+        self.screen = pygame.display.set_mode((width, height), pygame.RESIZABLE)
+        self.apply_screen_size()
+
+    def static_hover_state(self):
+        """Index of the hovered button on the welcome/menu screen, or -1"""
+        mouse_pos = pygame.mouse.get_pos()
+        if self.show_welcome:
+            buttons = [self.welcome_next_button]
+        elif self.searching:
+            buttons = [self.back_button, self.layout.search_play_button]
+        else:
+            search = self.layout.menu_search_button if self.question_index else None
+            buttons = [self.back_button, search] + [rect for _, rect in self.menu_buttons]
+        return next((i for i, button in enumerate(buttons) if button and button.collidepoint(mouse_pos)), -1)
+
+    def run_static_screen(self):
+        """Redraw the welcome/menu/search screen only when something changed, then block for events"""
+        if self.needs_redraw:
+            if self.show_welcome:
+                self.draw_welcome_screen()
+            elif self.searching:
+                self.draw_search()
             else:
-                bomb_game.init_game(len(self.questions))
+                self.draw_menu()
+            pygame.display.flip()
+            self.needs_redraw = False
+            self.hover_state = self.static_hover_state()
+            # The game screen must repaint fully after a static screen
+            self.dirty.invalidate()
+
+        # Sleep until an event arrives; the timeout only refreshes hover highlighting
+        events = [pygame.event.wait(self.idle_refresh_ms)] + pygame.event.get()
+        for event in events:
+            if event.type == pygame.QUIT:
+                return False
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if self.show_welcome:
+                    self.handle_welcome_click(event.pos)
+                elif self.searching:
+                    self.handle_search_click(event.pos)
+                else:
+                    self.handle_menu_click(event.pos)
+                self.needs_redraw = True
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F11:
+                self.toggle_fullscreen()
+                self.needs_redraw = True
+            elif event.type == pygame.KEYDOWN and self.searching:
+                self.handle_search_key(event)
+                self.needs_redraw = True
+            elif event.type == pygame.TEXTINPUT and self.searching:
+                self.set_search_query(self.search_query + event.text)
+                self.needs_redraw = True
+            elif event.type == pygame.VIDEORESIZE:
+                self.resize(event.w, event.h)
+                self.needs_redraw = True
+            elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                self.needs_redraw = True
+
+        if not self.needs_redraw and self.static_hover_state() != self.hover_state:
+            self.needs_redraw = True
+        # The Search button appears when the index is ready
+        if not (self.show_welcome or self.searching) and (self.question_index is not None) != self.search_drawn:
+            self.needs_redraw = True
+        return True
 
     def run(self):
         running = True
+        profiler = self.profiler
+        text_renders = self.text_cache.misses
         
         while running:
-            # Show welcome screen first if needed
-            if self.show_welcome:
-                self.draw_welcome_screen()
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        running = False
-                    elif event.type == pygame.MOUSEBUTTONDOWN:
-                        self.handle_welcome_click(event.pos)
-                pygame.display.flip()
+            # Welcome screen and menus are static: wait for events instead of spinning
+            if self.show_welcome or self.in_menu:
+                running = self.run_static_screen()
+                # Time spent waiting on a static screen is not a frame
+                profiler.restart_frame()
                 continue
 
-            if self.in_menu:
-                self.draw_menu()
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        running = False
-                    elif event.type == pygame.MOUSEBUTTONDOWN:
-                        self.handle_menu_click(event.pos)
-                continue
-                
-            self.screen.fill(WHITE)
+            # Leaving the game screen must repaint whichever static screen comes next
+            self.needs_redraw = True
+            profiler.count('text_renders', self.text_cache.misses - text_renders)
+            text_renders = self.text_cache.misses
+            profiler.begin_frame()
             
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
@@ -624,58 +707,63 @@ class BeatTheBombGame:
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_p:  # Pause with P key
                         if not self.game_over:
-                            self.paused = not self.paused
-                            bomb_game.set_paused(1 if self.paused else 0)
-                            if self.paused:
-                                self.pause_start_time = pygame.time.get_ticks()
-                            else:
-                                # Adjust the timer to account for pause duration
-                               pause_duration = (pygame.time.get_ticks() - self.pause_start_time) / 1000.0
-                               self.start_time += pause_duration
+                            self.toggle_pause()
                     elif event.key == pygame.K_r:  # Reset with R key
                         if self.questions and not self.in_menu:
-                           self.reset_game_state()
-                           bomb_game.init_game(len(self.questions))
+                            self.reset_game_state()
                     elif event.key == pygame.K_F11:
-                        self.fullscreen = not self.fullscreen
-                        if self.fullscreen:
-                            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-                        else:
-                            self.screen = pygame.display.set_mode((1500, 700), pygame.RESIZABLE)
-                        self.screen_width, self.screen_height = self.screen.get_size()
+                        self.toggle_fullscreen()
+                    elif event.key == pygame.K_F3:
+                        self.toggle_overlay()
+                    elif event.key == pygame.K_F4:
+                        self.dump_trace()
                 elif event.type == pygame.VIDEORESIZE:
-                    self.screen = pygame.display.set_mode((event.w, event.h), pygame.RESIZABLE)
-                    self.screen_width, self.screen_height = event.w, event.h
-
-            if not self.paused and not self.in_menu:
-                fuse = bomb_game.get_fuse_percentage()
-                self.draw_bomb(fuse)
-                self.draw_score()
-                self.draw_timer()
-                
-                if not self.game_over:
-                    self.draw_question()
-                    self.draw_control_buttons()
-                else:
-                    self.draw_game_over()
-            elif self.paused:
-                fuse = bomb_game.get_fuse_percentage()
-                self.draw_bomb(fuse)
-                self.draw_score()
-                self.draw_timer()
-                if not self.game_over:
-                    self.draw_question()
-                self.draw_control_buttons()
-                self.draw_pause_menu()
-                
-            pygame.display.flip()
-            self.clock.tick(60)
+                    self.resize(event.w, event.h)
+                elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                    self.dirty.invalidate()
+            profiler.mark('events')
+
+            if not self.in_menu:
+                self.draw_game_screen()
+                if self.overlay:
+                    self.draw_overlay()
+                profiler.mark('draw')
+                self.dirty.flush()
+                profiler.mark('flip')
+                self.prefetch_step()
+                profiler.mark('prefetch')
+            self.clock.tick(self.frame_cap)
+            profiler.mark('tick')
             self.update()
-            
+            profiler.mark('update')
+
+        if self.trace_path:
+            self.dump_trace()
+        if self.recorder:
+            self.recorder.close()
+        if self.scheduler:
+            self.scheduler.stats.close()
+        if self.analytics:
+            self.analytics.close()
         pygame.quit()
-        bomb_game.free_game()
 
 
 if __name__ == "__main__":
-    game = BeatTheBombGame()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Beat the Bomb")
+    parser.add_argument("--profile-overlay", action="store_true", help="show FPS and frame times (F3)")
+    parser.add_argument("--trace", metavar="PATH", help="write a Chrome trace of the last frames on exit")
+    parser.add_argument("--session-log", default=DEFAULT_LOG_PATH, help="append played sessions to this replay log")
+    parser.add_argument("--no-record", action="store_true", help="do not record sessions")
+    parser.add_argument("--player", default="player", help="whose answer statistics to use and update")
+    parser.add_argument("--schedule", choices=sorted(SCHEDULES) + ["file"], default="review",
+                        help="question order: spaced review, weakest first, or file order")
+    parser.add_argument("--no-analytics", action="store_true", help="do not record gameplay analytics")
+    args = parser.parse_args()
+
+    game = BeatTheBombGame(profile_overlay=args.profile_overlay, trace_path=args.trace,
+                           session_log=None if args.no_record else args.session_log,
+                           player=args.player, schedule=None if args.schedule == "file" else args.schedule,
+                           analytics_dir=None if args.no_analytics else DEFAULT_ANALYTICS_DIR)
     game.run()
@@ -0,0 +1,154 @@
+import json
+import time
+from array import array
+from collections import deque
+from functools import wraps
+
+
+class FrameProfiler:
+    """Per-frame phase timings kept in fixed-size ring buffers.
+
+    The frame loop calls `mark(phase)` after each phase: the time since the
+    previous mark is charged to that phase. `instrument()` wraps methods so
+    every call is timed as well (calls nest inside phases, so their times
+    overlap the phase totals). The last `capacity` frames are kept for the
+    FPS/percentile overlay; the last `max_events` marks and calls are kept
+    for `dump_trace()`, which writes the Chrome trace event format
+    (chrome://tracing, Perfetto).
+    """
+    def __init__(self, capacity=600, max_events=20000, clock=time.perf_counter):
+        self.capacity = capacity
+        self.clock = clock
+        self.frame_times = array('d', [0.0] * capacity)
+        self.phase_times = {}  # phase -> array of per-frame seconds, same ring slots as frame_times
+        self.counters = {}     # counter -> array of per-frame counts
+        self.frames = 0
+        self.events = deque(maxlen=max_events)  # (name, start, duration)
+        self.current = {}
+        self.current_counts = {}
+        self.frame_start = self.last_mark = clock()
+
+    def begin_frame(self):
+        """Close the previous frame and start timing a new one"""
+        now = self.clock()
+        slot = self.frames % self.capacity
+        self.frame_times[slot] = now - self.frame_start
+        self._store(self.phase_times, self.current, slot)
+        self._store(self.counters, self.current_counts, slot)
+        self.frames += 1
+        self.current = {}
+        self.current_counts = {}
+        self.frame_start = self.last_mark = now
+
+    def restart_frame(self):
+        """Drop the current frame without recording it (idle screens, pauses in the loop)"""
+        self.current = {}
+        self.current_counts = {}
+        self.frame_start = self.last_mark = self.clock()
+
+    def _store(self, rings, values, slot):
+        for name, value in values.items():
+            ring = rings.get(name)
+            if ring is None:
+                ring = rings[name] = array('d', [0.0] * self.capacity)
+            ring[slot] = value
+        for name, ring in rings.items():
+            if name not in values:
+                ring[slot] = 0.0
+
+    def mark(self, phase):
+        """Charge the time since the previous mark to `phase`"""
+        now = self.clock()
+        duration = now - self.last_mark
+        self.current[phase] = self.current.get(phase, 0.0) + duration
+        self.events.append((phase, self.last_mark, duration))
+        self.last_mark = now
+
+    def count(self, counter, amount=1):
+        """Add to a per-frame counter, such as text surfaces rendered"""
+        self.current_counts[counter] = self.current_counts.get(counter, 0) + amount
+
+    def instrument(self, obj, names):
+        """Time every call of the named methods of `obj`"""
+        for name in names:
+            setattr(obj, name, self._timed(name, getattr(obj, name)))
+
+    def _timed(self, name, method):
+        @wraps(method)
+        def timed(*args, **kwargs):
+            start = self.clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                duration = self.clock() - start
+                self.current[name] = self.current.get(name, 0.0) + duration
+                self.events.append((name, start, duration))
+        return timed
+
+    def recent(self, values):
+        """The filled part of a per-frame ring, oldest first"""
+        if self.frames < self.capacity:
+            return values[:self.frames]
+        slot = self.frames % self.capacity
+        return values[slot:] + values[:slot]
+
+    def mean(self, values):
+        """Mean per-frame value of a ring over the recorded frames"""
+        recorded = min(self.frames, self.capacity)
+        return sum(self.recent(values)) / recorded if recorded else 0.0
+
+    def frame_percentile(self, fraction):
+        """Frame time percentile in seconds over the recorded frames"""
+        times = sorted(self.recent(self.frame_times))
+        if not times:
+            return 0.0
+        return times[min(int(fraction * len(times)), len(times) - 1)]
+
+    def fps(self):
+        times = self.recent(self.frame_times)
+        total = sum(times)
+        return len(times) / total if total else 0.0
+
+    def summary(self):
+        """Mean per-frame cost of every phase and counter over the recorded frames"""
+        return {
+            "frames": self.frames,
+            "fps": self.fps(),
+            "p50_ms": self.frame_percentile(0.5) * 1000,
+            "p99_ms": self.frame_percentile(0.99) * 1000,
+            "phases_ms": {phase: self.mean(times) * 1000 for phase, times in self.phase_times.items()},
+            "counters": {name: self.mean(values) for name, values in self.counters.items()},
+        }
+
+    def dump_trace(self, path):
+        """Write the recorded marks and calls as a Chrome trace JSON file"""
+        events = [{"name": name, "ph": "X", "ts": start * 1e6, "dur": duration * 1e6, "pid": 0, "tid": 0}
+                  for name, start, duration in self.events]
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": self.summary()}, f)
+        return len(events)
+
+
+class ProfilerOverlay:
+    """Small FPS/frame-time readout, re-rendered only a few times per second"""
+    def __init__(self, font, color, background, refresh_frames=30):
+        self.font = font
+        self.color = color
+        self.background = background
+        self.refresh_frames = refresh_frames
+        self.surface = None
+        self.rendered_at = -refresh_frames
+
+    def draw(self, screen, profiler, counter="text_renders"):
+        """Draw in the bottom-left corner; returns the rect that was painted"""
+        if self.surface is None or profiler.frames - self.rendered_at >= self.refresh_frames:
+            renders = profiler.counters.get(counter)
+            per_frame = profiler.mean(renders) if renders else 0.0
+            text = (f"{profiler.fps():5.1f} fps  p50 {profiler.frame_percentile(0.5) * 1000:5.1f} ms  "
+                    f"p99 {profiler.frame_percentile(0.99) * 1000:5.1f} ms  text renders/frame {per_frame:.2f}")
+            self.surface = self.font.render(text, True, self.color, self.background)
+            self.rendered_at = profiler.frames
+
+        rect = self.surface.get_rect(bottomleft=(0, screen.get_height()))
+        screen.blit(self.surface, rect)
+        return rect
@@ -0,0 +1,93 @@
+import json
+from collections import OrderedDict
+
+
+class QuestionGraph:
+    """Menu tree of question categories, declared in a data file.
+
+    Nodes with a "questions" [start, stop] range are question sets, the
+    others are choice menus listing their "children". The node index is
+    built once, so lookups are O(1); a set's questions are sliced from the
+    bank only when it is opened and the least recently visited sets are
+    dropped once more than `max_cached_sets` are held.
+    """
+    def __init__(self, all_questions, spec, max_cached_sets=4):
+        self.all_questions = all_questions
+        self.root = spec.get('root', 'root')
+        self.max_cached_sets = max_cached_sets
+        self.cached_sets = OrderedDict()
+
+        # node_id -> (type, title, children, question range)
+        self.nodes = {}
+        for node_id, node in spec['nodes'].items():
+            if 'questions' in node:
+                start, stop = node['questions']
+                self.nodes[node_id] = ('question_set', node['title'], (), (start, stop))
+            else:
+                self.nodes[node_id] = ('choice', node['title'], tuple(node.get('children', ())), None)
+
+        for node_id, (_, _, children, _) in self.nodes.items():
+            missing = [child for child in children if child not in self.nodes]
+            if missing:
+                raise ValueError(f"Node {node_id!r} has unknown children {missing}")
+        if self.root not in self.nodes:
+            raise ValueError(f"Root node {self.root!r} is not declared")
+
+    @classmethod
+    def from_file(cls, all_questions, path, **kwargs):
+        with open(path, encoding='utf-8') as f:
+            return cls(all_questions, json.load(f), **kwargs)
+
+    def get_questions(self, node_id):
+        """Get questions for a chosen node"""
+        node = self.nodes.get(node_id)
+        if node is None or node[0] != 'question_set':
+            return []
+
+        questions = self.cached_sets.get(node_id)
+        if questions is None:
+            start, stop = node[3]
+            questions = self.all_questions[start:stop]
+            self.cached_sets[node_id] = questions
+            if len(self.cached_sets) > self.max_cached_sets:
+                self.cached_sets.popitem(last=False)
+        else:
+            self.cached_sets.move_to_end(node_id)
+        return questions
+
+    def question_ids(self, node_id):
+        """Bank indices of a question set, in play order; like get_questions, cut to the bank"""
+        node = self.nodes.get(node_id)
+        if node is None or node[0] != 'question_set':
+            return range(0)
+        start, stop = node[3]
+        return range(start, min(stop, len(self.all_questions)))
+
+    def get_children(self, node_id):
+        """Get child nodes for navigation"""
+        node = self.nodes.get(node_id)
+        return node[2] if node else ()
+
+    def get_node_title(self, node_id):
+        """Get the title for a node"""
+        node = self.nodes.get(node_id)
+        return node[1] if node else ""
+
+    def is_question_set(self, node_id):
+        node = self.nodes.get(node_id)
+        return node is not None and node[0] == 'question_set'
+
+
+class QuestionSelection:
+    """Questions of a bank in the order of `question_ids`, looked up only when accessed"""
+    def __init__(self, bank, question_ids):
+        self.bank = bank
+        self.question_ids = question_ids
+
+    def __len__(self):
+        return len(self.question_ids)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self.bank[i] for i in self.question_ids[item]]
+        return self.bank[self.question_ids[item]]
@@ -0,0 +1,321 @@
+"""Full-text and tag index over a question bank.
+
+The index is built once and saved next to the bank as one little-endian
+file that is memory-mapped and searched in place:
+
+    header          '<4sHHII'  magic b'BTBX', version, reserved,
+                               question count, key count
+    key offsets     '<I'       key count + 1 offsets into the key data
+    posting offsets '<I'       key count + 1 offsets, in question ids,
+                               into the postings
+    key data                   UTF-8 keys in sorted order
+    postings        '<I'       for every key, the ascending bank indices
+                               of the questions it appears in
+
+Keys are the lowercased words of question and answer texts, plus one
+'#word' key per word of every tag. A question's tags are the ids (such
+as set2_c, one word) and titles of the question graph nodes above it,
+and any "tags" listed with it in the bank.
+
+Queries: words must all match; 'word*' matches every key starting with
+'word'; '#word' filters on tags. A part after a comma such as '15' or
+'15 random' limits the result to that many questions, in bank order or
+at random:  licen*, 15 random   |   #web #programming, 10
+
+Usage: python question_index.py questions.json question_graph.json questions.index [QUERY]
+"""
+import bisect
+import mmap
+import os
+import random
+import re
+import struct
+import sys
+from array import array
+
+MAGIC = b'BTBX'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+OFFSET = struct.Struct('<I')
+TAG_PREFIX = '#'
+
+WORD = re.compile(r"\w+")
+LIMIT = re.compile(r"^(\d+)(\s+random)?$")
+
+
+def words(text):
+    return WORD.findall(text.casefold())
+
+
+def question_tags(graph):
+    """Bank index -> list of tag strings, from the graph nodes above each question set"""
+    parents = {}
+    for node_id in graph.nodes:
+        for child in graph.get_children(node_id):
+            parents.setdefault(child, node_id)
+
+    tags = {}
+    for node_id in graph.nodes:
+        if not graph.is_question_set(node_id):
+            continue
+        labels = []
+        node = node_id
+        while node is not None:
+            labels += [node, graph.get_node_title(node)]
+            node = parents.get(node)
+        for i in graph.question_ids(node_id):
+            tags.setdefault(i, []).extend(labels)
+    return tags
+
+
+def encode_index(questions, tags=None):
+    """The index of `questions` (a list or QuestionPack) as bytes"""
+    tags = tags or {}
+    postings = {}
+
+    def post(key, i):
+        ids = postings.get(key)
+        if ids is None:
+            postings[key] = array('I', [i])
+        elif ids[-1] != i:
+            ids.append(i)
+
+    for i, question in enumerate(questions):
+        text = " ".join([question["question"]] + [ans["text"] for ans in question["answers"]])
+        for word in words(text):
+            post(word, i)
+        for tag in list(tags.get(i, ())) + list(question.get("tags", ())):
+            for word in words(tag):
+                post(TAG_PREFIX + word, i)
+
+    keys = sorted(postings)
+    key_offsets = array('I', [0])
+    posting_offsets = array('I', [0])
+    key_data = bytearray()
+    posting_data = array('I')
+    for key in keys:
+        key_data += key.encode('utf-8')
+        key_offsets.append(len(key_data))
+        posting_data.extend(postings[key])
+        posting_offsets.append(len(posting_data))
+
+    if sys.byteorder != 'little':
+        for table in (key_offsets, posting_offsets, posting_data):
+            table.byteswap()
+    return b"".join([HEADER.pack(MAGIC, VERSION, 0, len(questions), len(keys)),
+                     key_offsets.tobytes(), posting_offsets.tobytes(), bytes(key_data), posting_data.tobytes()])
+
+
+def write_index(data, path):
+    """Save an encoded index to `path`, replacing it atomically"""
+    partial = path + '.partial'
+    with open(partial, 'wb') as f:
+        f.write(data)
+    os.replace(partial, path)
+
+
+def build_index(questions, path, tags=None):
+    write_index(encode_index(questions, tags), path)
+
+
+class _Keys:
+    """The sorted key table as a read-only sequence, for bisect"""
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return self.index.key_count
+
+    def __getitem__(self, i):
+        return self.index.key(i)
+
+
+class QuestionIndex:
+    """Search a built index, held in memory or memory-mapped from a file"""
+    def __init__(self, data, file=None):
+        self._data = data
+        self._file = file
+        if len(data) < HEADER.size or HEADER.unpack_from(data, 0)[:2] != (MAGIC, VERSION):
+            self.close()
+            raise ValueError(f"not a version {VERSION} question index")
+        _, _, _, self.question_count, self.key_count = HEADER.unpack_from(data, 0)
+
+        self._key_offsets = HEADER.size
+        self._posting_offsets = self._key_offsets + (self.key_count + 1) * OFFSET.size
+        self._keys_start = self._posting_offsets + (self.key_count + 1) * OFFSET.size
+        if len(data) < self._keys_start:
+            self.close()
+            raise ValueError("truncated question index")
+        key_bytes, = OFFSET.unpack_from(data, self._posting_offsets - OFFSET.size)
+        posting_count, = OFFSET.unpack_from(data, self._keys_start - OFFSET.size)
+        self._postings_start = self._keys_start + key_bytes
+        if len(data) != self._postings_start + posting_count * OFFSET.size:
+            self.close()
+            raise ValueError("truncated question index")
+        self._keys = _Keys(self)
+
+    @classmethod
+    def open(cls, path):
+        f = open(path, 'rb')
+        try:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            f.close()
+            raise ValueError(f"{path} is an empty question index") from None
+        return cls(data, f)
+
+    def key(self, i):
+        start, end = struct.unpack_from('<II', self._data, self._key_offsets + i * OFFSET.size)
+        return self._data[self._keys_start + start:self._keys_start + end].decode('utf-8')
+
+    def postings(self, first, last=None):
+        """Ascending question ids of key number `first`; with `last`, the ids of keys first..last-1 in key order"""
+        if last is None:
+            last = first + 1
+        start, = OFFSET.unpack_from(self._data, self._posting_offsets + first * OFFSET.size)
+        end, = OFFSET.unpack_from(self._data, self._posting_offsets + last * OFFSET.size)
+        ids = array('I', self._data[self._postings_start + start * 4:self._postings_start + end * 4])
+        if sys.byteorder != 'little':
+            ids.byteswap()
+        return ids
+
+    def lookup(self, term):
+        """Question ids containing `term`; a trailing '*' matches it as a prefix"""
+        if term.endswith('*'):
+            prefix = term[:-1]
+            first = bisect.bisect_left(self._keys, prefix)
+            last = bisect.bisect_left(self._keys, prefix + '\U0010ffff')
+            if last - first <= 1:
+                return self.postings(first, last)
+            # Matching keys are adjacent, and so are their postings
+            return array('I', sorted(set(self.postings(first, last))))
+        i = bisect.bisect_left(self._keys, term)
+        if i < self.key_count and self.key(i) == term:
+            return self.postings(i)
+        return array('I')
+
+    def search(self, text="", tags=(), limit=None, shuffle=False, rng=random):
+        """Bank indices of the questions matching every word of `text` and every tag.
+
+        Without words or tags every question matches. Results are in bank
+        order, or a random sample of `limit` of them with `shuffle`.
+        """
+        terms = [word + '*' if part.endswith('*') else word
+                 for part in text.split() for word in words(part)]
+        terms += [TAG_PREFIX + word for tag in tags for word in words(tag)]
+
+        if not terms:
+            ids = range(self.question_count)
+        else:
+            lists = sorted((self.lookup(term) for term in terms), key=len)
+            ids = lists[0]
+            for other in lists[1:]:
+                if not ids:
+                    break
+                if len(other) == self.question_count:
+                    continue  # In every question: filters nothing
+                if len(ids) * 16 < len(other):
+                    # Few candidates left: binary search the long list instead of scanning it
+                    ids = [i for i in ids if contains(other, i)]
+                else:
+                    ids = sorted(set(ids).intersection(other))
+
+        if limit is not None and shuffle:
+            return rng.sample(ids, min(limit, len(ids)))
+        return list(ids[:limit] if limit is not None else ids)
+
+    def query(self, query, rng=random):
+        """Run a query string (see the module docstring)"""
+        return self.search(*parse_query(query), rng=rng)
+
+    def close(self):
+        if self._file is not None:
+            self._data.close()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def contains(ids, i):
+    """Membership test on an ascending array"""
+    j = bisect.bisect_left(ids, i)
+    return j < len(ids) and ids[j] == i
+
+
+def parse_query(query):
+    """(text, tags, limit, shuffle) of a query string; only parts after a comma can be limits"""
+    text, tags, limit, shuffle = [], [], None, False
+    for number, part in enumerate(query.split(',')):
+        match = LIMIT.match(part.strip().casefold()) if number else None
+        if match:
+            limit, shuffle = int(match.group(1)), bool(match.group(2))
+            continue
+        for token in part.split():
+            if token.startswith(TAG_PREFIX):
+                tags.append(token[1:])
+            else:
+                text.append(token)
+    return " ".join(text), tags, limit, shuffle
+
+
+def load_question_index(questions, path, sources=(), tags=None):
+    """Open the index at `path` if it is newer than every file in `sources`, else rebuild it.
+
+    If the index cannot be written (a read-only install) it is kept in
+    memory for this run.
+    """
+    if os.path.exists(path):
+        built = os.path.getmtime(path)
+        if all(built >= os.path.getmtime(source) for source in sources if os.path.exists(source)):
+            try:
+                index = QuestionIndex.open(path)
+            except (ValueError, struct.error):
+                pass  # Corrupt or an older version: rebuild
+            else:
+                if index.question_count == len(questions):
+                    return index
+                index.close()
+
+    data = encode_index(questions, tags)
+    try:
+        write_index(data, path)
+    except OSError:
+        return QuestionIndex(data)
+    return QuestionIndex.open(path)
+
+
+def main(argv):
+    import time
+
+    from question_graph import QuestionGraph
+    from question_pack import load_question_bank
+
+    if len(argv) not in (3, 4):
+        print(__doc__.strip().splitlines()[-1])
+        return 2
+    bank_path, graph_path, index_path = argv[:3]
+    bank = load_question_bank(bank_path, os.path.splitext(bank_path)[0] + '.pack')
+    graph = QuestionGraph.from_file(bank, graph_path)
+
+    start = time.perf_counter()
+    build_index(bank, index_path, question_tags(graph))
+    print(f"Indexed {len(bank)} questions in {time.perf_counter() - start:.2f}s -> {index_path}")
+
+    if len(argv) == 4:
+        with QuestionIndex.open(index_path) as index:
+            start = time.perf_counter()
+            ids = index.query(argv[3])
+            elapsed = (time.perf_counter() - start) * 1000
+            print(f"{len(ids)} questions match in {elapsed:.2f} ms")
+            for i in ids[:10]:
+                print(f"  {i}: {bank[i]['question']}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,187 @@
+"""Compiled question packs.
+
+A pack is the JSON question bank flattened into one little-endian file
+that can be memory-mapped and decoded one question at a time:
+
+    header          '<4sHHII'  magic b'BTBQ', version, reserved,
+                               question count, string count
+    question index  '<IBB2x'   per question: id of its first string,
+                               answer count, index of the correct answer
+                               (255 if none)
+    string offsets  '<I'       string count + 1 offsets into the data
+    string data                UTF-8; each question's text is followed
+                               by the texts of its answers
+
+Usage: python question_pack.py questions.json questions.pack
+"""
+import json
+import mmap
+import os
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+MAGIC = b'BTBQ'
+VERSION = 1
+HEADER = struct.Struct('<4sHHII')
+QUESTION = struct.Struct('<IBB2x')
+OFFSET = struct.Struct('<I')
+NO_CORRECT_ANSWER = 255
+
+
+class PackWriter:
+    """Write a pack one question at a time.
+
+    String data is spooled to a temporary file next to `path`; only the
+    fixed-size index and string offsets are kept in memory until close()
+    writes the header and tables and appends the spooled strings. The pack
+    replaces `path` atomically, so readers never see a partial file.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.index = bytearray()
+        self.offsets = array('I', [0])
+        self.count = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        self.strings = tempfile.TemporaryFile(dir=directory)
+
+    def add(self, question):
+        """Append one question dict (questions.json format)"""
+        answers = question["answers"]
+        correct = next((i for i, ans in enumerate(answers) if ans["correct"]), NO_CORRECT_ANSWER)
+        self.index += QUESTION.pack(len(self.offsets) - 1, len(answers), correct)
+        for text in [question["question"]] + [ans["text"] for ans in answers]:
+            data = text.encode('utf-8')
+            self.strings.write(data)
+            self.offsets.append(self.offsets[-1] + len(data))
+        self.count += 1
+
+    def close(self):
+        partial = self.path + '.partial'
+        if sys.byteorder != 'little':
+            self.offsets.byteswap()
+        with open(partial, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, 0, self.count, len(self.offsets) - 1))
+            f.write(self.index)
+            f.write(self.offsets.tobytes())
+            self.strings.seek(0)
+            shutil.copyfileobj(self.strings, f)
+        self.strings.close()
+        os.replace(partial, self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        if exc_type is None:
+            self.close()
+        else:
+            self.strings.close()
+
+
+def compile_pack(questions, path):
+    """Write a list of question dicts (questions.json format) to a pack file"""
+    with PackWriter(path) as writer:
+        for question in questions:
+            writer.add(question)
+
+
+class QuestionPack:
+    """Read-only, memory-mapped question pack.
+
+    Behaves like the list loaded from questions.json (len, indexing and
+    slicing), but a question is only decoded when it is accessed.
+    """
+    def __init__(self, path):
+        self._file = open(path, 'rb')
+        try:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{path} is an empty question pack") from None
+
+        if len(self._data) < HEADER.size or HEADER.unpack_from(self._data, 0)[:2] != (MAGIC, VERSION):
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} question pack")
+        _, _, _, self._count, string_count = HEADER.unpack_from(self._data, 0)
+
+        self._index_start = HEADER.size
+        self._offsets_start = self._index_start + self._count * QUESTION.size
+        self._strings_start = self._offsets_start + (string_count + 1) * OFFSET.size
+        if len(self._data) < self._strings_start:
+            self.close()
+            raise ValueError(f"{path} is a truncated question pack")
+        string_bytes, = OFFSET.unpack_from(self._data, self._strings_start - OFFSET.size)
+        if len(self._data) != self._strings_start + string_bytes:
+            self.close()
+            raise ValueError(f"{path} is a truncated question pack")
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self._decode(i) for i in range(*item.indices(self._count))]
+        if item < 0:
+            item += self._count
+        if not 0 <= item < self._count:
+            raise IndexError("question index out of range")
+        return self._decode(item)
+
+    def __iter__(self):
+        return (self._decode(i) for i in range(self._count))
+
+    def _string(self, string_id):
+        start, end = struct.unpack_from('<II', self._data, self._offsets_start + string_id * OFFSET.size)
+        return self._data[self._strings_start + start:self._strings_start + end].decode('utf-8')
+
+    def _decode(self, i):
+        first, answer_count, correct = QUESTION.unpack_from(self._data, self._index_start + i * QUESTION.size)
+        return {
+            "question": self._string(first),
+            "answers": [{"text": self._string(first + 1 + a), "correct": a == correct}
+                        for a in range(answer_count)]
+        }
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_question_bank(json_path, pack_path):
+    """Open the compiled pack if it is up to date and intact, else parse the JSON bank"""
+    if os.path.exists(pack_path):
+        if not os.path.exists(json_path) or os.path.getmtime(pack_path) >= os.path.getmtime(json_path):
+            try:
+                return QuestionPack(pack_path)
+            except ValueError:
+                if not os.path.exists(json_path):
+                    raise
+
+    with open(json_path) as f:
+        return json.load(f)
+
+
+def main(argv):
+    if len(argv) != 2:
+        print(__doc__.strip().splitlines()[-1])
+        return 1
+
+    json_path, pack_path = argv
+    with open(json_path) as f:
+        questions = json.load(f)
+    compile_pack(questions, pack_path)
+    print(f"{len(questions)} questions -> {pack_path} ({os.path.getsize(pack_path)} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
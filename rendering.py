@@ -0,0 +1,369 @@
+import random
+from collections import OrderedDict, namedtuple
+
+import pygame
+
+
+class FontRegistry:
+    """Fonts shared by family and size.
+
+    Each family is resolved to a file with pygame.font.match_font once
+    (SysFont repeats the lookup on every call); fonts of the same family
+    and size are one Font object, so they also share TextCache entries.
+    """
+    def __init__(self):
+        self.paths = {}
+        self.fonts = {}
+
+    def get(self, family, size):
+        key = (family, size)
+        font = self.fonts.get(key)
+        if font is None:
+            if family not in self.paths:
+                # None falls back to pygame's default font, as SysFont does
+                self.paths[family] = pygame.font.match_font(family)
+            font = self.fonts[key] = pygame.font.Font(self.paths[family], size)
+        return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color).
+
+    Static strings are rasterized once; changing ones (score, timer) only
+    when their value changes. Entries are evicted least recently used
+    first once the pixel memory of the cached surfaces exceeds max_bytes.
+    """
+    def __init__(self, max_bytes=8 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.used_bytes = 0
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, color, antialias)
+        surface = self.entries.get(key)
+        if surface is not None:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.entries[key] = surface
+        self.used_bytes += self.surface_bytes(surface)
+
+        # Never evict the surface we are about to return
+        while self.used_bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.used_bytes -= self.surface_bytes(evicted)
+        return surface
+
+    def clear(self):
+        self.entries.clear()
+        self.used_bytes = 0
+
+    @staticmethod
+    def surface_bytes(surface):
+        return surface.get_pitch() * surface.get_height()
+
+
+class DirtyRegions:
+    """Retained-mode bookkeeping for the game screen.
+
+    Each named region remembers the signature it was last drawn with; only
+    regions whose signature changed are repainted and pushed with
+    pygame.display.update(). Any change to `screen_state` (mode, size,
+    pause overlay) forces one full repaint and flip.
+    """
+    def __init__(self):
+        self.signatures = {}
+        self.rects = []
+        self.full = True
+        self.screen_state = None
+
+    def invalidate(self, screen_state=None):
+        self.signatures.clear()
+        self.rects = []
+        self.full = True
+        self.screen_state = screen_state
+
+    def changed(self, name, rect, signature):
+        """True if region `name` must be repainted; queues its rect for the next flush"""
+        if not self.full and self.signatures.get(name) == signature:
+            return False
+        self.signatures[name] = signature
+        self.add(rect)
+        return True
+
+    def add(self, rect):
+        """Queue a rect painted outside the named regions (overlays)"""
+        if not self.full:
+            self.rects.append(rect)
+
+    def flush(self):
+        if self.full:
+            pygame.display.flip()
+        elif self.rects:
+            pygame.display.update(self.rects)
+        self.rects = []
+        self.full = False
+
+
+def blit_centered(screen, surface, center):
+    """Blit `surface` centered on `center` without allocating a Rect"""
+    screen.blit(surface, (center[0] - surface.get_width() // 2, center[1] - surface.get_height() // 2))
+
+
+# A wrapped paragraph: its lines, the pixel distance between their tops and its total height
+TextBlock = namedtuple('TextBlock', 'lines line_height height')
+
+# One answer row: background rect, checkbox rect, top-left of its text and the wrapped text
+AnswerRow = namedtuple('AnswerRow', 'rect checkbox text_pos block')
+
+
+def wrap_text(font, text, width):
+    """Break `text` into lines no wider than `width` pixels.
+
+    Lines break between words; a word wider than `width` on its own is
+    broken between characters.
+    """
+    lines = []
+    line = ""
+    for word in text.split():
+        candidate = f"{line} {word}" if line else word
+        if font.size(candidate)[0] <= width:
+            line = candidate
+            continue
+        if line:
+            lines.append(line)
+        while font.size(word)[0] > width and len(word) > 1:
+            # Longest prefix that fits, at least one character
+            cut = len(word) - 1
+            while cut > 1 and font.size(word[:cut])[0] > width:
+                cut -= 1
+            lines.append(word[:cut])
+            word = word[cut:]
+        line = word
+    if line or not lines:
+        lines.append(line)
+    return lines
+
+
+class TextLayout:
+    """Wrapped text blocks cached by (text, font, width).
+
+    Measuring and wrapping happen on the first request only; every later
+    frame (and click) reuses the same line boxes. Owned by a Layout, so
+    the cache is dropped exactly when the screen size changes.
+    """
+    def __init__(self):
+        self.blocks = {}
+        self.hits = 0
+        self.misses = 0
+
+    def block(self, font, text, width):
+        key = (text, font, width)
+        block = self.blocks.get(key)
+        if block is not None:
+            self.hits += 1
+            return block
+
+        self.misses += 1
+        lines = wrap_text(font, text, width)
+        line_height = font.get_linesize()
+        block = self.blocks[key] = TextBlock(lines, line_height, line_height * len(lines))
+        return block
+
+    def blit(self, screen, text_cache, font, block, color, pos):
+        """Draw a block with its top-left corner at `pos`"""
+        x, y = pos
+        for line in block.lines:
+            screen.blit(text_cache.render(font, line, color), (x, y))
+            y += block.line_height
+
+
+class Layout:
+    """Every widget rectangle for one screen size, shared by drawing and hit-testing.
+
+    Built on startup and whenever the window is resized or toggled to
+    fullscreen, so frames draw and clicks resolve without creating Rects.
+    Question and answer texts are wrapped to the screen width; answer rows
+    grow with their text and follow the question's last line.
+    """
+    ANSWER_ROWS = 4
+    ANSWER_TOP = 295
+    ANSWER_GAP = 8
+    ANSWER_MIN_HEIGHT = 32
+    ANSWER_PADDING = 5
+    QUESTION_BOXES_KEPT = 2  # the question on screen and the one prefetched after it
+
+    def __init__(self, width, height):
+        self.size = (width, height)
+        cx, cy = width // 2, height // 2
+
+        # Welcome screen
+        self.welcome_title = (cx, cy - 200)
+        self.welcome_lines = (cx - 300, cy - 100)
+        self.welcome_next_button = pygame.Rect(width - 240, height - 90, 200, 50)
+
+        # Menu screen
+        self.menu_title = (cx, 100)
+        self.menu_back_button = pygame.Rect(20, 20, 100, 40)
+        self._menu_buttons = {}
+        self.menu_search_button = pygame.Rect(width - 140, 20, 120, 40)
+
+        # Search screen
+        self.search_title = (cx, 100)
+        self.search_box = pygame.Rect(cx - 400, 180, 800, 60)
+        self.search_hint = (cx - 400, 255)
+        self.search_status = (cx, 340)
+        self.search_play_button = pygame.Rect(cx - 100, 400, 200, 50)
+
+        # Game screen
+        self.bomb_center = (cx, 150)
+        self.score_pos = (50, 50)
+        self.timer_pos = (width - 200, 50)
+        self.question_pos = (50, 250)
+        self.question_width = width - 100
+        self.answer_text_width = width - 90 - 45  # row width minus checkbox column and right margin
+        self.pause_button = pygame.Rect(width - 120, 150, 100, 40)
+        self.reset_button = pygame.Rect(width - 230, 150, 100, 40)
+        self.game_back_button = pygame.Rect(20, 150, 100, 40)
+        self.text = TextLayout()
+        self._question_boxes = OrderedDict()
+
+        # Regions repainted independently on the game screen
+        self.bomb_region = pygame.Rect(cx - 85, 0, 170, 232)
+        self.score_region = pygame.Rect(50, 50, 300, 45)
+        self.timer_region = pygame.Rect(width - 200, 50, 200, 60)
+        self.controls_region = self.reset_button.union(self.pause_button)
+        self.question_region = pygame.Rect(0, 240, width, height - 240)
+        self.lower_region = pygame.Rect(0, self.bomb_region.bottom, width, height - self.bomb_region.bottom)
+
+        # Pause menu and game over
+        self.pause_title = (cx, cy - 100)
+        self.resume_button = pygame.Rect(cx - 100, cy - 20, 200, 50)
+        self.pause_reset_button = pygame.Rect(cx - 100, cy + 50, 200, 50)
+        self.game_over_title = (cx, cy - 100)
+        self.final_score = (cx, cy - 50)
+        self.play_again_button = pygame.Rect(cx - 100, cy + 100, 200, 50)
+
+    def menu_buttons(self, count):
+        """Rects of the first `count` menu buttons, built once per count"""
+        buttons = self._menu_buttons.get(count)
+        if buttons is None:
+            x = self.size[0] // 2 - 400
+            buttons = [pygame.Rect(x, 180 + i * 100, 800, 80) for i in range(count)]
+            self._menu_buttons[count] = buttons
+        return buttons
+
+    def question_boxes(self, question_text, answer_texts, question_font, answer_font):
+        """(question TextBlock, list of AnswerRow) for one question.
+
+        The boxes of the last QUESTION_BOXES_KEPT questions asked for are
+        kept, so drawing and hit-testing the same question share one set of
+        Rects, and a prefetched question is ready when it comes on screen.
+        """
+        key = (question_text, answer_texts, question_font, answer_font)
+        boxes = self._question_boxes.get(key)
+        if boxes is not None:
+            self._question_boxes.move_to_end(key)
+            return boxes
+
+        question = self.text.block(question_font, question_text, self.question_width)
+        top = max(self.ANSWER_TOP, self.question_pos[1] + question.height + 10)
+        rows = []
+        for text in answer_texts[:self.ANSWER_ROWS]:
+            block = self.text.block(answer_font, text, self.answer_text_width)
+            height = max(self.ANSWER_MIN_HEIGHT, block.height + 2 * self.ANSWER_PADDING)
+            rows.append(AnswerRow(pygame.Rect(45, top, self.size[0] - 90, height),
+                                  pygame.Rect(50, top + 10, 20, 20),
+                                  (80, top + self.ANSWER_PADDING),
+                                  block))
+            top += height + self.ANSWER_GAP
+
+        boxes = self._question_boxes[key] = (question, rows)
+        if len(self._question_boxes) > self.QUESTION_BOXES_KEPT:
+            self._question_boxes.popitem(last=False)
+        return boxes
+
+    @staticmethod
+    def answer_at(rows, pos):
+        """Index of the answer row under `pos`, or -1"""
+        for index, row in enumerate(rows):
+            if row.rect.collidepoint(pos):
+                return index
+        return -1
+
+
+class BombSprites:
+    """Pre-rendered bomb pieces so drawing the bomb is three blits.
+
+    The fuse is quantized to `fuse_steps` lengths and the flickering sparks
+    come from a fixed pool of `spark_frames` random frames, all built once.
+    """
+    RADIUS = 80
+    FUSE_LENGTH = 150
+    FUSE_DX = 50
+    FUSE_WIDTH = 8
+
+    def __init__(self, body_color, fuse_color, spark_color, fuse_steps=32, spark_frames=12, rng=None):
+        rng = rng or random.Random()
+        self.fuse_steps = fuse_steps
+
+        size = self.RADIUS * 2 + 1
+        self.body = self._surface((size, size))
+        pygame.draw.circle(self.body, body_color, (self.RADIUS, self.RADIUS), self.RADIUS)
+
+        # Every fuse frame shares one size and anchors its start at `fuse_origin`
+        margin = self.FUSE_WIDTH // 2
+        self.fuse_origin = (margin, self.FUSE_LENGTH + margin)
+        fuse_size = (self.FUSE_DX + 2 * margin + 1, self.FUSE_LENGTH + 2 * margin + 1)
+        self.fuse_frames = []
+        self.fuse_tips = []
+        for step in range(fuse_steps + 1):
+            length = self.FUSE_LENGTH * step / fuse_steps
+            tip = (self.fuse_origin[0] + self.FUSE_DX, self.fuse_origin[1] - length)
+            frame = self._surface(fuse_size)
+            pygame.draw.line(frame, fuse_color, self.fuse_origin, tip, self.FUSE_WIDTH)
+            self.fuse_frames.append(frame)
+            self.fuse_tips.append((self.FUSE_DX, -length))
+
+        # Sparks scatter up to 10px sideways and 20px up from the fuse tip
+        self.spark_origin = (16, 26)
+        self.spark_frames = []
+        for _ in range(spark_frames):
+            frame = self._surface((32, 32))
+            for _ in range(5):
+                sx = self.spark_origin[0] + rng.randint(-10, 10)
+                sy = self.spark_origin[1] + rng.randint(-20, 0)
+                pygame.draw.circle(frame, spark_color, (sx, sy), rng.randint(2, 5))
+            self.spark_frames.append(frame)
+
+    @staticmethod
+    def _surface(size):
+        surface = pygame.Surface(size, pygame.SRCALPHA)
+        return surface.convert_alpha() if pygame.display.get_surface() else surface
+
+    def fuse_step(self, fuse_percent):
+        step = round(self.fuse_steps * fuse_percent / 100)
+        return min(max(step, 0), self.fuse_steps)
+
+    def signature(self, fuse_percent, frame):
+        """What the drawn bomb depends on, for dirty-region tracking"""
+        step = self.fuse_step(fuse_percent)
+        return (step, frame % len(self.spark_frames)) if fuse_percent > 0 else step
+
+    def draw(self, screen, center, fuse_percent, frame=0):
+        cx, cy = center
+        screen.blit(self.body, (cx - self.RADIUS, cy - self.RADIUS))
+
+        step = self.fuse_step(fuse_percent)
+        start_x, start_y = cx, cy - self.RADIUS
+        screen.blit(self.fuse_frames[step], (start_x - self.fuse_origin[0], start_y - self.fuse_origin[1]))
+
+        if fuse_percent > 0:
+            tip_dx, tip_dy = self.fuse_tips[step]
+            spark = self.spark_frames[frame % len(self.spark_frames)]
+            screen.blit(spark, (start_x + tip_dx - self.spark_origin[0], start_y + tip_dy - self.spark_origin[1]))
@@ -0,0 +1,257 @@
+"""Session logs and deterministic replay.
+
+A session log is an append-only little-endian file: a header followed by
+one record per game event, as written by SessionRecorder:
+
+    header   '<4sHH'  magic b'BTBL', version, reserved
+    record   '<Bd'    kind, engine clock time in ms, then per kind:
+      START           '<dHI' wall-clock time, set id length, question count,
+                             then the set id (UTF-8) and '<I' bank index
+                             of the first question
+      ANSWER          '<IBB' question number, answer index, 1 if correct
+      ADVANCE         '<I'   bank index of the next question
+      PAUSE, RESUME, no payload
+      END             '<BBi' won, exploded, score
+
+Bank indices are logged as questions come up, so an adaptive order is
+never worked out further than the game got.
+
+Every START (a new game or a reset) begins a new session. Replays feed a
+session back through GameEngine and the C timer on a ManualClock, so they
+run as fast as the CPU allows unless a speed is given.
+
+Usage: python replay.py SESSION_LOG [--speed X]
+"""
+import os
+import struct
+import sys
+import time
+from collections import namedtuple
+
+from game_engine import GameEngine, ManualClock
+
+MAGIC = b'BTBL'
+VERSION = 3
+HEADER = struct.Struct('<4sHH')
+RECORD = struct.Struct('<Bd')
+START = struct.Struct('<dHI')
+ANSWER = struct.Struct('<IBB')
+QUESTION_ID = struct.Struct('<I')
+END = struct.Struct('<BBi')
+
+KIND_START, KIND_ANSWER, KIND_PAUSE, KIND_RESUME, KIND_ADVANCE, KIND_END = range(1, 7)
+EVENT_KINDS = {'pause': KIND_PAUSE, 'resume': KIND_RESUME}
+
+DEFAULT_LOG_PATH = os.path.join(os.path.expanduser('~'), '.local', 'share', 'beat_the_bomb', 'sessions.log')
+MAX_LOG_BYTES = 8 * 1024 * 1024
+
+# question_ids: bank indices of the questions that came up, in play order;
+# events: (kind, time_ms, payload tuple)
+Session = namedtuple('Session', 'wall_time set_id question_count question_ids events')
+
+
+class SessionRecorder:
+    """GameEngine listener that appends every event to a session log.
+
+    The file is opened on the first event, so a game that is never played
+    leaves no log behind. Records are buffered and flushed when a game
+    ends; if the log cannot be written or an event does not fit its
+    record, recording stops silently. Once the log holds `max_bytes`, the
+    next session starts a new one and the old log is kept as
+    `path + '.1'`, replacing the previous one.
+    """
+    def __init__(self, path=DEFAULT_LOG_PATH, max_bytes=MAX_LOG_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.file = None
+        self.failed = False
+
+    def __call__(self, engine, event, *args):
+        if self.failed:
+            return
+        now = engine.clock_ms()
+
+        try:
+            if event == 'start':
+                set_id = (engine.question_set or '').encode('utf-8')
+                record = (RECORD.pack(KIND_START, now) + START.pack(time.time(), len(set_id), len(engine.questions))
+                          + set_id + QUESTION_ID.pack(question_id(engine)))
+            elif event == 'answer':
+                index, is_correct = args
+                record = RECORD.pack(KIND_ANSWER, now) + ANSWER.pack(engine.current_question, index, bool(is_correct))
+            elif event == 'advance':
+                record = RECORD.pack(KIND_ADVANCE, now) + QUESTION_ID.pack(question_id(engine))
+            elif event == 'end':
+                record = RECORD.pack(KIND_END, now) + END.pack(engine.won_game, engine.bomb.bomb_exploded, engine.score)
+            elif event in EVENT_KINDS:
+                record = RECORD.pack(EVENT_KINDS[event], now)
+            else:
+                return
+
+            if self.file is None or (event == 'start' and self.file.tell() >= self.max_bytes):
+                self.open()
+            self.file.write(record)
+            if event == 'end':
+                self.file.flush()
+        except (OSError, struct.error):
+            # Unwritable log, or an event that does not fit its record
+            self.failed = True
+
+    def open(self):
+        self.close()
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= self.max_bytes:
+            os.replace(self.path, self.path + '.1')
+        self.file = open(self.path, 'ab')
+        if self.file.tell() == 0:
+            self.file.write(HEADER.pack(MAGIC, VERSION, 0))
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+def question_id(engine):
+    """Bank index of the current question, or its number when the engine has none"""
+    number = engine.current_question
+    return engine.question_ids[number] if number < len(engine.question_ids) else number
+
+
+def read_sessions(path):
+    """Yield every Session in a log; a truncated last record is ignored"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < HEADER.size:
+        return
+    magic, version, _ = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} session log")
+
+    session = None
+    offset = HEADER.size
+    try:
+        while offset < len(data):
+            kind, time_ms = RECORD.unpack_from(data, offset)
+            offset += RECORD.size
+            if kind == KIND_START:
+                wall_time, set_length, count = START.unpack_from(data, offset)
+                offset += START.size
+                set_id = data[offset:offset + set_length].decode('utf-8')
+                offset += set_length
+                first, = QUESTION_ID.unpack_from(data, offset)
+                offset += QUESTION_ID.size
+                if session is not None:
+                    yield session
+                session = Session(wall_time, set_id, count, [first], [(kind, time_ms, ())])
+                continue
+            if kind == KIND_ANSWER:
+                payload = ANSWER.unpack_from(data, offset)
+                offset += ANSWER.size
+            elif kind == KIND_ADVANCE:
+                payload = QUESTION_ID.unpack_from(data, offset)
+                offset += QUESTION_ID.size
+                if session is not None:
+                    session.question_ids.append(payload[0])
+            elif kind == KIND_END:
+                payload = END.unpack_from(data, offset)
+                offset += END.size
+            else:
+                payload = ()
+            if session is not None:
+                session.events.append((kind, time_ms, payload))
+    except struct.error:
+        pass  # The game was killed mid-write
+    if session is not None:
+        yield session
+
+
+def session_questions(session):
+    """Stand-in questions carrying just the correctness the log recorded"""
+    questions = [{"question": "", "answers": [{"text": "", "correct": False}]} for _ in range(session.question_count)]
+    for kind, _, payload in session.events:
+        if kind == KIND_ANSWER:
+            number, index, correct = payload
+            answers = [{"text": "", "correct": False} for _ in range(index + 1)]
+            answers[index]["correct"] = bool(correct)
+            questions[number] = {"question": "", "answers": answers}
+    return questions
+
+
+def recorded_outcome(session):
+    """(won, exploded, score) as logged, or None if the session never ended"""
+    for kind, _, payload in reversed(session.events):
+        if kind == KIND_END:
+            won, exploded, score = payload
+            return bool(won), bool(exploded), score
+    return None
+
+
+def replay_session(session, engine=None, speed=None, sleep=time.sleep):
+    """Run a logged session through the game rules again; returns the engine.
+
+    With `speed` None the clock jumps from event to event; otherwise the
+    replay waits so it runs `speed` times faster than the original.
+    """
+    if engine is None:
+        engine = GameEngine(clock=ManualClock())
+    clock = engine.clock_ms
+    start_ms = session.events[0][1]
+    clock.now = start_ms
+    engine.start(session_questions(session), session.set_id, session.question_ids)
+    started = time.perf_counter()
+
+    for kind, time_ms, payload in session.events[1:]:
+        if speed:
+            delay = (time_ms - start_ms) / 1000.0 / speed - (time.perf_counter() - started)
+            if delay > 0:
+                sleep(delay)
+        clock.now = time_ms
+        # Every event happened between frames, after an update at about this time
+        engine.update()
+        if engine.game_over:
+            break
+        if kind == KIND_ANSWER:
+            engine.answer(payload[1])
+        elif kind == KIND_PAUSE:
+            engine.pause()
+        elif kind == KIND_RESUME:
+            engine.resume()
+    return engine
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay and re-score logged Beat the Bomb sessions")
+    parser.add_argument("log", nargs="?", default=DEFAULT_LOG_PATH)
+    parser.add_argument("--speed", type=float, default=None, help="replay speed factor (default: instant)")
+    parser.add_argument("--verbose", action="store_true", help="print every session")
+    args = parser.parse_args(argv)
+
+    engine = GameEngine(clock=ManualClock())
+    sessions = changed = incomplete = 0
+    start = time.perf_counter()
+    for session in read_sessions(args.log):
+        sessions += 1
+        replay_session(session, engine, args.speed)
+        recorded = recorded_outcome(session)
+        replayed = (engine.won_game, bool(engine.bomb.bomb_exploded), engine.score) if engine.game_over else None
+        if recorded is None:
+            incomplete += 1
+        elif replayed != recorded:
+            changed += 1
+        if args.verbose or (recorded is not None and replayed != recorded):
+            print(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(session.wall_time))} "
+                  f"{session.set_id or '?':10} recorded {recorded}  replayed {replayed}")
+    elapsed = time.perf_counter() - start
+
+    print(f"sessions: {sessions}  outcome changed: {changed}  incomplete: {incomplete}  "
+          f"({sessions / elapsed if elapsed else 0:,.0f} sessions/s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,219 @@
+"""Per-player question statistics and adaptive question order.
+
+A player's statistics live in one little-endian file with a fixed-size
+record per bank index, so an answer updates its own record in place and
+the file is never rewritten:
+
+    header   '<4sHH'        magic b'BTBS', version, reserved
+    record   '<HHB3xfdd'    attempts, correct answers, review box,
+                            mean answer latency (ms), last answered and
+                            next review (Unix time, s)
+
+Questions never answered have no record, or an all-zero one.
+
+Schedules order a game's questions with a heap: O(n) to build over n
+candidates, then O(log n) per question taken, popped only when the game
+reaches it:
+  review    spaced repetition: a right answer moves the question up a
+            box and doubles its review interval, a wrong one sends it
+            back to box 0; every question due now (never seen included)
+            comes first, least learned box first, then the others by how
+            soon they fall due
+  weakness  highest smoothed error rate first, slow answers counting
+            against the player
+"""
+import heapq
+import os
+import re
+import struct
+import time
+from collections import namedtuple
+
+MAGIC = b'BTBS'
+VERSION = 1
+HEADER = struct.Struct('<4sHH')
+STAT = struct.Struct('<HHB3xfdd')
+Stat = namedtuple('Stat', 'attempts correct box latency_ms last_seen due')
+NEVER_SEEN = Stat(0, 0, 0, 0.0, 0.0, 0.0)
+
+MAX_BOX = 8
+REVIEW_INTERVAL = 600.0    # s until a question in box 1 is due again; doubles per box
+LATENCY_SMOOTHING = 0.3    # weight of the newest answer in the mean latency
+SLOW_ANSWER_MS = 10000.0   # latency that counts as fully slow
+LATENCY_WEIGHT = 0.25      # how much slowness adds to a question's weakness
+
+DEFAULT_STATS_DIR = os.path.join(os.path.expanduser('~'), '.local', 'share', 'beat_the_bomb', 'players')
+
+
+def stats_path(player, directory=DEFAULT_STATS_DIR):
+    """File of a player's statistics; the name is reduced to safe characters"""
+    return os.path.join(directory, (re.sub(r'[^\w.-]', '_', player) or 'player') + '.stats')
+
+
+class PlayerStats:
+    """One player's per-question statistics, updated in place on disk.
+
+    The whole file is read into a bytearray once; `record()` updates one
+    record in memory and writes just those bytes back. Writes are
+    buffered until flush(); if the file cannot be written, statistics
+    are kept for this run only.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.data = bytearray()
+        self.file = None
+        self.failed = False
+        try:
+            with open(path, 'rb') as f:
+                header = f.read(HEADER.size)
+                if len(header) == HEADER.size and HEADER.unpack(header)[:2] == (MAGIC, VERSION):
+                    self.data = bytearray(f.read())
+        except OSError:
+            pass  # No statistics yet
+        # Drop a record cut short by a crash
+        del self.data[len(self.data) - len(self.data) % STAT.size:]
+
+    def __len__(self):
+        return len(self.data) // STAT.size
+
+    def get(self, question_id):
+        offset = question_id * STAT.size
+        if offset >= len(self.data):
+            return NEVER_SEEN
+        return Stat._make(STAT.unpack_from(self.data, offset))
+
+    def record(self, question_id, correct, latency_ms, now=None):
+        """Update a question's statistics with one answer; returns the new Stat"""
+        now = time.time() if now is None else now
+        old = self.get(question_id)
+        if correct:
+            box = min(old.box + 1, MAX_BOX)
+            due = now + REVIEW_INTERVAL * 2 ** (box - 1)
+        else:
+            box, due = 0, now
+        latency = latency_ms if not old.attempts else (
+            old.latency_ms + LATENCY_SMOOTHING * (latency_ms - old.latency_ms))
+        stat = Stat(min(old.attempts + 1, 0xFFFF), min(old.correct + bool(correct), 0xFFFF),
+                    box, latency, now, due)
+
+        offset = question_id * STAT.size
+        if offset >= len(self.data):
+            self.data.extend(bytes(offset + STAT.size - len(self.data)))
+        STAT.pack_into(self.data, offset, *stat)
+        self.write(offset)
+        return stat
+
+    def write(self, offset):
+        if self.failed:
+            return
+        try:
+            if self.file is None:
+                self.open()
+            self.file.seek(HEADER.size + offset)
+            self.file.write(self.data[offset:offset + STAT.size])
+        except OSError:
+            self.failed = True
+
+    def open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if not os.path.exists(self.path):
+            with open(self.path, 'wb') as f:
+                f.write(HEADER.pack(MAGIC, VERSION, 0))
+        self.file = open(self.path, 'r+b')
+        if self.file.read(HEADER.size) != HEADER.pack(MAGIC, VERSION, 0):
+            # Unreadable or another version: start over, writing every record we hold
+            self.file.seek(0)
+            self.file.truncate()
+            self.file.write(HEADER.pack(MAGIC, VERSION, 0) + self.data)
+
+    def flush(self):
+        if self.file is not None and not self.failed:
+            try:
+                self.file.flush()
+            except OSError:
+                self.failed = True
+
+    def close(self):
+        if self.file is not None:
+            self.flush()
+            self.file.close()
+            self.file = None
+
+
+def review_priority(stat, now):
+    """(seconds until due, box): everything due now ties on 0, so the lowest box wins"""
+    return max(stat.due - now, 0.0), stat.box
+
+
+def weakness_priority(stat, now):
+    """Negated weakness, so the weakest question has the smallest priority"""
+    error_rate = (stat.attempts - stat.correct + 1) / (stat.attempts + 2)
+    slowness = min(stat.latency_ms / SLOW_ANSWER_MS, 1.0) if stat.attempts else 0.5
+    return -(error_rate + LATENCY_WEIGHT * slowness)
+
+
+SCHEDULES = {
+    'review': review_priority,
+    'weakness': weakness_priority,
+}
+
+
+class Plan:
+    """Bank indices in schedule order, each popped off the heap when first read.
+
+    A read-only sequence: a game that ends after k questions costs
+    O(n + k log n), however many candidates it was planned over.
+    """
+    def __init__(self, heap, count=None):
+        self.heap = heap
+        self.taken = []
+        self.count = len(heap) if count is None else min(count, len(heap))
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self[i] for i in range(*item.indices(self.count))]
+        if item < 0:
+            item += self.count
+        if not 0 <= item < self.count:
+            raise IndexError("plan index out of range")
+        while len(self.taken) <= item:
+            self.taken.append(heapq.heappop(self.heap)[1])
+        return self.taken[item]
+
+
+class AdaptiveScheduler:
+    """Orders question sets by a player's statistics and records their answers.
+
+    Add it to GameEngine.listeners: every answer updates the statistics of
+    the bank index in play, using the engine's answer latency. Each game
+    asks a question at most once and an answer changes only its own
+    question's priority, so priorities taken when the game starts pick
+    the same questions as recomputing them at every advance.
+    """
+    def __init__(self, stats, schedule='review', clock=time.time):
+        self.stats = stats
+        self.priority = SCHEDULES[schedule]
+        self.clock = clock
+
+    def plan(self, question_ids, count=None):
+        """Up to `count` (default: all) of `question_ids` as a Plan, most urgent first; ties keep bank order"""
+        now = self.clock()
+        stats, priority = self.stats, self.priority
+        seen = len(stats)
+        unseen = priority(NEVER_SEEN, now)
+        heap = [(priority(stats.get(i), now) if i < seen else unseen, i) for i in question_ids]
+        heapq.heapify(heap)
+        return Plan(heap, count)
+
+    def __call__(self, engine, event, *args):
+        if event == 'answer' and engine.question_ids:
+            _, is_correct = args
+            self.stats.record(engine.question_ids[engine.current_question], is_correct,
+                              engine.answer_latency, self.clock())
+        elif event == 'end':
+            self.stats.flush()
@@ -0,0 +1,261 @@
+"""Beat the Bomb as an asyncio network service.
+
+Clients speak line-delimited JSON over TCP, one object per line:
+
+    -> {"type": "sets"}                              list question sets
+    <- {"type": "sets", "sets": {"set1_a": "Set 1 A", ...}}
+    -> {"type": "join", "room": "r1", "set": "set1_a", "name": "ann"}
+    <- {"type": "joined", "room": "r1", "set": "set1_a", "players": 1}
+    <- {"type": "question", "number": 0, "total": 10, "question": ..., "answers": [...]}
+    -> {"type": "answer", "index": 2}
+    <- {"type": "feedback", "correct": true, "correct_index": 2, "by": "ann", "score": 10}
+    <- {"type": "state", "fuse": 85, "score": 10}    whenever either changes
+    <- {"type": "game_over", "won": false, "score": 10}
+    -> {"type": "restart"}
+    -> {"type": "leave"}
+    <- {"type": "error", "message": ...}
+
+Everyone in a room plays the same bomb: the first answer to a question
+counts. A room is created by its first join (which picks the set) and
+dropped when its last player leaves. One scheduler task ticks every room;
+connections only parse requests and queue writes.
+
+Usage: python server.py [--host 127.0.0.1] [--port 8765] [--tick-ms 50] [--analytics DIR]
+"""
+import argparse
+import asyncio
+import json
+import sys
+
+from analytics import AnalyticsQueue
+from game_engine import GameEngine
+from question_graph import QuestionGraph
+from question_pack import load_question_bank
+
+MAX_LINE = 4096               # longest request accepted, bytes
+MAX_WRITE_BUFFER = 256 * 1024  # clients that fall this far behind are dropped
+
+
+def encode(message):
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+class Player:
+    """One connection; writes never wait, so a slow client cannot stall a room"""
+    def __init__(self, writer, name):
+        self.writer = writer
+        self.name = name
+        self.room = None
+
+    def send(self, data):
+        transport = self.writer.transport
+        if transport.is_closing():
+            return
+        if transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+            transport.abort()
+            return
+        self.writer.write(data)
+
+
+class Room(GameEngine):
+    """A shared game: the engine rules plus the players watching it"""
+    def __init__(self, name, set_id, questions, question_ids=()):
+        self.name = name
+        self.set_id = set_id
+        self.players = set()
+        self.last_state = None
+        super().__init__(questions)
+        self.question_set = set_id
+        self.question_ids = question_ids
+
+    def broadcast(self, message):
+        data = encode(message)
+        for player in self.players:
+            player.send(data)
+
+    def question_message(self):
+        question = self.questions[self.current_question]
+        return {"type": "question", "number": self.current_question, "total": len(self.questions),
+                "question": question["question"], "answers": [ans["text"] for ans in question["answers"]]}
+
+    def restart(self):
+        self.reset_game_state()
+        self.last_state = None
+        self.broadcast(self.question_message())
+
+    def submit(self, player, index):
+        if self.game_over or self.show_feedback:
+            return
+        answers = self.questions[self.current_question]["answers"]
+        if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index < len(answers):
+            player.send(encode({"type": "error", "message": "invalid answer index"}))
+            return
+
+        self.answer(index)
+        correct_index = next((i for i, ans in enumerate(answers) if ans["correct"]), -1)
+        self.broadcast({"type": "feedback", "correct": not self.show_correct_answer,
+                        "correct_index": correct_index, "by": player.name, "score": self.score})
+
+    def tick(self):
+        """Advance the bomb and push whatever changed"""
+        if self.game_over:
+            return
+        question = self.current_question
+        self.update()
+
+        if not self.game_over:
+            if self.current_question != question:
+                self.broadcast(self.question_message())
+            state = (round(self.fuse_percentage()), self.score)
+            if state != self.last_state:
+                self.last_state = state
+                self.broadcast({"type": "state", "fuse": state[0], "score": state[1]})
+
+    def on_game_over(self):
+        self.broadcast({"type": "game_over", "won": self.won_game, "score": self.score})
+
+
+class GameServer:
+    """Rooms keyed by name, all ticked by one scheduler task"""
+    def __init__(self, graph, tick_ms=50, analytics=None):
+        self.graph = graph
+        self.tick = tick_ms / 1000.0
+        self.analytics = analytics  # shared AnalyticsQueue listener, or None
+        self.rooms = {}
+        self.connections = 0
+
+    def question_sets(self):
+        return {node_id: self.graph.get_node_title(node_id)
+                for node_id in self.graph.nodes if self.graph.is_question_set(node_id)}
+
+    async def scheduler(self):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time()
+        while True:
+            for room in list(self.rooms.values()):
+                room.tick()
+            # Fixed rate: a slow tick shortens the next sleep instead of drifting
+            deadline = max(deadline + self.tick, loop.time())
+            await asyncio.sleep(deadline - loop.time())
+
+    def join(self, player, message):
+        name, set_id = message.get("room"), message.get("set")
+        if not isinstance(name, str) or not name:
+            return {"type": "error", "message": "join needs a room name"}
+
+        if player.room is not None and player.room.name == name:
+            return {"type": "error", "message": f"already in room {name!r}"}
+        if name not in self.rooms and not (isinstance(set_id, str) and self.graph.is_question_set(set_id)):
+            return {"type": "error", "message": f"unknown question set {set_id!r}"}
+
+        self.leave(player)
+        room = self.rooms.get(name)
+        if room is None:
+            room = Room(name, set_id, self.graph.get_questions(set_id), self.graph.question_ids(set_id))
+            if self.analytics:
+                room.listeners.append(self.analytics)
+            self.rooms[name] = room
+        player.room = room
+        room.players.add(player)
+        player.send(encode({"type": "joined", "room": name, "set": room.set_id, "players": len(room.players)}))
+        if room.game_over:
+            return {"type": "game_over", "won": room.won_game, "score": room.score}
+        return room.question_message()
+
+    def leave(self, player):
+        room = player.room
+        if room is None:
+            return
+        player.room = None
+        room.players.discard(player)
+        if not room.players:
+            del self.rooms[room.name]
+
+    def handle(self, player, message):
+        """Apply one request; returns a reply for this player or None"""
+        kind = message.get("type")
+        if kind == "sets":
+            return {"type": "sets", "sets": self.question_sets()}
+        if kind == "join":
+            player.name = str(message.get("name", player.name))
+            return self.join(player, message)
+        if player.room is None:
+            return {"type": "error", "message": "join a room first"}
+        if kind == "answer":
+            player.room.submit(player, message.get("index"))
+        elif kind == "restart":
+            if player.room.game_over:
+                player.room.restart()
+        elif kind == "leave":
+            self.leave(player)
+        else:
+            return {"type": "error", "message": f"unknown request {kind!r}"}
+        return None
+
+    async def serve_client(self, reader, writer):
+        self.connections += 1
+        player = Player(writer, f"player{self.connections}")
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    player.send(encode({"type": "error", "message": "request too long"}))
+                    break
+                except ConnectionError:
+                    break
+                if not line:
+                    break
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    message = None
+                if not isinstance(message, dict):
+                    player.send(encode({"type": "error", "message": "expected a JSON object"}))
+                    continue
+                reply = self.handle(player, message)
+                if reply is not None:
+                    player.send(encode(reply))
+        finally:
+            self.leave(player)
+            writer.close()
+
+    async def serve(self, host, port, started=None):
+        server = await asyncio.start_server(self.serve_client, host, port, limit=MAX_LINE)
+        scheduler = asyncio.create_task(self.scheduler())
+        if started is not None:
+            started.set_result(server.sockets[0].getsockname())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            scheduler.cancel()
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Serve Beat the Bomb over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--tick-ms", type=float, default=50.0)
+    parser.add_argument("--questions", default="questions.json")
+    parser.add_argument("--pack", default="questions.pack")
+    parser.add_argument("--graph", default="question_graph.json")
+    parser.add_argument("--analytics", metavar="DIR", help="write gameplay events for analytics.py here")
+    args = parser.parse_args(argv)
+
+    bank = load_question_bank(args.questions, args.pack)
+    analytics = AnalyticsQueue(args.analytics) if args.analytics else None
+    server = GameServer(QuestionGraph.from_file(bank, args.graph), args.tick_ms, analytics)
+    print(f"Serving on {args.host}:{args.port}")
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if analytics:
+            analytics.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
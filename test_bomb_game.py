@@ -0,0 +1,132 @@
+import struct
+from array import array
+
+import pytest
+
+import bomb_game
+
+STATE = struct.Struct(bomb_game.STATE_FORMAT)
+FIELDS = bomb_game.STATE_FIELDS
+
+
+def test_game_answer_and_reset():
+    game = bomb_game.Game(10, 0.0)
+    assert game.get_fuse_percentage() == 100.0 and game.total_questions == 10
+    game.answer_question(0)
+    assert game.time_remaining == bomb_game.MAX_GAME_TIME - 3.0
+    game.answer_question(1)
+    assert game.score == 10 and game.questions_answered == 2
+    assert game.time_remaining == bomb_game.MAX_GAME_TIME  # capped
+
+    game.update_timer(5.0)
+    assert game.get_fuse_percentage() == 75.0
+    game.reset(4, 100.0)
+    assert (game.score, game.questions_answered, game.total_questions) == (0, 0, 4)
+    game.update_timer(101.0)
+    assert game.get_fuse_percentage() == 95.0
+
+
+def test_game_explodes():
+    game = bomb_game.Game(10, 0.0)
+    assert not game.update_timer(19.5)
+    assert game.bomb_exploded == 0
+    assert game.update_timer(20.5)
+    assert game.bomb_exploded == 1 and type(game.bomb_exploded) is int
+    assert game.get_fuse_percentage() == 0.0
+
+
+def test_game_pause():
+    game = bomb_game.Game(10, 0.0)
+    game.set_paused(1, 2.0)
+    assert game.is_paused()
+    game.update_timer(12.0)
+    game.set_paused(0, 12.0)
+    game.update_timer(14.0)
+    assert game.get_fuse_percentage() == 80.0
+    assert game.paused_time(14.0) == 10.0 and game.elapsed(14.0) == 4.0
+
+
+def test_game_buffer_views_keep_their_shape():
+    game = bomb_game.Game(3, 0.0)
+    records = memoryview(game)
+    raw = memoryview(game).cast('B')
+    assert records.shape == (1,) and records.format == bomb_game.STATE_FORMAT
+    assert raw.shape == (bomb_game.STATE_SIZE,)
+    state = dict(zip(FIELDS, STATE.unpack(raw)))
+    assert state["total_questions"] == 3 and state["time_remaining"] == bomb_game.MAX_GAME_TIME
+
+
+def test_module_game_without_time_skips_first_update():
+    bomb_game.init_game(10)
+    bomb_game.update_timer(5.0)
+    assert bomb_game.get_fuse_percentage() == 100.0
+    bomb_game.update_timer(6.0)
+    assert bomb_game.get_fuse_percentage() == 95.0
+    bomb_game.free_game()
+
+
+def batch_of(count, start=0.0):
+    batch = bomb_game.GameBatch(2)
+    for i in range(count):
+        assert batch.add(10, start) == i
+    return batch
+
+
+def test_batch_add_grows():
+    batch = batch_of(100)
+    assert len(batch) == 100
+    for i in (0, 99):
+        assert batch.get_fuse_percentage(i) == 100.0
+    with pytest.raises(IndexError):
+        batch.get_fuse_percentage(100)
+
+
+def test_batch_without_init_grows():
+    batch = bomb_game.GameBatch.__new__(bomb_game.GameBatch)
+    for i in range(20):
+        assert batch.add(10, 0.0) == i
+
+
+def test_batch_update_timers():
+    batch = batch_of(3)
+    batch.answer_question(1, 0)  # -3 s
+    exploded, fuse = batch.update_timers(5.0)
+    assert list(exploded) == [0, 0, 0]
+    assert fuse.format == 'd' and list(fuse) == [75.0, 60.0, 75.0]
+
+    times = array('d', [10.0, 5.0, 30.0])
+    out_exploded, out_fuse = bytearray(3), array('d', bytes(24))
+    exploded, fuse = batch.update_timers(times, out_exploded, out_fuse)
+    assert exploded is out_exploded and fuse is out_fuse
+    assert list(exploded) == [0, 0, 1]
+    assert list(fuse) == [50.0, 60.0, 0.0]
+
+
+def test_batch_update_timers_checks_buffers():
+    batch = batch_of(2)
+    with pytest.raises(ValueError):
+        batch.update_timers(1.0, bytearray(3))
+    with pytest.raises(TypeError):
+        batch.update_timers(1.0, None, array('f', [0.0, 0.0]))
+    with pytest.raises(ValueError):
+        batch.update_timers(array('d', [1.0]))
+
+
+def test_batch_buffer_view():
+    batch = batch_of(3)
+    batch.answer_question(2, 1)
+    with memoryview(batch) as view:
+        assert view.format == bomb_game.STATE_FORMAT and view.shape == (3,) and view.readonly
+        states = [dict(zip(FIELDS, fields)) for fields in STATE.iter_unpack(view.cast('B'))]
+    assert [state["score"] for state in states] == [0, 0, 10]
+    assert all(state["time_remaining"] == bomb_game.MAX_GAME_TIME for state in states)
+
+
+def test_batch_cannot_grow_while_exported():
+    batch = batch_of(2)  # full: the next add must grow
+    view = memoryview(batch)
+    with pytest.raises(BufferError):
+        batch.add(10)
+    assert len(batch) == 2
+    view.release()
+    assert batch.add(10) == 2
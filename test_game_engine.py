@@ -0,0 +1,78 @@
+import bomb_game
+from game_engine import FEEDBACK_DELAY, GameEngine, ManualClock
+
+QUESTIONS = [{"question": f"q{i}", "answers": [{"text": "right", "correct": True},
+                                                {"text": "wrong", "correct": False}]} for i in range(3)]
+SECOND = 1000.0
+
+
+def engine_at(start=5000.0):
+    engine = GameEngine(clock=ManualClock(start))
+    engine.start(QUESTIONS)
+    return engine
+
+
+def test_fuse_burns_from_start():
+    engine = engine_at()
+    engine.clock_ms.advance(4 * SECOND)
+    engine.update()
+    assert engine.fuse_percentage() == 80.0
+
+
+def test_pause_does_not_burn_fuse():
+    engine = engine_at()
+    clock = engine.clock_ms
+    clock.advance(2 * SECOND)
+    engine.update()
+    engine.pause()
+    for _ in range(30):
+        clock.advance(SECOND)
+        engine.update()
+    assert not engine.game_over
+    assert engine.fuse_percentage() == 90.0
+    engine.resume()
+    clock.advance(2 * SECOND)
+    engine.update()
+    assert engine.fuse_percentage() == 80.0
+    assert engine.bomb.paused_time(clock() / 1000.0) == 30.0
+
+
+def test_answer_latency_excludes_pauses():
+    engine = engine_at()
+    clock = engine.clock_ms
+    clock.advance(SECOND)
+    engine.pause()
+    clock.advance(10 * SECOND)
+    engine.answer(0)  # ignored while paused
+    assert engine.selected_answer == 0 and not engine.show_feedback
+    engine.resume()
+    clock.advance(2 * SECOND)
+    engine.update()
+    engine.answer(0)
+    assert engine.answer_latency == 3 * SECOND
+    assert engine.answer_fuse == 85.0
+
+
+def test_question_reached_during_pause_starts_on_resume():
+    engine = engine_at()
+    clock = engine.clock_ms
+    engine.answer(1)
+    engine.pause()
+    clock.advance(FEEDBACK_DELAY + 5 * SECOND)
+    engine.update()
+    assert engine.current_question == 1 and engine.paused
+    assert engine.fuse_percentage() == 100.0  # the new question's bomb waits for the resume
+    engine.resume()
+    clock.advance(SECOND)
+    engine.update()
+    engine.answer(0)
+    assert engine.answer_latency == SECOND
+    assert engine.answer_fuse == 100.0 - 100.0 / bomb_game.MAX_GAME_TIME
+
+
+def test_running_out_of_time_ends_the_game():
+    engine = engine_at()
+    engine.clock_ms.advance(bomb_game.MAX_GAME_TIME * SECOND)
+    engine.update()
+    assert engine.game_over and not engine.won_game
+    assert engine.bomb.bomb_exploded == 1
@@ -0,0 +1,63 @@
+import io
+import json
+
+import pytest
+
+from ingest import ingest, iter_json_array
+from question_pack import QuestionPack
+
+DOCUMENTS = [
+    '[{"aa":1}, 2.5]',
+    '[1e10,true,null,false,-3.25E-2,"x",[1,2],{"a":[3]}]',
+    '[ 12 , 345 ]',
+    '[]',
+    '[123456]',
+]
+
+
+@pytest.mark.parametrize("text", DOCUMENTS)
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 64])
+def test_values_split_across_chunks(text, chunk_size):
+    assert list(iter_json_array(io.StringIO(text), chunk_size=chunk_size)) == json.loads(text)
+
+
+def test_unterminated_array():
+    with pytest.raises(ValueError):
+        list(iter_json_array(io.StringIO('[1, 2'), chunk_size=1))
+
+
+def question(text, *answers):
+    return {"question": text, "answers": [{"text": answer, "correct": i == 0} for i, answer in enumerate(answers)]}
+
+
+def run_ingest(tmp_path, data):
+    source = tmp_path / "bank"
+    source.write_bytes(data)
+    pack_path = str(tmp_path / "questions.pack")
+    stats = ingest(str(source), pack_path, log=None)
+    with QuestionPack(pack_path) as pack:
+        return stats, list(pack)
+
+
+def test_array_with_byte_order_mark(tmp_path):
+    bank = [question("One?", "a", "b"), question("Two?", "c", "d")]
+    stats, pack = run_ingest(tmp_path, b'\xef\xbb\xbf' + json.dumps(bank).encode('utf-8'))
+    assert stats["accepted"] == 2 and pack == bank
+
+
+def test_bad_json_line_is_rejected(tmp_path):
+    lines = [json.dumps(question("One?", "a", "b")), '{"question": "Two?", ', json.dumps(question("Three?", "c", "d"))]
+    stats, pack = run_ingest(tmp_path, "\n".join(lines).encode('utf-8'))
+    assert stats["read"] == 3 and stats["accepted"] == 2
+    assert stats["rejected"] == {"invalid JSON": 1}
+    assert [q["question"] for q in pack] == ["One?", "Three?"]
+
+
+def test_fixes_count_only_accepted_questions(tmp_path):
+    fixable = question("One?", "a", "b", "b")
+    lines = [json.dumps(fixable), json.dumps(fixable), json.dumps(question("one?", "x", "y"))]
+    stats, pack = run_ingest(tmp_path, "\n".join(lines).encode('utf-8'))
+    assert stats["accepted"] == 1
+    assert stats["rejected"] == {"duplicate question": 2}
+    assert stats["fixed"] == {"repeated wrong answers dropped": 1}
+    assert pack == [question("One?", "a", "b")]
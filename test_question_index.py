@@ -0,0 +1,113 @@
+import random
+import struct
+
+import pytest
+
+from question_index import HEADER, OFFSET, VERSION, QuestionIndex, build_index, encode_index, load_question_index
+
+QUESTIONS = [
+    {"question": "What is a licence?", "answers": [{"text": "A permit", "correct": True},
+                                                   {"text": "A tax", "correct": False}]},
+    {"question": "What is a web framework?", "answers": [{"text": "Software for web apps", "correct": True},
+                                                         {"text": "A licence", "correct": False}]},
+    {"question": "Define licensing.", "answers": [{"text": "Granting rights", "correct": True},
+                                                  {"text": "Selling", "correct": False}],
+     "tags": ["Law basics"]},
+]
+TAGS = {1: ["set2_c", "Web Programming"]}  # questions 0 and 2 are outside every graph set
+
+
+def test_untagged_questions():
+    index = QuestionIndex(encode_index(QUESTIONS))
+    assert index.query("licence") == [0, 1]
+    assert index.query("#law") == [2]
+
+
+def test_round_trip_through_file(tmp_path):
+    path = str(tmp_path / "questions.index")
+    build_index(QUESTIONS, path, TAGS)
+    with QuestionIndex.open(path) as index:
+        assert index.question_count == len(QUESTIONS)
+        assert index.query("licen*") == [0, 1, 2]
+        assert index.query("#web #programming") == [1]
+        assert index.query("#set2_c") == [1]
+        assert index.query("licence #web") == [1]
+        assert index.query("nothing") == []
+        assert index.query(", 2") == [0, 1]
+        assert sorted(index.query("licen*, 2 random", rng=random.Random(1))) in ([0, 1], [0, 2], [1, 2])
+
+
+def sections(data):
+    """Start of every index section by name, and of the end of the data"""
+    _, _, _, _, key_count = HEADER.unpack_from(data, 0)
+    posting_offsets = HEADER.size + (key_count + 1) * OFFSET.size
+    keys = posting_offsets + (key_count + 1) * OFFSET.size
+    key_bytes, = OFFSET.unpack_from(data, posting_offsets - OFFSET.size)
+    return {"header": 0, "key offsets": HEADER.size, "posting offsets": posting_offsets,
+            "keys": keys, "postings": keys + key_bytes, "end": len(data)}
+
+
+def test_key_table_and_postings():
+    data = encode_index(QUESTIONS, TAGS)
+    index = QuestionIndex(data)
+    keys = [index.key(i) for i in range(index.key_count)]
+    assert keys == sorted(keys) and len(set(keys)) == len(keys)
+    assert keys[0] == "#basics" and keys[-1] == "what"
+    assert index.key_count == HEADER.unpack_from(data, 0)[4]
+    assert list(index.lookup("licence")) == [0, 1]
+    assert list(index.lookup("#law")) == [2]
+    assert list(index.lookup("#set2_c")) == [1]
+    assert list(index.lookup("web")) == [1]
+    assert list(index.lookup("we")) == []
+    assert list(index.lookup("licen*")) == [0, 1, 2]
+    assert list(index.lookup("zzz*")) == []
+    assert list(index.postings(index.key_count - 1)) == [0, 1]  # the last postings run
+
+
+def test_other_version():
+    data = bytearray(encode_index(QUESTIONS))
+    data[4:6] = struct.pack('<H', VERSION + 1)
+    with pytest.raises(ValueError):
+        QuestionIndex(bytes(data))
+
+
+# Cuts at and inside every section, as (section, offset from its start)
+CUTS = [("header", 0), ("header", 1), ("key offsets", 0), ("key offsets", 6), ("posting offsets", 0),
+        ("posting offsets", 6), ("keys", 0), ("keys", 3), ("postings", 0), ("end", -1)]
+
+
+@pytest.mark.parametrize("section, offset", CUTS)
+def test_truncated(section, offset):
+    data = encode_index(QUESTIONS, TAGS)
+    with pytest.raises(ValueError):
+        QuestionIndex(data[:sections(data)[section] + offset])
+
+
+def test_trailing_bytes():
+    with pytest.raises(ValueError):
+        QuestionIndex(encode_index(QUESTIONS) + b'\0\0\0\0')
+
+
+def test_load_rebuilds_a_corrupt_file(tmp_path):
+    path = str(tmp_path / "questions.index")
+    with open(path, 'wb') as f:
+        f.write(encode_index(QUESTIONS)[:-3])
+    index = load_question_index(QUESTIONS, path)
+    assert index.query("framework") == [1]
+    index.close()
+
+
+def test_numbers_are_words_until_a_comma():
+    bank = QUESTIONS + [{"question": "Who wrote 1984?", "answers": [{"text": "Orwell", "correct": True},
+                                                                    {"text": "Huxley", "correct": False}]}]
+    index = QuestionIndex(encode_index(bank))
+    assert index.query("1984") == [3]
+    assert index.query("1984, 5") == [3]
+    assert index.query("what, 1") == [0]
+
+
+def test_open_empty_file(tmp_path):
+    path = tmp_path / "questions.index"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError):
+        QuestionIndex.open(str(path))
@@ -0,0 +1,113 @@
+import json
+import os
+import struct
+
+import pytest
+
+from question_pack import (HEADER, MAGIC, NO_CORRECT_ANSWER, OFFSET, QUESTION, VERSION, QuestionPack, compile_pack,
+                           load_question_bank)
+
+QUESTIONS = [
+    {"question": "What is a licence?", "answers": [{"text": "A permit", "correct": True},
+                                                   {"text": "A tax", "correct": False}]},
+    {"question": "Größte Stadt?", "answers": [{"text": "Berlin", "correct": False},
+                                             {"text": "", "correct": False},
+                                             {"text": "Hamburg ✓", "correct": True}]},
+    {"question": "No right answer", "answers": [{"text": "a", "correct": False},
+                                                {"text": "b", "correct": False}]},
+]
+
+
+@pytest.fixture
+def pack_path(tmp_path):
+    path = str(tmp_path / "questions.pack")
+    compile_pack(QUESTIONS, path)
+    return path
+
+
+def write_bytes(path, data):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+def test_round_trip_through_mmap(pack_path):
+    with QuestionPack(pack_path) as pack:
+        assert len(pack) == len(QUESTIONS)
+        assert list(pack) == QUESTIONS
+        assert pack[-1] == QUESTIONS[-1]
+        assert pack[1:] == QUESTIONS[1:]
+        with pytest.raises(IndexError):
+            pack[len(QUESTIONS)]
+
+
+def layout(data):
+    """Offsets of the pack sections: index table, string offsets, string data, end"""
+    _, _, _, count, string_count = HEADER.unpack_from(data, 0)
+    offsets_start = HEADER.size + count * QUESTION.size
+    strings_start = offsets_start + (string_count + 1) * OFFSET.size
+    return HEADER.size, offsets_start, strings_start, len(data)
+
+
+def test_lookups_decode_each_table(pack_path):
+    with QuestionPack(pack_path) as pack:
+        assert pack[1] == QUESTIONS[1]
+        assert pack[1]["answers"][2] == {"text": "Hamburg ✓", "correct": True}
+        assert pack[1]["answers"][1]["text"] == ""
+        assert not any(ans["correct"] for ans in pack[2]["answers"])
+        assert pack[-3]["question"] == "What is a licence?"
+
+    with open(pack_path, 'rb') as f:
+        data = f.read()
+    assert HEADER.unpack_from(data, 0) == (MAGIC, VERSION, 0, 3, 10)
+    index_start = layout(data)[0]
+    assert [QUESTION.unpack_from(data, index_start + i * QUESTION.size) for i in range(3)] == \
+        [(0, 2, 0), (3, 3, 2), (7, 2, NO_CORRECT_ANSWER)]
+
+
+def test_empty_pack(tmp_path):
+    path = str(tmp_path / "empty.pack")
+    compile_pack([], path)
+    with QuestionPack(path) as pack:
+        assert len(pack) == 0 and list(pack) == [] and pack[:] == []
+
+
+def test_other_version(pack_path):
+    with open(pack_path, 'rb') as f:
+        data = bytearray(f.read())
+    data[4:6] = struct.pack('<H', VERSION + 1)
+    write_bytes(pack_path, data)
+    with pytest.raises(ValueError):
+        QuestionPack(pack_path)
+
+
+# Cuts at and inside every section, as (section, offset from its start)
+CUTS = [("header", 0), ("header", 1), ("index", 0), ("index", QUESTION.size + 3),
+        ("offsets", 0), ("offsets", 5), ("strings", 0), ("end", -1)]
+
+
+@pytest.mark.parametrize("section, offset", CUTS)
+def test_truncated(pack_path, section, offset):
+    with open(pack_path, 'rb') as f:
+        data = f.read()
+    sections = dict(zip(["header", "index", "offsets", "strings", "end"], (0,) + layout(data)))
+    write_bytes(pack_path, data[:sections[section] + offset])
+    with pytest.raises(ValueError):
+        QuestionPack(pack_path)
+
+
+def test_trailing_bytes(pack_path):
+    with open(pack_path, 'ab') as f:
+        f.write(b'x')
+    with pytest.raises(ValueError):
+        QuestionPack(pack_path)
+
+
+def test_load_falls_back_to_json(tmp_path, pack_path):
+    json_path = str(tmp_path / "questions.json")
+    with open(json_path, 'w') as f:
+        json.dump(QUESTIONS, f)
+    with open(pack_path, 'rb') as f:
+        data = f.read()
+    write_bytes(pack_path, data[:-3])
+    os.utime(pack_path, (os.path.getmtime(json_path) + 1,) * 2)
+    assert load_question_bank(json_path, pack_path) == QUESTIONS
@@ -0,0 +1,63 @@
+import random
+
+from game_engine import GameEngine, ManualClock, random_player, simulate_game
+from replay import (KIND_ANSWER, KIND_END, KIND_START, SessionRecorder, read_sessions, recorded_outcome,
+                    replay_session)
+
+
+def question(correct):
+    return {"question": "q", "answers": [{"text": "a", "correct": correct == 0},
+                                         {"text": "b", "correct": correct == 1}]}
+
+
+QUESTIONS = [question(i % 2) for i in range(10)]
+
+
+def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "sessions.log")
+    recorder = SessionRecorder(path)
+    engine = GameEngine(clock=ManualClock())
+    engine.listeners.append(recorder)
+    outcomes = []
+    for seed in range(5):
+        simulate_game(engine, QUESTIONS, random_player(0.6, 3000.0, random.Random(seed)))
+        outcomes.append((engine.won_game, bool(engine.bomb.bomb_exploded), engine.score))
+    recorder.close()
+
+    sessions = list(read_sessions(path))
+    assert len(sessions) == len(outcomes)
+    for session, outcome in zip(sessions, outcomes):
+        assert session.events[0][0] == KIND_START
+        assert session.events[-1][0] == KIND_END
+        assert recorded_outcome(session) == outcome
+        assert session.question_count == len(QUESTIONS)
+        assert session.question_ids == list(range(len(session.question_ids)))
+        engine = replay_session(session)
+        assert (engine.won_game, bool(engine.bomb.bomb_exploded), engine.score) == outcome
+
+
+def test_large_question_ids(tmp_path):
+    path = str(tmp_path / "sessions.log")
+    recorder = SessionRecorder(path)
+    engine = GameEngine(clock=ManualClock())
+    engine.listeners.append(recorder)
+    count = 70000
+    engine.start([question(0)] * count, "search", list(range(100000, 100000 + count)))
+    engine.current_question = count - 1
+    engine.answer(0)
+    recorder.close()
+
+    assert not recorder.failed
+    session, = read_sessions(path)
+    assert session.question_count == count and session.question_ids == [100000]
+    assert session.events[-1] == (KIND_ANSWER, 0.0, (count - 1, 0, 1))
+
+
+def test_unrecordable_event_stops_recording(tmp_path):
+    recorder = SessionRecorder(str(tmp_path / "sessions.log"))
+    engine = GameEngine(clock=ManualClock())
+    engine.listeners.append(recorder)
+    engine.start(QUESTIONS, "x" * 70000)  # the set id length does not fit its field
+    assert recorder.failed
+    engine.answer(0)  # the game goes on
+    assert engine.score
@@ -0,0 +1,56 @@
+from question_graph import QuestionGraph, QuestionSelection
+from scheduler import REVIEW_INTERVAL, AdaptiveScheduler, PlayerStats, stats_path
+
+NOW = 1e9
+
+
+def scheduler(tmp_path, schedule='review'):
+    return AdaptiveScheduler(PlayerStats(stats_path('ann', str(tmp_path))), schedule, clock=lambda: NOW)
+
+
+def test_plan_pops_only_what_is_read(tmp_path):
+    plan = scheduler(tmp_path).plan(range(1000))
+    assert len(plan) == 1000
+    assert plan[0] == 0 and plan[2] == 2
+    assert len(plan.taken) == 3 and len(plan.heap) == 997
+    assert plan[-1] == 999 and len(plan.heap) == 0
+    assert len(scheduler(tmp_path).plan(range(1000), 10)) == 10
+
+
+def test_review_order(tmp_path):
+    sched = scheduler(tmp_path)
+    stats = sched.stats
+    stats.record(0, True, 1000.0, NOW - 10 * REVIEW_INTERVAL)   # box 1, overdue
+    stats.record(1, True, 1000.0, NOW)                          # box 1, due later
+    stats.record(2, False, 1000.0, NOW)                         # box 0, due now
+    stats.record(3, True, 1000.0, NOW - 100 * REVIEW_INTERVAL)
+    stats.record(3, True, 1000.0, NOW - 100 * REVIEW_INTERVAL)  # box 2, overdue
+    # Due now, lowest box first (never seen counts as box 0), then by due time
+    assert list(sched.plan(range(5))) == [2, 4, 0, 3, 1]
+
+
+def test_stats_persist(tmp_path):
+    sched = scheduler(tmp_path, 'weakness')
+    for _ in range(3):
+        sched.stats.record(5, False, 9000.0, NOW)
+    sched.stats.record(6, True, 500.0, NOW)
+    sched.stats.close()
+
+    stats = PlayerStats(stats_path('ann', str(tmp_path)))
+    assert len(stats) == 7
+    assert stats.get(5).attempts == 3 and stats.get(6).correct == 1
+    sched = AdaptiveScheduler(stats, 'weakness', clock=lambda: NOW)
+    assert sched.plan(range(7))[0] == 5
+
+
+def test_graph_ranges_are_cut_to_the_bank():
+    bank = [{"question": str(i), "answers": []} for i in range(55)]
+    graph = QuestionGraph(bank, {"nodes": {"root": {"title": "Menu", "children": ["a", "b"]},
+                                           "a": {"title": "A", "questions": [50, 60]},
+                                           "b": {"title": "B", "questions": [60, 70]}}})
+    assert graph.question_ids("a") == range(50, 55)
+    assert len(graph.get_questions("a")) == 5
+    assert not graph.question_ids("b")
+
+    selection = QuestionSelection(bank, [54, 50])
+    assert len(selection) == 2 and selection[0] is bank[54] and selection[1:] == [bank[50]]
@@ -0,0 +1,69 @@
+import asyncio
+import json
+
+from question_graph import QuestionGraph
+from server import GameServer
+
+QUESTIONS = [{"question": f"q{i}", "answers": [{"text": "right", "correct": True},
+                                                {"text": "wrong", "correct": False}]} for i in range(4)]
+GRAPH = {"root": "root", "nodes": {"root": {"title": "Menu", "children": ["s"]},
+                                   "s": {"title": "Set", "questions": [0, 4]}}}
+
+
+def run_session(requests):
+    """Send each request over a loopback connection; returns the next reply after each.
+
+    A None request sends nothing and just reads the next reply.
+    """
+    async def session():
+        server = GameServer(QuestionGraph(QUESTIONS, GRAPH), tick_ms=10)
+        started = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(server.serve('127.0.0.1', 0, started))
+        host, port = await started
+        reader, writer = await asyncio.open_connection(host, port)
+        replies = []
+        for request in requests:
+            if request is not None:
+                writer.write(request if isinstance(request, bytes) else json.dumps(request).encode() + b'\n')
+                await writer.drain()
+            while True:
+                reply = json.loads(await asyncio.wait_for(reader.readline(), 5))
+                if reply["type"] != "state":
+                    break
+            replies.append(reply)
+        writer.close()
+        task.cancel()
+        return replies
+
+    return asyncio.run(session())
+
+
+def test_join_and_answer():
+    sets, joined, question, feedback = run_session([
+        {"type": "sets"},
+        {"type": "join", "room": "r", "set": "s", "name": "ann"},
+        None,  # the question follows the join reply
+        {"type": "answer", "index": 0},
+    ])
+    assert sets == {"type": "sets", "sets": {"s": "Set"}}
+    assert joined == {"type": "joined", "room": "r", "set": "s", "players": 1}
+    assert question["type"] == "question" and question["number"] == 0 and question["total"] == 4
+    assert feedback == {"type": "feedback", "correct": True, "correct_index": 0, "by": "ann", "score": 10}
+
+
+def test_bad_input_gets_errors():
+    replies = run_session([
+        b'garbage\n',
+        {"type": "answer", "index": 1},
+        {"type": "join", "room": "x", "set": ["bad"]},
+        {"type": "join", "room": "x", "set": {"s": 1}},
+        {"type": "join", "room": ["x"], "set": "s"},
+        {"type": "join", "room": "r", "set": "s"},
+        None,
+        {"type": "answer", "index": True},
+        {"type": "answer", "index": "0"},
+        {"type": "answer", "index": 7},
+        {"type": "sets"},
+    ])
+    assert [reply["type"] for reply in replies] == [
+        "error", "error", "error", "error", "error", "joined", "question", "error", "error", "error", "sets"]